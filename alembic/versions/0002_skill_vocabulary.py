@@ -0,0 +1,70 @@
+"""skill vocabulary, catalog version and job embeddings
+
+Revision ID: 0002_skill_vocabulary
+Revises: 0001_initial
+Create Date: 2026-10-19 00:00:00.000000
+
+Databases created by init_db() may already have some of these objects, so
+every step checks the live schema first.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '0002_skill_vocabulary'
+down_revision = '0001_initial'
+branch_labels = None
+depends_on = None
+
+
+def _inspector():
+    return sa.inspect(op.get_bind())
+
+
+def upgrade():
+    insp = _inspector()
+    tables = set(insp.get_table_names())
+    if 'skills' not in tables:
+        op.create_table(
+            'skills',
+            sa.Column('id', sa.Integer(), primary_key=True, nullable=False),
+            sa.Column('name', sa.String(), nullable=False),
+            sa.Column('label', sa.String(), nullable=True),
+            sa.Column('embedding', sa.JSON(), nullable=True),
+            sa.Column('created_at', sa.DateTime(), nullable=True),
+        )
+        op.create_index('ix_skills_id', 'skills', ['id'])
+        op.create_index('ix_skills_name', 'skills', ['name'], unique=True)
+    if 'job_skills' not in tables:
+        op.create_table(
+            'job_skills',
+            sa.Column('job_id', sa.Integer(), sa.ForeignKey('jobs.id'), primary_key=True, nullable=False),
+            sa.Column('position', sa.Integer(), primary_key=True, nullable=False),
+            sa.Column('skill_id', sa.Integer(), sa.ForeignKey('skills.id'), nullable=False),
+        )
+        op.create_index('ix_job_skills_skill_id', 'job_skills', ['skill_id'])
+    if 'data_versions' not in tables:
+        op.create_table(
+            'data_versions',
+            sa.Column('name', sa.String(), primary_key=True, nullable=False),
+            sa.Column('version', sa.Integer(), nullable=False),
+        )
+
+    job_columns = {c['name'] for c in insp.get_columns('jobs')}
+    with op.batch_alter_table('jobs') as batch:
+        if 'skill_embeddings' not in job_columns:
+            batch.add_column(sa.Column('skill_embeddings', sa.JSON(), nullable=True))
+        if 'embedding' not in job_columns:
+            batch.add_column(sa.Column('embedding', sa.JSON(), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('jobs') as batch:
+        batch.drop_column('embedding')
+        batch.drop_column('skill_embeddings')
+    op.drop_table('data_versions')
+    op.drop_index('ix_job_skills_skill_id', table_name='job_skills')
+    op.drop_table('job_skills')
+    op.drop_index('ix_skills_name', table_name='skills')
+    op.drop_index('ix_skills_id', table_name='skills')
+    op.drop_table('skills')
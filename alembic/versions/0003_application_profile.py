@@ -0,0 +1,68 @@
+"""application profile columns and lookup indexes
+
+Revision ID: 0003_application_profile
+Revises: 0002_skill_vocabulary
+Create Date: 2026-10-19 00:00:00.000000
+
+Adds the structured profile extracted at ingest time (backend/utils/profile.py)
+and the indexes used by profile filters, history retention and resume GC.
+Like 0002, every step checks the live schema first.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '0003_application_profile'
+down_revision = '0002_skill_vocabulary'
+branch_labels = None
+depends_on = None
+
+PROFILE_COLUMNS = [
+    ('profile_skills', sa.JSON()),
+    ('years_experience', sa.Float()),
+    ('degree', sa.String()),
+    ('graduation_year', sa.Integer()),
+    ('date_of_birth', sa.String()),
+    ('profile_version', sa.Integer()),
+]
+
+# (index name, table, column)
+INDEXES = [
+    ('ix_applications_years_experience', 'applications', 'years_experience'),
+    ('ix_applications_degree', 'applications', 'degree'),
+    ('ix_applications_graduation_year', 'applications', 'graduation_year'),
+    ('ix_applications_profile_version', 'applications', 'profile_version'),
+    ('ix_applications_resume_path', 'applications', 'resume_path'),
+    ('ix_match_searches_created_at', 'match_searches', 'created_at'),
+    ('ix_match_searches_resume_path', 'match_searches', 'resume_path'),
+    ('ix_match_results_search_id', 'match_results', 'search_id'),
+]
+
+
+def upgrade():
+    insp = sa.inspect(op.get_bind())
+    columns = {c['name'] for c in insp.get_columns('applications')}
+    with op.batch_alter_table('applications') as batch:
+        for name, type_ in PROFILE_COLUMNS:
+            if name not in columns:
+                batch.add_column(sa.Column(name, type_, nullable=True))
+
+    tables = set(insp.get_table_names())
+    for name, table, column in INDEXES:
+        # match_searches/match_results predate 0001 in some deployments and
+        # are created by init_db(); skip their indexes where they are absent
+        if table not in tables:
+            continue
+        if name not in {ix['name'] for ix in insp.get_indexes(table)}:
+            op.create_index(name, table, [column])
+
+
+def downgrade():
+    insp = sa.inspect(op.get_bind())
+    tables = set(insp.get_table_names())
+    for name, table, _ in reversed(INDEXES):
+        if table in tables and name in {ix['name'] for ix in insp.get_indexes(table)}:
+            op.drop_index(name, table_name=table)
+    with op.batch_alter_table('applications') as batch:
+        for name, _ in reversed(PROFILE_COLUMNS):
+            batch.drop_column(name)
@@ -0,0 +1,29 @@
+"""jobs.updated_at
+
+Revision ID: 0004_job_updated_at
+Revises: 0003_application_profile
+Create Date: 2026-10-19 00:00:00.000000
+
+Versions the cached JobContext of each job (backend/utils/job_contexts.py).
+Like 0002, the column is only added when missing.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '0004_job_updated_at'
+down_revision = '0003_application_profile'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    columns = {c['name'] for c in sa.inspect(op.get_bind()).get_columns('jobs')}
+    if 'updated_at' not in columns:
+        with op.batch_alter_table('jobs') as batch:
+            batch.add_column(sa.Column('updated_at', sa.DateTime(), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('jobs') as batch:
+        batch.drop_column('updated_at')
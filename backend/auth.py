@@ -7,7 +7,11 @@ from .models import get_db
 from fastapi.security import OAuth2PasswordBearer
 from .models import User
 import os
+import time
+import asyncio
+import threading
 import logging
+from concurrent.futures import ThreadPoolExecutor
 
 SECRET_KEY = os.getenv("SECRET_KEY", "devsecret")
 ALGORITHM = "HS256"
@@ -17,12 +21,47 @@ ACCESS_TOKEN_EXPIRE_MINUTES = 60 * 24
 # and return a clear error instead of letting passlib/bcrypt raise a server 500.
 MAX_BCRYPT_PASSWORD_BYTES = 72
 
-# Prefer a pure-Python algorithm for development to avoid bcrypt binary issues.
-# Keep bcrypt listed so existing bcrypt hashes still verify.
-pwd_context = CryptContext(schemes=["sha256_crypt", "bcrypt"], deprecated="auto")
+# Optional hashing cost overrides. When set, the cost is pinned (min == max ==
+# default) so hashes created with any other cost are flagged by passlib and
+# transparently re-hashed on the user's next successful login.
+PASSWORD_HASH_ROUNDS = os.getenv("PASSWORD_HASH_ROUNDS")  # sha256_crypt rounds
+BCRYPT_ROUNDS = os.getenv("BCRYPT_ROUNDS")  # bcrypt log2 cost
+
+# Hashing/verification runs on a bounded worker pool. Requests beyond
+# workers + max queue are rejected with 503 instead of piling up.
+# PASSWORD_HASH_WORKERS=0 disables the pool and admission control.
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", str(min(4, os.cpu_count() or 1))))
+PASSWORD_HASH_MAX_QUEUE = int(os.getenv("PASSWORD_HASH_MAX_QUEUE", "32"))
+
+
+def _build_pwd_context():
+    settings = {}
+    for scheme, rounds in (("sha256_crypt", PASSWORD_HASH_ROUNDS), ("bcrypt", BCRYPT_ROUNDS)):
+        if rounds:
+            for key in ("default_rounds", "min_rounds", "max_rounds"):
+                settings[f"{scheme}__{key}"] = int(rounds)
+    # Prefer a pure-Python algorithm for development to avoid bcrypt binary issues.
+    # Keep bcrypt listed so existing bcrypt hashes still verify.
+    return CryptContext(schemes=["sha256_crypt", "bcrypt"], deprecated="auto", **settings)
+
+
+pwd_context = _build_pwd_context()
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 logger = logging.getLogger(__name__)
 
+# In-process cache of authenticated users so most requests skip the per-call
+# `User` lookup. Entries expire after AUTH_USER_CACHE_TTL seconds (0 disables
+# the cache) and are dropped explicitly when a user is deleted -- but only in
+# the process that served the delete. Under run_backend.py --workers the other
+# workers keep authorizing a deleted user, or the old role of a changed user,
+# for up to AUTH_USER_CACHE_TTL seconds, so keep it short. Authorization always
+# uses the cached or stored role, never the token's role claim.
+AUTH_USER_CACHE_TTL = float(os.getenv("AUTH_USER_CACHE_TTL", "10"))
+AUTH_USER_CACHE_MAX = int(os.getenv("AUTH_USER_CACHE_MAX", "10000"))
+_user_cache: dict = {}
+_user_cache_lock = threading.Lock()
+_USER_CACHE_FIELDS = ("id", "email", "role", "full_name", "created_at")
+
 
 def _ensure_bcrypt_compatible(password: str) -> None:
     """Raise ValueError when password is longer than bcrypt's 72-byte limit.
@@ -56,6 +95,20 @@ def verify_password(plain, hashed):
         return False
 
 
+def verify_and_update_password(plain, hashed):
+    """Like verify_password, but also return a replacement hash when the stored
+    one uses a deprecated scheme or a cost other than the configured one.
+
+    Returns (ok, new_hash_or_None).
+    """
+    try:
+        if isinstance(plain, str) and len(plain.encode("utf-8")) > MAX_BCRYPT_PASSWORD_BYTES:
+            return False, None
+        return pwd_context.verify_and_update(plain, hashed)
+    except Exception:
+        return False, None
+
+
 def get_password_hash(password):
     # Use the configured pwd_context (sha256_crypt preferred in dev). If hashing
     # fails for any reason, raise a ValueError so routes can return HTTP 400.
@@ -68,6 +121,108 @@ def get_password_hash(password):
         )
 
 
+_hash_executor = None
+_hash_lock = threading.Lock()
+_hash_stats = {"in_flight": 0, "completed": 0, "rejected": 0}
+
+
+def _get_hash_executor():
+    global _hash_executor
+    if _hash_executor is None:
+        with _hash_lock:
+            if _hash_executor is None:
+                _hash_executor = ThreadPoolExecutor(max_workers=PASSWORD_HASH_WORKERS, thread_name_prefix="pwhash")
+    return _hash_executor
+
+
+def _hash_job_done(_future):
+    with _hash_lock:
+        _hash_stats["in_flight"] -= 1
+        _hash_stats["completed"] += 1
+
+
+async def _run_hash_job(fn, *args):
+    """Run a hashing call off the event loop, rejecting with 503 when saturated."""
+    if PASSWORD_HASH_WORKERS <= 0:
+        return await asyncio.get_running_loop().run_in_executor(None, fn, *args)
+    with _hash_lock:
+        if _hash_stats["in_flight"] >= PASSWORD_HASH_WORKERS + PASSWORD_HASH_MAX_QUEUE:
+            _hash_stats["rejected"] += 1
+            raise HTTPException(status_code=503, detail="Server busy, please retry", headers={"Retry-After": "1"})
+        _hash_stats["in_flight"] += 1
+    try:
+        future = _get_hash_executor().submit(fn, *args)
+    except Exception:
+        _hash_job_done(None)
+        raise
+    # account on the worker future so a cancelled request doesn't hide work still running
+    future.add_done_callback(_hash_job_done)
+    return await asyncio.wrap_future(future)
+
+
+async def hash_password_async(password):
+    return await _run_hash_job(get_password_hash, password)
+
+
+async def verify_and_update_password_async(plain, hashed):
+    return await _run_hash_job(verify_and_update_password, plain, hashed)
+
+
+def hash_pool_stats() -> dict:
+    """Snapshot of the password hashing pool for health/metrics reporting."""
+    with _hash_lock:
+        in_flight = _hash_stats["in_flight"]
+        return {
+            "workers": PASSWORD_HASH_WORKERS,
+            "max_queue": PASSWORD_HASH_MAX_QUEUE,
+            "in_flight": in_flight,
+            "queue_depth": max(0, in_flight - PASSWORD_HASH_WORKERS),
+            "completed": _hash_stats["completed"],
+            "rejected": _hash_stats["rejected"],
+        }
+
+
+def token_claims_for(user) -> dict:
+    """Identity and role claims embedded in access tokens issued for `user`."""
+    return {"sub": str(user.id), "role": user.role, "email": user.email}
+
+
+def cache_user(user) -> None:
+    """Store a plain snapshot of `user` in the auth cache."""
+    if AUTH_USER_CACHE_TTL <= 0 or user is None:
+        return
+    snapshot = {f: getattr(user, f, None) for f in _USER_CACHE_FIELDS}
+    with _user_cache_lock:
+        if len(_user_cache) >= AUTH_USER_CACHE_MAX and snapshot["id"] not in _user_cache:
+            # evict the oldest entry (dicts keep insertion order)
+            _user_cache.pop(next(iter(_user_cache)), None)
+        _user_cache[snapshot["id"]] = (time.monotonic() + AUTH_USER_CACHE_TTL, snapshot)
+
+
+def get_cached_user(user_id: int):
+    """Return a detached `User` built from the cache, or None on miss/expiry."""
+    if AUTH_USER_CACHE_TTL <= 0:
+        return None
+    entry = _user_cache.get(user_id)
+    if entry is None:
+        return None
+    expires_at, snapshot = entry
+    if expires_at < time.monotonic():
+        with _user_cache_lock:
+            _user_cache.pop(user_id, None)
+        return None
+    return User(**snapshot)
+
+
+def invalidate_user_cache(user_id: int | None = None) -> None:
+    """Drop one user (or, with no argument, every user) from the auth cache."""
+    with _user_cache_lock:
+        if user_id is None:
+            _user_cache.clear()
+        else:
+            _user_cache.pop(user_id, None)
+
+
 def create_access_token(data: dict, expires_delta: timedelta | None = None):
     to_encode = data.copy()
     if expires_delta is not None:
@@ -79,21 +234,42 @@ def create_access_token(data: dict, expires_delta: timedelta | None = None):
     return encoded_jwt
 
 
-def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
+def _decode_token(token: str) -> dict:
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        user_id = payload.get("sub")
-        if user_id is None:
-            raise HTTPException(status_code=401, detail="Invalid authentication credentials")
-        user = db.query(User).filter(User.id == int(user_id)).first()
-        return user
     except JWTError:
         raise HTTPException(status_code=401, detail="Invalid token")
+    if payload.get("sub") is None:
+        raise HTTPException(status_code=401, detail="Invalid authentication credentials")
+    return payload
+
+
+def _load_user(payload: dict, db: Session):
+    """Resolve the token subject, serving from the auth cache when possible."""
+    try:
+        user_id = int(payload["sub"])
+    except (TypeError, ValueError):
+        raise HTTPException(status_code=401, detail="Invalid authentication credentials")
+    user = get_cached_user(user_id)
+    if user is not None:
+        return user
+    user = db.query(User).filter(User.id == user_id).first()
+    cache_user(user)
+    return user
+
+
+def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
+    return _load_user(_decode_token(token), db)
 
 
 def get_current_recruiter(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
-    """Dependency that returns current user if they are a recruiter, else raises 403."""
-    user = get_current_user(token=token, db=db)
+    """Dependency that returns current user if they are a recruiter, else raises 403.
+
+    The role is checked on the user resolved through the auth cache, not on
+    the token's `role` claim, so a role change or deletion takes effect once
+    the cache entry expires.
+    """
+    user = _load_user(_decode_token(token), db)
     if not user:
         raise HTTPException(status_code=401, detail="Invalid authentication credentials")
     if getattr(user, "role", None) != "recruiter":
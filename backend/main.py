@@ -1,16 +1,29 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse
 import os
 try:
     # Preferred: package-relative imports when running as a package
-    from .routes import users, jobs, applications
-    from .models import init_db
+    from .routes import users, jobs, applications, profiles
+    from .models import init_db, engine
+    from .utils.search import ensure_search_indexes
+    from .auth import hash_pool_stats
+    from .utils.retention import RETENTION_INTERVAL_SECONDS, start_retention_worker
+    from .utils.warmup import WARMUP_ON_STARTUP, readiness, start_warmup
+    from .utils.metrics import METRICS_ENABLED, MetricsMiddleware, render_metrics
+    from .utils.profiling import ServerTimingMiddleware
 except ImportError:
     # Fallback for running from the backend/ folder or older uvicorn invocation
     # where the package context is not set. Try top-level imports used by
     # older instructions.
-    from routes import users, jobs, applications
-    from models import init_db
+    from routes import users, jobs, applications, profiles
+    from models import init_db, engine
+    from utils.search import ensure_search_indexes
+    from auth import hash_pool_stats
+    from utils.retention import RETENTION_INTERVAL_SECONDS, start_retention_worker
+    from utils.warmup import WARMUP_ON_STARTUP, readiness, start_warmup
+    from utils.metrics import METRICS_ENABLED, MetricsMiddleware, render_metrics
+    from utils.profiling import ServerTimingMiddleware
 
 app = FastAPI(title="SourceMatch - Prototype")
 
@@ -20,9 +33,16 @@ def startup_event():
     try:
         print("[STARTUP] Initializing database...")
         init_db()
+        ensure_search_indexes(engine)
         print("[STARTUP] Database initialized successfully")
         print("[STARTUP] Creating resumes directory...")
         os.makedirs("resumes", exist_ok=True)
+        if RETENTION_INTERVAL_SECONDS > 0:
+            print(f"[STARTUP] Starting match history retention every {RETENTION_INTERVAL_SECONDS}s...")
+            start_retention_worker(RETENTION_INTERVAL_SECONDS)
+        if WARMUP_ON_STARTUP:
+            print("[STARTUP] Warming up scoring model and caches in the background (see /ready)...")
+            start_warmup()
         print("[STARTUP] All startup tasks completed")
     except Exception as e:
         print(f"[STARTUP ERROR] {type(e).__name__}: {e}")
@@ -37,12 +57,31 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+if METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+app.add_middleware(ServerTimingMiddleware)
 
 app.include_router(users.router, prefix="/api/users", tags=["users"])
 app.include_router(jobs.router, prefix="/api/jobs", tags=["jobs"])
 app.include_router(__import__("backend.routes.settings", fromlist=["router"]).router, prefix="/api/settings", tags=["settings"])
 app.include_router(applications.router, prefix="/api/applications", tags=["applications"])
+app.include_router(profiles.router, prefix="/api/profiles", tags=["profiles"])
 
 @app.get("/health")
 def health():
-    return {"status": "ok"}
+    return {"status": "ok", "password_hashing": hash_pool_stats()}
+
+
+@app.get("/ready")
+def ready():
+    """Readiness probe: 200 once the model and scoring caches are warm, else 503."""
+    report = readiness()
+    return JSONResponse(report, status_code=200 if report["ready"] else 503)
+
+
+@app.get("/metrics")
+def metrics():
+    """Prometheus text exposition of request, stage, model, cache and pool metrics."""
+    if not METRICS_ENABLED:
+        return PlainTextResponse("metrics disabled\n", status_code=404)
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4; charset=utf-8")
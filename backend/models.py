@@ -1,6 +1,6 @@
-from sqlalchemy import Column, Integer, String, Text, JSON, Float, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, JSON, Float, DateTime, ForeignKey, cast, or_
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, deferred
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.orm import Session
@@ -46,7 +46,9 @@ class Job(Base):
     recruiter_id = Column(Integer, ForeignKey("users.id"))
     company_id = Column(Integer, ForeignKey("companies.id"), nullable=True)
     title = Column(String, nullable=False)
-    description = Column(Text, nullable=False)
+    # Large columns are deferred so listing queries don't pull them in; load
+    # them with a column projection or `undefer()` where they are needed.
+    description = deferred(Column(Text, nullable=False))
     requirements = Column(JSON, default={})
     company = Column(String, nullable=True)  # Company name
     location = Column(String, nullable=True)  # Job location
@@ -54,22 +56,62 @@ class Job(Base):
     salary_max = Column(Integer, nullable=True)  # Maximum salary in thousands
     experience_level = Column(String, default="Mid-level")  # Junior, Mid-level, Senior
     required_skills = Column(String, nullable=True)  # Comma-separated skills
-    # Precomputed skill embeddings: list of vectors (JSON serializable)
-    skill_embeddings = Column(JSON, nullable=True)
+    # Legacy per-job skill embeddings (list of vectors). New jobs reference
+    # the shared `skills` vocabulary through `job_skills` instead.
+    skill_embeddings = deferred(Column(JSON(none_as_null=True), nullable=True))
+    # Precomputed description embedding, used to re-rank keyword search hits
+    embedding = deferred(Column(JSON(none_as_null=True), nullable=True))
     created_at = Column(DateTime, default=datetime.datetime.utcnow)
+    # Set on every write that changes what scoring reads (text, skill links,
+    # stored vectors); versions the cached JobContext of the job.
+    updated_at = Column(DateTime, default=datetime.datetime.utcnow, onupdate=datetime.datetime.utcnow)
     recruiter = relationship("User")
 
+class Skill(Base):
+    """One row per distinct normalized skill, with a single shared embedding."""
+    __tablename__ = "skills"
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(String, unique=True, index=True, nullable=False)  # normalized text
+    label = Column(String)  # spelling the skill was first seen with
+    embedding = deferred(Column(JSON(none_as_null=True), nullable=True))
+    created_at = Column(DateTime, default=datetime.datetime.utcnow)
+
+
+class JobSkill(Base):
+    """A job's required skills, in the order of its required skill list."""
+    __tablename__ = "job_skills"
+    job_id = Column(Integer, ForeignKey("jobs.id"), primary_key=True)
+    position = Column(Integer, primary_key=True)
+    skill_id = Column(Integer, ForeignKey("skills.id"), nullable=False, index=True)
+
+
+class DataVersion(Base):
+    # Change counters for state kept in memory by every worker (e.g. the job
+    # skill catalog), bumped in the transaction that changes the source rows.
+    __tablename__ = "data_versions"
+    name = Column(String, primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+
+
 class Application(Base):
     __tablename__ = "applications"
     id = Column(Integer, primary_key=True, index=True)
     job_id = Column(Integer, ForeignKey("jobs.id"))
     candidate_id = Column(Integer, ForeignKey("users.id"))
-    resume_path = Column(String)
-    resume_text = Column(Text)
+    resume_path = Column(String, index=True)
+    resume_text = deferred(Column(Text))
     score = Column(Float)
     status = Column(String, default="applied") # applied, shortlisted, rejected
-    explanation = Column(JSON)
+    explanation = deferred(Column(JSON))
     fingerprint = Column(String)
+    # Structured profile extracted from resume_text once at ingest time
+    # (see utils/profile.py); indexed so recruiters can filter in SQL.
+    profile_skills = Column(JSON, nullable=True)
+    years_experience = Column(Float, nullable=True, index=True)
+    degree = Column(String, nullable=True, index=True)
+    graduation_year = Column(Integer, nullable=True, index=True)
+    date_of_birth = Column(String, nullable=True)
+    profile_version = Column(Integer, nullable=True, index=True)
     created_at = Column(DateTime, default=datetime.datetime.utcnow)
     job = relationship("Job")
     candidate = relationship("User")
@@ -87,45 +129,85 @@ class MatchSearch(Base):
     __tablename__ = "match_searches"
     id = Column(Integer, primary_key=True, index=True)
     candidate_id = Column(Integer, ForeignKey("users.id"), nullable=True)
-    resume_path = Column(String)
+    resume_path = Column(String, index=True)
     fingerprint = Column(String, index=True)
-    created_at = Column(DateTime, default=datetime.datetime.utcnow)
+    created_at = Column(DateTime, default=datetime.datetime.utcnow, index=True)
 
 
 class MatchResult(Base):
     __tablename__ = "match_results"
     id = Column(Integer, primary_key=True, index=True)
-    search_id = Column(Integer, ForeignKey("match_searches.id"), nullable=False)
+    search_id = Column(Integer, ForeignKey("match_searches.id"), nullable=False, index=True)
     job_id = Column(Integer, ForeignKey("jobs.id"))
     job_title = Column(String)
     score = Column(Float)
-    explanation = Column(JSON)
+    explanation = deferred(Column(JSON))
     matched_skills = Column(JSON)
     created_at = Column(DateTime, default=datetime.datetime.utcnow)
 
 
+def json_missing(column):
+    """Filter for rows where a JSON column holds no value.
+
+    Vector columns store None as SQL NULL (none_as_null); rows written
+    before that hold the JSON text 'null', which IS NULL does not match.
+    """
+    return or_(column.is_(None), cast(column, String) == "null")
+
+
+# Columns added after the initial schema: (table, column, preferred type).
+# init_db adds any that are missing so legacy DBs keep working.
+LEGACY_COLUMNS = [
+    ("jobs", "skill_embeddings", "JSON"),
+    ("jobs", "embedding", "JSON"),
+    ("jobs", "updated_at", "DATETIME"),
+    ("applications", "profile_skills", "JSON"),
+    ("applications", "years_experience", "FLOAT"),
+    ("applications", "degree", "VARCHAR"),
+    ("applications", "graduation_year", "INTEGER"),
+    ("applications", "date_of_birth", "VARCHAR"),
+    ("applications", "profile_version", "INTEGER"),
+]
+
+
 def init_db():
     Base.metadata.create_all(bind=engine)
-    # Ensure legacy DBs get the new skill_embeddings column on Jobs.
-    # SQLite supports ALTER TABLE ADD COLUMN; for other DBs Alembic is preferred.
+    # Ensure legacy DBs get newer columns (see LEGACY_COLUMNS).
+    # SQLite supports ALTER TABLE ADD COLUMN; other DBs need `alembic upgrade
+    # head` (alembic/versions), which also creates the indexes below.
     try:
         from sqlalchemy import text
         with engine.connect() as conn:
-            # Check if column exists (SQLite PRAGMA; works for sqlite)
-            res = conn.execute(text("PRAGMA table_info('jobs')"))
-            cols = [row[1] for row in res.fetchall()]
-            if 'skill_embeddings' not in cols:
+            for table, column, col_type in LEGACY_COLUMNS:
+                # Check if column exists (SQLite PRAGMA; works for sqlite)
+                res = conn.execute(text(f"PRAGMA table_info('{table}')"))
+                cols = [row[1] for row in res.fetchall()]
+                if column in cols:
+                    continue
                 try:
-                    conn.execute(text("ALTER TABLE jobs ADD COLUMN skill_embeddings JSON"))
+                    conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {column} {col_type}"))
                 except Exception:
                     # Best-effort: some DBs may not support JSON type; try generic TEXT
                     try:
-                        conn.execute(text("ALTER TABLE jobs ADD COLUMN skill_embeddings TEXT"))
+                        conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {column} TEXT"))
                     except Exception:
                         pass
     except Exception:
         # If any of the above fails, we proceed; user should run proper migration in production.
         pass
+    # create_all() does not add indexes to existing tables; add the ones used
+    # by history retention, resume GC and profile filters so legacy DBs get them too.
+    try:
+        from sqlalchemy import text
+        with engine.begin() as conn:
+            conn.execute(text("CREATE INDEX IF NOT EXISTS ix_match_searches_created_at ON match_searches (created_at)"))
+            conn.execute(text("CREATE INDEX IF NOT EXISTS ix_match_results_search_id ON match_results (search_id)"))
+            conn.execute(text("CREATE INDEX IF NOT EXISTS ix_applications_resume_path ON applications (resume_path)"))
+            conn.execute(text("CREATE INDEX IF NOT EXISTS ix_match_searches_resume_path ON match_searches (resume_path)"))
+            for column in ("years_experience", "degree", "graduation_year", "profile_version"):
+                conn.execute(text(f"CREATE INDEX IF NOT EXISTS ix_applications_{column} ON applications ({column})"))
+    except Exception:
+        pass
 
 if __name__ == "__main__":
     init_db()
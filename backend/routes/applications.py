@@ -1,9 +1,18 @@
 from fastapi import APIRouter, UploadFile, File, Depends, HTTPException, Form, Query, Body
-from sqlalchemy.orm import Session
+from sqlalchemy import String, cast
+from sqlalchemy.orm import Session, undefer
 from ..models import SessionLocal, get_db, Application, Job, User, init_db
 from ..utils import parser, scoring as scoring_utils
+from ..utils.storage import remove_resume_file
+from ..utils.search import search_applications
+from ..utils.profile import extract_profile
+from ..utils.skills import get_skill_catalog, get_skill_vocabulary, normalize_text_for_matching
+from ..utils.job_contexts import iter_job_scoring_rows, load_job_context
+from ..utils.metrics import observe_stage, stage
 from typing import List, Optional
 import re
+import heapq
+import time
 from ..schemas import JobScore
 import uuid, os
 from ..schemas import ApplyResult
@@ -46,39 +55,45 @@ from pydantic import BaseModel
 class StatusUpdate(BaseModel):
     status: str
 
+
 @router.post("/apply", response_model=ApplyResult)
 async def apply(job_id: int = Form(...), candidate_id: int = Form(...), resume: UploadFile = File(...)):
     # Read and save resume first (no DB held during file IO)
     filename = f"{uuid.uuid4().hex}_{resume.filename}"
     path = os.path.join("resumes", filename)
-    contents = await resume.read()
-    with open(path, "wb") as f:
-        f.write(contents)
+    with stage("upload_read"):
+        contents = await resume.read()
+        with open(path, "wb") as f:
+            f.write(contents)
 
     text, fingerprint = parser.extract_text_and_fingerprint(path)
 
+    # structured profile is extracted once here and read back by recruiters
+    profile = extract_profile(text)
+
     # create application record, commit and close session before heavy ML scoring
     with SessionLocal() as db:
-        job = db.query(Job).filter(Job.id == job_id).first()
+        # cached JobContext built from column projections, safe to use after the session closes
+        job = load_job_context(db, job_id)
         if not job:
             raise HTTPException(status_code=404, detail="Job not found")
 
-        # eagerly copy any fields we need from the job while the session is open
-        job_description = job.description
-        job_requirements = job.requirements
-        job_skill_embeddings = getattr(job, "skill_embeddings", None)
-
-    app = Application(job_id=job_id, candidate_id=candidate_id, resume_path=path, resume_text=text, fingerprint=fingerprint)
-    db.add(app)
-    # commit to persist and populate primary key; avoid db.refresh(app) because
-    # refreshing may trigger lazy-loading of related objects (e.g. Job)
-    db.commit()
-    # primary key should now be available on the instance
-    app_id = app.id
+        app = Application(job_id=job_id, candidate_id=candidate_id, resume_path=path, resume_text=text, fingerprint=fingerprint, **profile)
+        db.add(app)
+        # commit to persist and populate primary key; avoid db.refresh(app) because
+        # refreshing may trigger lazy-loading of related objects (e.g. Job)
+        with stage("db_commit"):
+            db.commit()
+        # read the primary key while the session is open: the read starts a
+        # new transaction, which closing the session returns to the pool
+        app_id = app.id
 
     # score (sync call to ML scoring for prototype) outside DB session
-    # Use the copied job fields to avoid accessing a detached SQLAlchemy instance
-    score, explanation = scoring_utils.score_job_application({"description": job_description, "requirements": job_requirements, "skill_embeddings": job_skill_embeddings}, {"resume_text": text, "fingerprint": fingerprint})
+    resume_ctx = scoring_utils.resume_context(text, fingerprint)
+    with stage("embed"):
+        scoring_utils.resume_vector(resume_ctx)
+    with stage("score"):
+        score, explanation = scoring_utils.score_job_application(job, resume_ctx)
 
     # reopen session to save score and explanation
     with SessionLocal() as db2:
@@ -87,7 +102,8 @@ async def apply(job_id: int = Form(...), candidate_id: int = Form(...), resume:
             setattr(app, "score", float(score))
             setattr(app, "explanation", explanation)
             db2.add(app)
-            db2.commit()
+            with stage("db_commit"):
+                db2.commit()
             db2.refresh(app)
 
     return {"status": "ok", "application_id": app_id}
@@ -100,36 +116,73 @@ async def score_resume(resume: UploadFile = File(...), top_k: int = 10, min_scor
     This endpoint does not create Application records; it's a lightweight
     matching helper for the UI.
     """
-    # load jobs into memory first then close session to avoid holding DB connections
-    with SessionLocal() as db:
-        # ensure resumes dir exists
-        os.makedirs("resumes", exist_ok=True)
-        filename = f"{uuid.uuid4().hex}_{resume.filename}"
-        path = os.path.join("resumes", filename)
+    # ensure resumes dir exists
+    os.makedirs("resumes", exist_ok=True)
+    filename = f"{uuid.uuid4().hex}_{resume.filename}"
+    path = os.path.join("resumes", filename)
+    with stage("upload_read"):
         contents = await resume.read()
         with open(path, "wb") as f:
             f.write(contents)
-        text, fingerprint = parser.extract_text_and_fingerprint(path)
+    text, fingerprint = parser.extract_text_and_fingerprint(path)
 
-        jobs = db.query(Job).all()
-    results = []
-    for job in jobs:
-        score, explanation = scoring_utils.score_job_application({"description": job.description, "requirements": job.requirements, "skill_embeddings": getattr(job, "skill_embeddings", None)}, {"resume_text": text, "fingerprint": fingerprint})
+    # Stream job projections chunk by chunk and keep only the best top_k
+    # results (a min-heap keyed on score, ties broken by catalog order) so
+    # memory does not grow with the number of jobs.
+    top_k = int(top_k)
+    heap = []
+
+    # Prepare the resume once (embedding, normalized text, tokens,
+    # experience) and share it across every job.
+    resume_ctx = scoring_utils.resume_context(text, fingerprint)
+    with stage("embed"):
+        resume_vec = scoring_utils.resume_vector(resume_ctx)
+
+    # Match the resume against the whole skill vocabulary once, then get
+    # every catalog job's skill_score from one sparse matrix-vector product.
+    with stage("skill_match"):
+        vocabulary = get_skill_vocabulary()
+        vocabulary.refresh()
+        catalog = get_skill_catalog()
+        catalog.refresh()
+        vocab_mask = catalog.resume_mask(resume_ctx, resume_vec)
+        catalog_scores = catalog.skill_scores(vocab_mask)
+        vocab_has_vector = vocabulary.has_vector
+    t_score = time.perf_counter()
+
+    for seq, (job, skill_ids, job_ctx) in enumerate(iter_job_scoring_rows()):
+        skills = job_ctx.skills
+        skill_match = None
+        if job.id in catalog_scores and skill_ids and len(skill_ids) == len(skills):
+            rows = vocabulary.rows(skill_ids)
+            # The catalog checks vocabulary skills stored without a vector
+            # lexically only, while the per-job path (/apply, /explain) embeds
+            # them on the fly; score such jobs per job so every endpoint
+            # reports the same skill_score.
+            if rows.max() < len(vocab_mask) and vocab_has_vector[rows].all():
+                skill_match = ([s for s, r in zip(skills, rows) if vocab_mask[r]], catalog_scores[job.id])
+        score, explanation = scoring_utils.score_job_application(job_ctx, resume_ctx, skill_match=skill_match)
         # normalize score now so persisted results are consistent (0.0-1.0)
-        normalized = normalize_score_value(score)
-        results.append({
+        normalized = float(normalize_score_value(score))
+        if normalized < float(min_score) or top_k <= 0:
+            continue
+        entry = (normalized, -seq, {
             "job_id": job.id,
             "job_title": job.title,
             "job_description": job.description,
-            "score": float(normalized),
+            "score": normalized,
             "explanation": explanation,
             "matched_skills": explanation.get("matched_skills", []),
         })
+        if len(heap) < top_k:
+            heapq.heappush(heap, entry)
+        elif entry[:2] > heap[0][:2]:
+            heapq.heapreplace(heap, entry)
 
-    # sort descending by score and apply min_score / top_k
-    results.sort(key=lambda r: r["score"], reverse=True)
-    filtered = [r for r in results if r["score"] >= float(min_score)]
-    top = filtered[: int(top_k)]
+    observe_stage("score", time.perf_counter() - t_score)
+
+    # sort descending by score (earlier jobs first on ties)
+    top = [r for _, _, r in sorted(heap, key=lambda e: e[:2], reverse=True)]
 
     # Persist the match search and results. Try to extract user id from Authorization header if present.
     candidate_id = None
@@ -146,6 +199,7 @@ async def score_resume(resume: UploadFile = File(...), top_k: int = 10, min_scor
     try:
         # persist match search and results in a new short-lived session
         with SessionLocal() as db2:
+            t_commit = time.perf_counter()
             ms = MatchSearch(candidate_id=candidate_id, resume_path=path, fingerprint=fingerprint)
             db2.add(ms)
             db2.commit()
@@ -163,6 +217,7 @@ async def score_resume(resume: UploadFile = File(...), top_k: int = 10, min_scor
                 )
                 db2.add(mr)
             db2.commit()
+            observe_stage("db_commit", time.perf_counter() - t_commit)
     except Exception:
         # don't fail scoring if persistence fails; just log
         try:
@@ -177,9 +232,21 @@ async def score_resume(resume: UploadFile = File(...), top_k: int = 10, min_scor
 @router.get("/history")
 def list_match_history(limit: int = 20, db: Session = Depends(get_db)):
     searches = db.query(MatchSearch).order_by(MatchSearch.created_at.desc()).limit(limit).all()
+    # fetch results for all listed searches in one query instead of one per search
+    results_by_search = {s.id: [] for s in searches}
+    if searches:
+        rows = (
+            db.query(MatchResult)
+            .options(undefer(MatchResult.explanation))
+            .filter(MatchResult.search_id.in_(list(results_by_search)))
+            .order_by(MatchResult.score.desc())
+            .all()
+        )
+        for r in rows:
+            results_by_search[r.search_id].append(r)
     out = []
     for s in searches:
-        results = db.query(MatchResult).filter(MatchResult.search_id == s.id).order_by(MatchResult.score.desc()).all()
+        results = results_by_search[s.id]
         out.append({
             "search_id": s.id,
             "candidate_id": s.candidate_id,
@@ -198,44 +265,60 @@ def delete_match_search(search_id: int, db: Session = Depends(get_db)):
     if not ms:
         raise HTTPException(status_code=404, detail="Match search not found")
 
+    resume_path = ms.resume_path
     try:
         # delete associated results first
         db.query(MatchResult).filter(MatchResult.search_id == search_id).delete()
-        # attempt to remove the resume file from disk if it exists and is inside the resumes/ folder
-        try:
-            import os
-            # canonicalize paths
-            resumes_dir = os.path.abspath("resumes")
-            file_path = None
-            if getattr(ms, "resume_path", None):
-                # ensure we convert SQLAlchemy field to a plain string before using
-                rp = ms.resume_path
-                file_path = os.path.abspath(str(rp))
-            # only remove if the file is under the expected resumes directory
-            if file_path and file_path.startswith(resumes_dir) and os.path.exists(file_path):
-                try:
-                    os.remove(file_path)
-                except Exception:
-                    # don't raise if file deletion fails; continue to remove DB rows
-                    import logging
-                    logging.getLogger(__name__).warning("Failed to delete resume file: %s", file_path)
-        except Exception:
-            # best-effort only; do not fail the whole operation for file system errors
-            pass
-
         db.delete(ms)
         db.commit()
     except Exception:
         db.rollback()
         raise HTTPException(status_code=500, detail="Failed to delete match history")
 
+    # remove the resume file only once the rows are gone; failures are logged
+    # and anything left behind is picked up by scripts/gc_resumes.py
+    remove_resume_file(resume_path)
+
     return {"status": "ok", "deleted_search_id": search_id}
 
 
 @router.get("/recruiter/applications")
-def get_recruiter_applications(recruiter_id: Optional[int] = None, job_id: Optional[int] = None, status: Optional[str] = None, db: Session = Depends(get_db), current_user: User = Depends(get_current_recruiter)):
-    """Get applications for recruiter's jobs with candidate details"""
-    query = db.query(Application).join(Job).join(User, Application.candidate_id == User.id)
+def get_recruiter_applications(
+    recruiter_id: Optional[int] = None,
+    job_id: Optional[int] = None,
+    status: Optional[str] = None,
+    min_experience: Optional[float] = None,
+    degree: Optional[str] = None,
+    graduation_year: Optional[int] = None,
+    skill: Optional[str] = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_recruiter),
+):
+    """Get applications for recruiter's jobs with candidate details.
+
+    Can be filtered on the extracted profile: minimum years of experience,
+    degree (substring), graduation year and a skill.
+    """
+    # Project only the columns the listing returns: resume_text and other
+    # heavy Job columns are never loaded, and job/candidate come from the join
+    # rather than two extra queries per application.
+    query = db.query(
+        Application.id,
+        Application.job_id,
+        Application.candidate_id,
+        Application.resume_path,
+        Application.score,
+        Application.status,
+        Application.explanation,
+        Application.created_at,
+        Application.profile_skills,
+        Application.years_experience,
+        Application.degree,
+        Application.graduation_year,
+        Job.title.label("job_title"),
+        User.full_name.label("candidate_name"),
+        User.email.label("candidate_email"),
+    ).join(Job, Application.job_id == Job.id).join(User, Application.candidate_id == User.id)
     
     if recruiter_id:
         query = query.filter(Job.recruiter_id == recruiter_id)
@@ -245,67 +328,99 @@ def get_recruiter_applications(recruiter_id: Optional[int] = None, job_id: Optio
     
     if status:
         query = query.filter(Application.status == status)
+
+    if min_experience is not None:
+        query = query.filter(Application.years_experience >= min_experience)
+
+    if degree:
+        query = query.filter(Application.degree.ilike(f"%{degree}%"))
+
+    if graduation_year:
+        query = query.filter(Application.graduation_year == graduation_year)
+
+    if skill:
+        # profile_skills is a JSON list of normalized names
+        query = query.filter(cast(Application.profile_skills, String).like(f'%"{normalize_text_for_matching(skill)}"%'))
     
     applications = query.order_by(Application.created_at.desc()).all()
     
     result = []
     for app in applications:
-        candidate = db.query(User).filter(User.id == app.candidate_id).first()
-        job = db.query(Job).filter(Job.id == app.job_id).first()
-        
         result.append({
             "application_id": app.id,
             "job_id": app.job_id,
-            "job_title": job.title if job else "Unknown",
+            "job_title": app.job_title or "Unknown",
             "candidate_id": app.candidate_id,
-            "candidate_name": candidate.full_name if candidate else "Unknown",
-            "candidate_email": candidate.email if candidate else "Unknown",
+            "candidate_name": app.candidate_name or "Unknown",
+            "candidate_email": app.candidate_email or "Unknown",
             "resume_path": app.resume_path,
             "score": normalize_score_value(app.score),
             "status": app.status,
             "explanation": app.explanation,
             "created_at": app.created_at.isoformat(),
+            "candidate_skills": app.profile_skills or [],
+            "years_experience": app.years_experience,
+            "degree": app.degree,
+            "year_of_passing": app.graduation_year,
         })
     
     return result
 
 
+@router.get("/recruiter/search")
+def search_resumes(
+    q: str = Query(..., min_length=1),
+    page: int = Query(1, ge=1),
+    page_size: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_recruiter),
+):
+    """Full-text search over resumes submitted to the current recruiter's jobs.
+
+    Supports "quoted phrases" and prefix* terms (e.g. `"machine learning" kube*`).
+    Results are ranked by relevance and include a highlighted snippet.
+    """
+    total, rows = search_applications(db, q, current_user.id, page=page, page_size=page_size)
+    results = []
+    for r in rows:
+        results.append({
+            "application_id": r["application_id"],
+            "job_id": r["job_id"],
+            "job_title": r["job_title"] or "Unknown",
+            "candidate_id": r["candidate_id"],
+            "candidate_name": r["candidate_name"] or "Unknown",
+            "candidate_email": r["candidate_email"] or "Unknown",
+            "score": normalize_score_value(r["score"]),
+            "status": r["status"],
+            "snippet": r["snippet"],
+            "created_at": r["created_at"].isoformat() if r["created_at"] else None,
+        })
+    return {"query": q, "total": total, "page": page, "page_size": page_size, "results": results}
+
+
 @router.get("/recruiter/applications/{application_id}")
 def get_application_details(application_id: int, db: Session = Depends(get_db), current_user: User = Depends(get_current_recruiter)):
     """Get detailed application info with candidate profile"""
 
-    app = db.query(Application).filter(Application.id == application_id).first()
+    app = (
+        db.query(Application)
+        .options(undefer(Application.resume_text), undefer(Application.explanation))
+        .filter(Application.id == application_id)
+        .first()
+    )
     if not app:
         raise HTTPException(status_code=404, detail="Application not found")
     
     candidate = db.query(User).filter(User.id == app.candidate_id).first()
-    job = db.query(Job).filter(Job.id == app.job_id).first()
-    
-    # build response and try to extract profile details from resume_text
-    resume_text = str(app.resume_text or "")
-    # attempt to use ML helper to extract skills; import lazily to avoid import-time issues
-    candidate_skills = []
-    try:
-        from ml.scoring_service import extract_skills_from_text
-
-        candidate_skills = extract_skills_from_text(resume_text)[:20]
-    except Exception:
-        candidate_skills = []
-
-    dob = None
-    m = re.search(r"(\d{2}[/-]\d{2}[/-]\d{4})|(\d{4}[/-]\d{2}[/-]\d{2})", resume_text)
-    if m:
-        dob = m.group(0)
+    job = db.query(Job.title, Job.description).filter(Job.id == app.job_id).first()
 
-    year_of_passing = None
-    y = re.search(r"(?:year of passing|graduat(?:ed|ion) in|passed in|class of)\s*[:\-]?\s*([12][0-9]{3})", resume_text, re.I)
-    if y:
-        year_of_passing = y.group(1)
-
-    course = None
-    c = re.search(r"\b(B\.?Sc|BSc|B\.?Tech|BTech|Bachelor of [A-Za-z ]+|Master of [A-Za-z ]+|M\.?Sc|MBA|B\.?E\.?)\b", resume_text, re.I)
-    if c:
-        course = c.group(0)
+    resume_text = str(app.resume_text or "")
+    # Profile fields are extracted at ingest; rows from before that (not yet
+    # backfilled) are extracted once here and saved.
+    if app.profile_version is None:
+        for field, value in extract_profile(resume_text).items():
+            setattr(app, field, value)
+        db.commit()
 
     return {
         "application_id": app.id,
@@ -321,10 +436,11 @@ def get_application_details(application_id: int, db: Session = Depends(get_db),
         "status": app.status,
         "explanation": app.explanation,
         "created_at": app.created_at.isoformat(),
-        "candidate_skills": candidate_skills,
-        "date_of_birth": dob,
-        "year_of_passing": year_of_passing,
-        "course": course,
+        "candidate_skills": app.profile_skills or [],
+        "date_of_birth": app.date_of_birth,
+        "year_of_passing": str(app.graduation_year) if app.graduation_year else None,
+        "course": app.degree,
+        "years_experience": app.years_experience,
     }
 
 
@@ -338,49 +454,47 @@ def explain_application(application_id: int = Query(None), job_id: int = Query(N
         raise HTTPException(status_code=400, detail="Provide application_id or job_id")
 
     if application_id:
-        app = db.query(Application).filter(Application.id == application_id).first()
+        with stage("db_read"):
+            app = db.query(Application).options(undefer(Application.resume_text)).filter(Application.id == application_id).first()
+            job = load_job_context(db, app.job_id) if app else None
         if not app:
             raise HTTPException(status_code=404, detail="Application not found")
-        job = db.query(Job).filter(Job.id == app.job_id).first()
         if not job:
             raise HTTPException(status_code=404, detail="Job not found for application")
 
-        # Call scoring explain helper
+        # Call scoring explain helper (times its own embed / skill_match /
+        # sentence_encode / sentence_match stages)
+        resume_ctx = scoring_utils.resume_context(app.resume_text or "", getattr(app, "fingerprint", None))
         try:
-            report = scoring_utils.explain_job_application({
-                "description": job.description,
-                "requirements": job.requirements,
-                "skill_embeddings": getattr(job, "skill_embeddings", None),
-            }, {"resume_text": app.resume_text or "", "fingerprint": getattr(app, "fingerprint", None)})
+            report = scoring_utils.explain_job_application(job, resume_ctx)
         except Exception as e:
             raise HTTPException(status_code=500, detail=f"Explainability failed: {str(e)}")
 
         # Build simple sentence-level highlights based on token matches
         highlights = []
         try:
-            resume_text = str(app.resume_text or "")
-            # split into sentences (simple split)
-            sentences = [s.strip() for s in re.split(r"(?<=[.!?\n])\\s+", resume_text) if s.strip()]
-            # gather tokens/phrases from per_skill
-            per_skill = report.get("per_skill", [])
-            for skill_detail in per_skill:
-                skill = skill_detail.get("skill")
-                tokens = skill_detail.get("tokens_matched", []) or []
-                method = skill_detail.get("method")
-                # also include full normalized skill phrase
-                if skill:
-                    tokens.append(skill)
-                matched_sentences = []
-                for s in sentences:
-                    s_norm = re.sub(r"[\W_]+", " ", s.lower()).strip()
-                    for t in tokens:
-                        if not t:
-                            continue
-                        if t.lower() in s_norm:
-                            matched_sentences.append(s)
-                            break
-                if matched_sentences:
-                    highlights.append({"skill": skill, "method": method, "sentences": matched_sentences})
+            with stage("highlights"):
+                sentences = resume_ctx.sentences
+                # gather tokens/phrases from per_skill
+                per_skill = report.get("per_skill", [])
+                for skill_detail in per_skill:
+                    skill = skill_detail.get("skill")
+                    tokens = skill_detail.get("tokens_matched", []) or []
+                    method = skill_detail.get("method")
+                    # also include full normalized skill phrase
+                    if skill:
+                        tokens.append(skill)
+                    matched_sentences = []
+                    for s in sentences:
+                        s_norm = re.sub(r"[\W_]+", " ", s.lower()).strip()
+                        for t in tokens:
+                            if not t:
+                                continue
+                            if t.lower() in s_norm:
+                                matched_sentences.append(s)
+                                break
+                    if matched_sentences:
+                        highlights.append({"skill": skill, "method": method, "sentences": matched_sentences})
         except Exception:
             highlights = []
 
@@ -406,14 +520,9 @@ def explain_job(req: ExplainRequest, db: Session = Depends(get_db), current_user
     Otherwise `job_description` and `resume_text` must be provided in the request body.
     """
     if req.job_id:
-        job = db.query(Job).filter(Job.id == req.job_id).first()
-        if not job:
+        job_obj = load_job_context(db, req.job_id)
+        if not job_obj:
             raise HTTPException(status_code=404, detail="Job not found")
-        job_obj = {
-            "description": job.description,
-            "requirements": job.requirements,
-            "skill_embeddings": getattr(job, "skill_embeddings", None),
-        }
         resume_text = req.resume_text if req.resume_text is not None else ""
     else:
         if not req.job_description or not req.resume_text:
@@ -436,31 +545,17 @@ def delete_application(application_id: int, db: Session = Depends(get_db), curre
     if not app:
         raise HTTPException(status_code=404, detail="Application not found")
 
+    resume_path = app.resume_path
     try:
-        # attempt to remove associated resume file from disk if present and safe
-        try:
-            import os
-            resumes_dir = os.path.abspath("resumes")
-            file_path = None
-            if getattr(app, "resume_path", None):
-                rp = app.resume_path
-                file_path = os.path.abspath(str(rp))
-            if file_path and file_path.startswith(resumes_dir) and os.path.exists(file_path):
-                try:
-                    os.remove(file_path)
-                except Exception:
-                    import logging
-                    logging.getLogger(__name__).warning("Failed to delete application resume file: %s", file_path)
-        except Exception:
-            # best-effort only; swallow filesystem errors
-            pass
-
         db.delete(app)
         db.commit()
     except Exception:
         db.rollback()
         raise HTTPException(status_code=500, detail="Failed to delete application")
 
+    # remove the resume file after the row is gone (see delete_match_search)
+    remove_resume_file(resume_path)
+
     return {"status": "ok", "deleted_application_id": application_id}
 
 
@@ -1,10 +1,13 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from ..models import get_db, Job, User, Company
-from ..schemas import JobCreate, JobOut
+from ..schemas import JobCreate, JobOut, JobSearchHit
+from ..utils.search import search_jobs
 from ..auth import get_current_user
-from ..models import Application, MatchResult
+from ..models import Application, MatchResult, JobSkill
 from ..auth import get_current_recruiter
+from ..utils.skills import bump_catalog_version, job_skill_list, set_job_skills
+from ..utils.job_contexts import invalidate_job_context
 
 # Embed helper for precomputing skill vectors
 try:
@@ -22,27 +25,55 @@ def create_job(payload: JobCreate, current_user: User = Depends(get_current_user
     if not current_user or getattr(current_user, "role", None) != "recruiter":
         raise HTTPException(status_code=403, detail="Only recruiters can create jobs")
     job = Job(recruiter_id=current_user.id, title=payload.title, description=payload.description, requirements=payload.requirements)
+    # Precompute the description embedding used to re-rank keyword search hits;
+    # left NULL on failure so scripts/backfill_search_index.py fills it in
+    if embed:
+        try:
+            job.embedding = embed(payload.description).tolist()
+        except Exception:
+            pass
     # store comma-separated required_skills if provided
     if getattr(payload, "required_skills", None):
         job.required_skills = payload.required_skills
-        # Precompute skill embeddings when model is available
-        if embed:
-            try:
-                skills = [s.strip() for s in (payload.required_skills or "").split(",") if s.strip()]
-                embeddings = [embed(s).tolist() for s in skills]
-                job.skill_embeddings = embeddings
-            except Exception:
-                # If embedding computation fails, continue without embeddings
-                job.skill_embeddings = None
     db.add(job)
+    db.flush()
+    # Link the job to the shared skill vocabulary; only skills new to the
+    # vocabulary are embedded (when the model is available).
+    set_job_skills(db, job.id, job_skill_list(payload.requirements, job.required_skills), embed_fn=embed)
     db.commit()
     db.refresh(job)
     return job
 
+# Columns served by JobOut. Listing selects just these so the (deferred)
+# skill_embeddings payload and ORM identity-map overhead are skipped.
+JOB_LIST_COLUMNS = (
+    Job.id,
+    Job.title,
+    Job.description,
+    Job.requirements,
+    Job.company,
+    Job.location,
+    Job.salary_min,
+    Job.salary_max,
+    Job.experience_level,
+    Job.required_skills,
+)
+
+
 @router.get("/", response_model=list[JobOut])
 def list_jobs(db: Session = Depends(get_db)):
-    jobs = db.query(Job).all()
-    return jobs
+    rows = db.query(*JOB_LIST_COLUMNS).order_by(Job.id).all()
+    return [row._asdict() for row in rows]
+
+
+@router.get("/search", response_model=list[JobSearchHit])
+def search(q: str = Query(..., min_length=1), limit: int = Query(20, ge=1, le=100), rerank: bool = True, db: Session = Depends(get_db)):
+    """Keyword search over job title, description and skills.
+
+    Supports "quoted phrases" and prefix* terms. The best keyword hits are
+    re-ranked by semantic similarity to the query when embeddings exist.
+    """
+    return search_jobs(db, q, limit=limit, rerank=rerank, embed_fn=embed)
 
 
 @router.delete("/{job_id}")
@@ -59,10 +90,13 @@ def delete_job(job_id: int, current_user: User = Depends(get_current_recruiter),
     try:
         db.query(Application).filter(Application.job_id == job_id).delete(synchronize_session=False)
         db.query(MatchResult).filter(MatchResult.job_id == job_id).delete(synchronize_session=False)
+        db.query(JobSkill).filter(JobSkill.job_id == job_id).delete(synchronize_session=False)
+        bump_catalog_version(db)
         db.delete(job)
         db.commit()
     except Exception as e:
         db.rollback()
         raise HTTPException(status_code=500, detail=f"Failed to delete job: {e}")
+    invalidate_job_context(job_id)
 
     return {"detail": "Job deleted"}
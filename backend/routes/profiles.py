@@ -0,0 +1,22 @@
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import PlainTextResponse
+from ..auth import get_current_recruiter
+from ..models import User
+from ..utils.profiling import get_profile, list_profiles
+
+router = APIRouter()
+
+
+@router.get("")
+def profiles(current_user: User = Depends(get_current_recruiter)):
+    """Request profiles stored by this worker, newest first (see backend/utils/profiling.py)."""
+    return list_profiles()
+
+
+@router.get("/{profile_id}", response_class=PlainTextResponse)
+def profile_stacks(profile_id: str, current_user: User = Depends(get_current_recruiter)):
+    """Folded stacks of one profile, ready for flamegraph.pl or speedscope."""
+    profile = get_profile(profile_id)
+    if profile is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return PlainTextResponse(profile["folded"])
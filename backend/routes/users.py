@@ -1,9 +1,13 @@
 from fastapi import APIRouter, HTTPException, Depends, Query
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from typing import Optional, List
 from ..models import get_db, User, init_db, Application, MatchSearch, MatchResult
 from ..schemas import UserCreate, UserOut
-from ..auth import get_password_hash, create_access_token, verify_password, get_current_recruiter
+from ..auth import create_access_token, get_current_recruiter
+from ..auth import hash_password_async, verify_and_update_password_async
+from ..auth import token_claims_for, cache_user, invalidate_user_cache
+from ..utils.storage import remove_resume_file
 from pydantic import BaseModel
 import os, logging
 
@@ -13,29 +17,70 @@ class LoginRequest(BaseModel):
     email: str
     password: str
 
+# register/login await the password hashing pool, so they are async; their
+# database work still runs in the threadpool, never on the event loop, so a
+# slow or locked database cannot stall every other in-flight request.
+
+def _email_registered(db: Session, email: str) -> bool:
+    existing = db.query(User.id).filter(User.email == email).first()
+    # release the pooled connection while hashing so a burst can't exhaust the pool
+    db.rollback()
+    return existing is not None
+
+
+def _insert_user(db: Session, user: User) -> User:
+    db.add(user)
+    db.commit()
+    db.refresh(user)
+    return user
+
+
+def _load_login_user(db: Session, email: str):
+    user = db.query(User).filter(User.email == email).first()
+    if user is not None:
+        # Detach the loaded user and release the pooled connection while the
+        # hash is verified, so a login burst can't exhaust the connection pool.
+        db.expunge(user)
+    db.rollback()
+    return user
+
+
+def _store_upgraded_hash(db: Session, user_id: int, new_hash: str) -> None:
+    try:
+        db.query(User).filter(User.id == user_id).update({User.password_hash: new_hash}, synchronize_session=False)
+        db.commit()
+    except Exception:
+        db.rollback()
+        logging.getLogger(__name__).exception("Failed to upgrade password hash for user %s", user_id)
+
+
 @router.post("/register", response_model=UserOut)
-def register(payload: UserCreate, db: Session = Depends(get_db)):
-    existing = db.query(User).filter(User.email == payload.email).first()
-    if existing:
+async def register(payload: UserCreate, db: Session = Depends(get_db)):
+    if await run_in_threadpool(_email_registered, db, payload.email):
         raise HTTPException(status_code=400, detail="Email already registered")
     try:
-        password_hash = get_password_hash(payload.password)
+        password_hash = await hash_password_async(payload.password)
     except ValueError as e:
         # Friendly client error when password exceeds bcrypt's limit
         raise HTTPException(status_code=400, detail=str(e))
 
     user = User(email=payload.email, password_hash=password_hash, role=payload.role, full_name=payload.full_name)
-    db.add(user)
-    db.commit()
-    db.refresh(user)
-    return user
+    return await run_in_threadpool(_insert_user, db, user)
 
 @router.post("/login")
-def login(payload: LoginRequest, db: Session = Depends(get_db)):
-    user = db.query(User).filter(User.email == payload.email).first()
-    if not user or not verify_password(payload.password, user.password_hash):
+async def login(payload: LoginRequest, db: Session = Depends(get_db)):
+    user = await run_in_threadpool(_load_login_user, db, payload.email)
+    if not user:
+        raise HTTPException(status_code=401, detail="Invalid credentials")
+    ok, new_hash = await verify_and_update_password_async(payload.password, user.password_hash)
+    if not ok:
         raise HTTPException(status_code=401, detail="Invalid credentials")
-    token = create_access_token({"sub": str(user.id)})
+    if new_hash:
+        # stored hash uses an outdated scheme or cost; upgrade it transparently
+        await run_in_threadpool(_store_upgraded_hash, db, user.id, new_hash)
+    token = create_access_token(token_claims_for(user))
+    # warm the auth cache so the first authenticated call skips the lookup
+    cache_user(user)
     return {"access_token": token, "token_type": "bearer", "user": {"id": user.id, "email": user.email, "role": user.role, "full_name": user.full_name}}
 
 
@@ -64,37 +109,14 @@ def delete_user(user_id: int, db: Session = Depends(get_db), current_user: User
         raise HTTPException(status_code=404, detail="User not found")
 
     try:
-        # delete applications and attempt to remove resume files
-        apps = db.query(Application).filter(Application.candidate_id == user_id).all()
-        resumes_dir = os.path.abspath("resumes")
-        for a in apps:
-            try:
-                if getattr(a, "resume_path", None):
-                    fp = os.path.abspath(str(a.resume_path))
-                    if fp.startswith(resumes_dir) and os.path.exists(fp):
-                        try:
-                            os.remove(fp)
-                        except Exception:
-                            logging.getLogger(__name__).warning("Failed to remove application resume file: %s", fp)
-            except Exception:
-                # continue best-effort
-                logging.getLogger(__name__).exception("Error while attempting to remove resume for application %s", a.id)
+        # collect resume paths now; files are removed once the rows are committed
+        resume_paths = [p for (p,) in db.query(Application.resume_path).filter(Application.candidate_id == user_id)]
         # remove application rows
         db.query(Application).filter(Application.candidate_id == user_id).delete()
 
-        # delete match searches and their results, removing resume files
-        searches = db.query(MatchSearch).filter(MatchSearch.candidate_id == user_id).all()
-        for s in searches:
-            try:
-                if getattr(s, "resume_path", None):
-                    fp = os.path.abspath(str(s.resume_path))
-                    if fp.startswith(resumes_dir) and os.path.exists(fp):
-                        try:
-                            os.remove(fp)
-                        except Exception:
-                            logging.getLogger(__name__).warning("Failed to remove matchsearch resume file: %s", fp)
-            except Exception:
-                logging.getLogger(__name__).exception("Error while attempting to remove resume for matchsearch %s", s.id)
+        # delete match searches and their results
+        searches = db.query(MatchSearch.id, MatchSearch.resume_path).filter(MatchSearch.candidate_id == user_id).all()
+        resume_paths.extend(s.resume_path for s in searches)
         # remove match results and searches
         db.query(MatchResult).filter(MatchResult.search_id.in_([s.id for s in searches] if searches else [])).delete(synchronize_session=False)
         db.query(MatchSearch).filter(MatchSearch.candidate_id == user_id).delete()
@@ -102,9 +124,14 @@ def delete_user(user_id: int, db: Session = Depends(get_db), current_user: User
         # finally delete the user
         db.delete(user)
         db.commit()
+        invalidate_user_cache(user_id)
     except Exception:
         db.rollback()
         logging.getLogger(__name__).exception("Failed to delete user %s", user_id)
         raise HTTPException(status_code=500, detail="Failed to delete user and associated data")
 
+    # best-effort file cleanup; failures are logged and left for scripts/gc_resumes.py
+    for path in resume_paths:
+        remove_resume_file(path)
+
     return {"status": "ok", "deleted_user_id": user_id}
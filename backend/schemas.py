@@ -42,6 +42,20 @@ class JobOut(BaseModel):
     class Config:
         orm_mode = True
 
+class JobSearchHit(BaseModel):
+    id: int
+    title: str
+    company: Optional[str] = None
+    location: Optional[str] = None
+    experience_level: Optional[str] = None
+    required_skills: Optional[str] = None
+    salary_min: Optional[int] = None
+    salary_max: Optional[int] = None
+    snippet: Optional[str] = None
+    score: float
+    lexical_score: float
+    semantic_score: Optional[float] = None
+
 class ApplyResult(BaseModel):
     status: str
     application_id: int
@@ -0,0 +1,65 @@
+import os
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+# The app reads these at import time: point it at a throwaway SQLite file
+# and the offline hash encoder before anything imports backend.*.
+_workdir = tempfile.mkdtemp(prefix="sourcematch_tests_")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_workdir, 'test.db')}"
+os.environ.setdefault("EMBEDDING_BACKEND", "hash")
+os.environ["RETENTION_INTERVAL_SECONDS"] = "0"
+
+
+@pytest.fixture(scope="session")
+def client():
+    from fastapi.testclient import TestClient
+    from backend.main import app
+
+    cwd = os.getcwd()
+    os.chdir(_workdir)  # uploaded resumes go to ./resumes
+    try:
+        with TestClient(app) as c:
+            yield c
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(_workdir, ignore_errors=True)
+
+
+def _login(client, email, role):
+    client.post("/api/users/register", json={"email": email, "password": "secret-pw", "role": role, "full_name": email.split("@")[0]})
+    r = client.post("/api/users/login", json={"email": email, "password": "secret-pw"})
+    assert r.status_code == 200, r.text
+    body = r.json()
+    return {"Authorization": f"Bearer {body['access_token']}"}, body["user"]["id"]
+
+
+@pytest.fixture(scope="session")
+def recruiter(client):
+    return _login(client, "recruiter@example.com", "recruiter")
+
+
+@pytest.fixture(scope="session")
+def candidate(client):
+    return _login(client, "candidate@example.com", "candidate")
+
+
+@pytest.fixture(scope="session")
+def jobs(client, recruiter):
+    headers, _ = recruiter
+    specs = {
+        "backend": ("Backend Engineer", "Python developer building FastAPI services on PostgreSQL", ["Python", "FastAPI", "PostgreSQL"], 3),
+        "garden": ("Gardener", "Care for the greenhouse, plants and landscaping", ["Horticulture", "Landscaping"], 1),
+    }
+    ids = {}
+    for key, (title, description, skills, years) in specs.items():
+        r = client.post("/api/jobs/", json={"title": title, "description": description,
+                                             "requirements": {"required_skills": skills, "min_experience": years}}, headers=headers)
+        assert r.status_code == 200, r.text
+        ids[key] = r.json()["id"]
+    return ids
@@ -0,0 +1,269 @@
+import io
+
+RESUME = (
+    b"Backend engineer with 5 years of experience. Built FastAPI services in Python "
+    b"backed by PostgreSQL and Redis. B.Tech in Computer Science, year of passing: 2016."
+)
+
+
+def test_score_ranks_matching_job_first(client, jobs):
+    r = client.post("/api/applications/score", params={"top_k": 5},
+                    files={"resume": ("cv.txt", io.BytesIO(RESUME), "text/plain")})
+    assert r.status_code == 200, r.text
+    results = r.json()
+    assert [x["job_id"] for x in results[:2]] == [jobs["backend"], jobs["garden"]]
+    assert all(0.0 <= x["score"] <= 1.0 for x in results)
+    assert set(results[0]["matched_skills"]) == {"Python", "FastAPI", "PostgreSQL"}
+
+
+def test_apply_stores_profile_for_recruiters(client, jobs, recruiter, candidate):
+    headers, _ = recruiter
+    _, candidate_id = candidate
+    r = client.post("/api/applications/apply", data={"job_id": jobs["backend"], "candidate_id": candidate_id},
+                    files={"resume": ("cv.txt", io.BytesIO(RESUME), "text/plain")})
+    assert r.status_code == 200, r.text
+    application_id = r.json()["application_id"]
+
+    listing = client.get("/api/applications/recruiter/applications", params={"min_experience": 4, "skill": "fastapi"}, headers=headers)
+    assert listing.status_code == 200, listing.text
+    row = next(a for a in listing.json() if a["application_id"] == application_id)
+    assert row["years_experience"] == 5
+    assert 0.0 <= row["score"] <= 1.0
+
+    details = client.get(f"/api/applications/recruiter/applications/{application_id}", headers=headers).json()
+    assert details["year_of_passing"] == "2016"
+    assert "python" in details["candidate_skills"]
+
+
+def test_explain_job_inline(client, recruiter):
+    headers, _ = recruiter
+    r = client.post("/api/applications/recruiter/explain_job", headers=headers, json={
+        "job_description": "Go developer", "job_requirements": {"required_skills": ["Go", "Kubernetes"]},
+        "resume_text": "I write Go services. I run them on Kubernetes.",
+    })
+    assert r.status_code == 200, r.text
+    report = r.json()
+    assert report["matched_skills"] == ["Go", "Kubernetes"]
+    assert 0.0 <= report["composite_score"] <= 1.0
+
+
+def test_ready_reports_warm_caches(client, jobs):
+    import time
+
+    deadline = time.time() + 10
+    while True:
+        r = client.get("/ready")
+        if r.status_code == 200 or time.time() > deadline:
+            break
+        time.sleep(0.05)
+    assert r.status_code == 200, r.text
+    report = r.json()
+    assert report["model"] == {"loaded": True, "backend": "hash"}
+    assert set(report["warmup"]["stages"]) == {"model", "vocabulary", "catalog", "job_contexts"}
+    assert report["caches"]["vocabulary"]["skills"] > 0
+
+
+def test_metrics_exposition(client, jobs):
+    import io
+
+    r = client.post("/api/applications/score", files={"resume": ("r.txt", io.BytesIO(b"Python and FastAPI, 4 years"), "text/plain")})
+    assert r.status_code == 200, r.text
+    body = client.get("/metrics").text
+    assert 'sourcematch_http_request_duration_seconds_count{method="POST",route="/api/applications/score",status="200"}' in body
+    for name in ("upload_read", "parse", "fingerprint", "embed", "skill_match", "score", "db_commit"):
+        assert f'sourcematch_stage_duration_seconds_count{{stage="{name}"}}' in body
+    assert 'sourcematch_model_calls_total{backend="hash"}' in body
+    assert "sourcematch_password_hash_queue_depth 0" in body
+
+
+def test_server_timing_and_profiles(client, jobs, recruiter, candidate, monkeypatch):
+    headers, _ = recruiter
+    candidate_headers, candidate_id = candidate
+    r = client.post("/api/applications/apply", data={"job_id": jobs["backend"], "candidate_id": candidate_id},
+                    files={"resume": ("cv.txt", io.BytesIO(RESUME), "text/plain")})
+    application_id = r.json()["application_id"]
+
+    r = client.get("/api/applications/recruiter/explain", params={"application_id": application_id},
+                   headers={**headers, "X-Profile": "1"})
+    assert r.status_code == 200, r.text
+    stages = [part.split(";")[0] for part in r.headers["server-timing"].split(", ")]
+    for name in ("db_read", "embed", "skill_match", "sentence_encode", "sentence_match", "highlights"):
+        assert name in stages
+    assert stages[-1] == "total"
+    profile_id = r.headers["x-profile-id"]
+
+    listed = client.get("/api/profiles", headers=headers).json()
+    assert listed[0]["id"] == profile_id
+    assert listed[0]["route"] == "/api/applications/recruiter/explain"
+    assert "highlights" in listed[0]["stages_ms"]
+    stacks = client.get(f"/api/profiles/{profile_id}", headers=headers)
+    assert stacks.status_code == 200
+    assert stacks.headers["content-type"].startswith("text/plain")
+
+    # the sampler thread is joined in the threadpool, not on the event loop
+    import asyncio
+
+    from backend.utils.profiling import SamplingProfiler
+
+    stopped_on_loop = []
+    stop = SamplingProfiler.stop
+
+    def recording_stop(self):
+        try:
+            asyncio.get_running_loop()
+            stopped_on_loop.append(True)
+        except RuntimeError:
+            stopped_on_loop.append(False)
+        stop(self)
+
+    monkeypatch.setattr(SamplingProfiler, "stop", recording_stop)
+    assert "x-profile-id" in client.get("/health", headers={**headers, "X-Profile": "1"}).headers
+    assert stopped_on_loop == [False]
+
+    # only recruiters can ask for a profile or read them
+    r = client.get("/health", headers={**candidate_headers, "X-Profile": "1"})
+    assert "server-timing" in r.headers and "x-profile-id" not in r.headers
+    assert client.get(f"/api/profiles/{profile_id}", headers=candidate_headers).status_code == 403
+
+
+def test_skill_catalog_follows_delete_then_create(client, recruiter):
+    headers, _ = recruiter
+
+    def create(title, skill):
+        r = client.post("/api/jobs/", json={"title": title, "description": f"{title} role",
+                                             "requirements": {"required_skills": [skill], "min_experience": 0}}, headers=headers)
+        assert r.status_code == 200, r.text
+        return r.json()["id"]
+
+    def score(resume):
+        r = client.post("/api/applications/score", params={"top_k": 50},
+                        files={"resume": ("cv.txt", io.BytesIO(resume), "text/plain")})
+        assert r.status_code == 200, r.text
+        return {x["job_id"]: x for x in r.json()}
+
+    create("Python Dev", "Python")
+    b = create("Cluster Ops", "Kubernetes")
+    score(b"Kubernetes operator.")  # catalog built with B's job_skills row
+    assert client.delete(f"/api/jobs/{b}", headers=headers).status_code == 200
+    c = create("Java Dev", "Java")
+    assert c == b  # SQLite hands the freed id (and job_skills rowid) to the new job
+
+    result = score(b"Java developer.")[c]
+    assert result["matched_skills"] == ["Java"]
+    assert result["explanation"]["skill_score"] == 1.0
+
+
+def test_apply_returns_its_connection_to_the_pool(client, jobs, candidate):
+    from backend.models import engine
+
+    _, candidate_id = candidate
+    checked_out = engine.pool.checkedout()
+    for _ in range(3):
+        r = client.post("/api/applications/apply", data={"job_id": jobs["backend"], "candidate_id": candidate_id},
+                        files={"resume": ("cv.txt", io.BytesIO(RESUME), "text/plain")})
+        assert r.status_code == 200, r.text
+    assert engine.pool.checkedout() == checked_out
+
+
+def test_register_and_login_keep_database_work_off_the_event_loop(client):
+    import asyncio
+
+    from sqlalchemy import event
+
+    from backend.models import engine
+
+    on_loop = []
+
+    def record(conn, cursor, statement, *args):
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return  # threadpool worker
+        on_loop.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        r = client.post("/api/users/register", json={"email": "loop@example.com", "password": "secret-pw", "role": "candidate", "full_name": "Loop"})
+        assert r.status_code == 200, r.text
+        assert client.post("/api/users/login", json={"email": "loop@example.com", "password": "secret-pw"}).status_code == 200
+        assert client.post("/api/users/login", json={"email": "loop@example.com", "password": "wrong"}).status_code == 401
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+    assert on_loop == []
+
+
+def test_score_uses_the_per_job_path_for_skills_without_vectors(client, recruiter, candidate, monkeypatch):
+    from sqlalchemy.orm import undefer
+
+    from backend.models import Application, SessionLocal
+    from backend.utils import scoring as scoring_utils
+    from backend.utils.skills import get_or_create_skills
+
+    headers, _ = recruiter
+    with SessionLocal() as db:
+        get_or_create_skills(db, ["Quux Framework"])  # stored while the model was unavailable
+        db.commit()
+    jobs = {}
+    for title, skills in (("Quux Dev", ["Python", "Quux Framework"]), ("Plain Dev", ["Python"])):
+        r = client.post("/api/jobs/", json={"title": title, "description": f"{title} role",
+                                             "requirements": {"required_skills": skills, "min_experience": 0}}, headers=headers)
+        assert r.status_code == 200, r.text
+        jobs[title] = r.json()["id"]
+
+    used_catalog = {}
+    score_job = scoring_utils.score_job_application
+
+    def recording(job, application, skill_match=None):
+        used_catalog[job.job_id] = skill_match is not None
+        return score_job(job, application, skill_match=skill_match)
+
+    monkeypatch.setattr(scoring_utils, "score_job_application", recording)
+    resume = b"Python developer using the Quux framework."
+    r = client.post("/api/applications/score", params={"top_k": 100}, files={"resume": ("cv.txt", io.BytesIO(resume), "text/plain")})
+    assert r.status_code == 200, r.text
+    assert used_catalog[jobs["Quux Dev"]] is False and used_catalog[jobs["Plain Dev"]] is True
+    scored = {x["job_id"]: x["explanation"]["skill_score"] for x in r.json()}
+
+    _, candidate_id = candidate
+    r = client.post("/api/applications/apply", data={"job_id": jobs["Quux Dev"], "candidate_id": candidate_id},
+                    files={"resume": ("cv.txt", io.BytesIO(resume), "text/plain")})
+    assert r.status_code == 200, r.text
+    with SessionLocal() as db:
+        app = db.query(Application).options(undefer(Application.explanation)).filter(Application.id == r.json()["application_id"]).one()
+    assert app.explanation["skill_score"] == scored[jobs["Quux Dev"]]
+
+
+def test_deleted_or_demoted_users_lose_access(client, recruiter):
+    from backend.auth import invalidate_user_cache
+    from backend.models import SessionLocal, User
+
+    admin_headers, _ = recruiter
+
+    def register(email, role):
+        client.post("/api/users/register", json={"email": email, "password": "secret-pw", "role": role, "full_name": "x"})
+        body = client.post("/api/users/login", json={"email": email, "password": "secret-pw"}).json()
+        return {"Authorization": f"Bearer {body['access_token']}"}, body["user"]["id"]
+
+    listing = "/api/users/recruiter/users"
+    headers, user_id = register("leaving@example.com", "recruiter")
+    assert client.get(listing, headers=headers).status_code == 200
+    assert client.delete(f"/api/users/recruiter/users/{user_id}", headers=admin_headers).status_code == 200
+    assert client.get(listing, headers=headers).status_code == 401
+
+    # a role change made elsewhere applies once this process's cache entry expires
+    headers, user_id = register("demoted@example.com", "recruiter")
+    assert client.get(listing, headers=headers).status_code == 200
+    with SessionLocal() as db:
+        db.query(User).filter(User.id == user_id).update({User.role: "candidate"})
+        db.commit()
+    invalidate_user_cache(user_id)  # what the TTL does on the other workers
+    assert client.get(listing, headers=headers).status_code == 403
+
+    # the token's role claim does not decide: a promoted user is let in
+    headers, user_id = register("promoted@example.com", "candidate")
+    assert client.get(listing, headers=headers).status_code == 403
+    with SessionLocal() as db:
+        db.query(User).filter(User.id == user_id).update({User.role: "recruiter"})
+        db.commit()
+    invalidate_user_cache(user_id)
+    assert client.get(listing, headers=headers).status_code == 200
@@ -0,0 +1,38 @@
+import json
+
+from benchmarks.compare_results import main
+
+
+def _case(run_p50s, stdev=0.3):
+    p50 = sorted(run_p50s)[len(run_p50s) // 2]
+    return {"calls": 30 * len(run_p50s), "runs": len(run_p50s), "p50_ms": p50, "p95_ms": p50 * 1.3, "stdev_ms": stdev,
+            "run_p50_ms": run_p50s, "peak_alloc_mb": 2.0, "peak_rss_mb": 120.0}
+
+
+def _write(path, cases):
+    path.write_text(json.dumps({"config": {"runs": 5}, "cases": cases}))
+    return str(path)
+
+
+def test_identical_results_pass(tmp_path):
+    cases = {"score": _case([2.0, 2.1, 1.9, 2.05, 1.95]), "api": _case([20.0, 22.0, 19.5, 21.0, 20.5], stdev=4.0)}
+    base = _write(tmp_path / "base.json", cases)
+    new = _write(tmp_path / "new.json", cases)
+    report = tmp_path / "report.json"
+    assert main([base, new, "--json", str(report)]) == 0
+    assert {r["verdict"] for r in json.loads(report.read_text())["cases"].values()} == {"unchanged"}
+
+
+def test_too_few_runs_is_inconclusive_not_a_regression(tmp_path, capsys):
+    base = _write(tmp_path / "base.json", {"score": _case([2.0, 2.02])})
+    new = _write(tmp_path / "new.json", {"score": _case([2.64, 2.66])})
+    assert main([base, new]) == 0
+    captured = capsys.readouterr()
+    assert "inconclusive (2 runs)" in captured.out
+    assert "fewer than 5 runs" in captured.err
+
+
+def test_clear_slowdown_with_enough_runs_fails(tmp_path):
+    base = _write(tmp_path / "base.json", {"score": _case([2.0, 2.02, 1.98, 2.01, 1.99], stdev=0.1)})
+    new = _write(tmp_path / "new.json", {"score": _case([2.6, 2.62, 2.58, 2.61, 2.59], stdev=0.1)})
+    assert main([base, new]) == 1
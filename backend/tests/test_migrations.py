@@ -0,0 +1,59 @@
+import os
+from pathlib import Path
+
+import pytest
+import sqlalchemy as sa
+
+alembic_command = pytest.importorskip("alembic.command")
+from alembic.config import Config
+
+ROOT = Path(__file__).parent.parent.parent
+
+
+def _upgrade(monkeypatch, url, revision="head", stamp=None):
+    monkeypatch.setenv("DATABASE_URL", url)
+    config = Config()
+    config.set_main_option("script_location", str(ROOT / "alembic"))
+    if stamp:
+        alembic_command.stamp(config, stamp)
+    alembic_command.upgrade(config, revision)
+
+
+def _schema(url):
+    engine = sa.create_engine(url)
+    try:
+        insp = sa.inspect(engine)
+        return {
+            table: ({c["name"] for c in insp.get_columns(table)}, {ix["name"] for ix in insp.get_indexes(table)})
+            for table in insp.get_table_names()
+        }
+    finally:
+        engine.dispose()
+
+
+def test_migrations_create_the_model_schema(monkeypatch, tmp_path):
+    from backend.models import Application, DataVersion, Job, JobSkill, Skill
+
+    url = f"sqlite:///{tmp_path / 'migrated.db'}"
+    _upgrade(monkeypatch, url)
+    schema = _schema(url)
+    for model in (Skill, JobSkill, DataVersion, Application):
+        table = model.__table__
+        columns, indexes = schema[table.name]
+        assert {c.name for c in table.columns} <= columns
+        # 0001 predates the ix_<table>_id indexes of the baseline tables
+        assert {ix.name for ix in table.indexes if ix.name != f"ix_{table.name}_id"} <= indexes
+    assert {"embedding", "skill_embeddings", "updated_at"} <= schema[Job.__tablename__][0]
+
+
+def test_migrations_upgrade_a_database_built_by_init_db(monkeypatch, tmp_path):
+    url = f"sqlite:///{tmp_path / 'legacy.db'}"
+    engine = sa.create_engine(url)
+    from backend.models import Base
+    Base.metadata.create_all(engine)
+    engine.dispose()
+    before = _schema(url)
+    _upgrade(monkeypatch, url, stamp="0001_initial")
+    after = _schema(url)
+    assert after.pop("alembic_version")
+    assert after == before
@@ -0,0 +1,42 @@
+import os
+
+from backend.utils.procmem import format_memory_report, memory_report, process_memory
+from run_backend import RestartPolicy
+
+
+def test_restart_policy_backs_off_and_gives_up_on_fast_failures():
+    policy = RestartPolicy(min_uptime=10, backoff_max=3, max_fast_failures=4)
+    assert [policy.on_exit(0, uptime=0.2) for _ in range(3)] == [0.5, 1.0, 2.0]
+    assert policy.on_exit(1, uptime=0.2) == 0.5  # counted per worker
+    assert policy.on_exit(0, uptime=0.2) is None
+
+
+def test_restart_policy_resets_after_a_healthy_run():
+    policy = RestartPolicy(min_uptime=10, backoff_max=30, max_fast_failures=3)
+    policy.on_exit(0, uptime=1)
+    policy.on_exit(0, uptime=1)
+    assert policy.on_exit(0, uptime=3600) == 0.0
+    assert policy.on_exit(0, uptime=1) == 0.5
+
+
+def test_process_memory_of_this_process():
+    mem = process_memory()
+    assert mem["rss"] > 0
+    if mem["pss"] is not None:  # smaps_rollup available
+        assert 0 < mem["uss"] <= mem["rss"] and mem["pss"] <= mem["rss"]
+    assert memory_report([os.getpid(), 2 ** 22 + 12345]).keys() == {os.getpid()}  # gone pids are skipped
+    assert process_memory(2 ** 22 + 12345) is None
+
+
+def test_format_memory_report_totals_pss():
+    report = {
+        100: {"rss": 300e6, "pss": 120e6, "uss": 40e6, "shared": 260e6, "swap": 0},
+        101: {"rss": 310e6, "pss": 130e6, "uss": 50e6, "shared": 260e6, "swap": 0},
+    }
+    lines = format_memory_report(report, {100: "parent", 101: "worker 0"}).splitlines()
+    assert lines[1].split() == ["parent", "100", "300.0", "120.0", "40.0", "260.0"]
+    assert lines[-1].split() == ["total", "(PSS)", "250.0"]
+
+    no_pss = {100: {"rss": 300e6, "pss": None, "uss": None, "shared": None, "swap": None}}
+    lines = format_memory_report(no_pss).splitlines()
+    assert len(lines) == 2 and lines[1].split() == ["100", "300.0", "-", "-", "-"]
@@ -0,0 +1,106 @@
+import json
+import os
+import time
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+OLD = time.time() - 7 * 24 * 3600
+
+
+@pytest.fixture
+def uploads(tmp_path):
+    """A resumes/ directory with referenced, orphaned and in-flight files."""
+    from backend.models import Application, Base, MatchSearch
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'gc.db'}")
+    Base.metadata.create_all(engine)
+    session_factory = sessionmaker(bind=engine)
+    resumes = tmp_path / "resumes"
+    resumes.mkdir()
+    for name in ("applied.txt", "searched.txt", "windows.txt", "orphan-1.txt", "orphan-2.txt", "uploading.txt", ".keep"):
+        (resumes / name).write_bytes(b"x" * 10)
+        if name != "uploading.txt":
+            os.utime(resumes / name, (OLD, OLD))
+    (resumes / "nested").mkdir()
+    with session_factory() as db:
+        # routes store paths relative to the server's cwd; older rows may be absolute or use backslashes
+        db.add(Application(job_id=1, candidate_id=1, resume_path=os.path.join("resumes", "applied.txt")))
+        db.add(MatchSearch(resume_path=str(resumes / "searched.txt")))
+        db.add(MatchSearch(resume_path="resumes\\windows.txt"))
+        db.commit()
+    yield session_factory, resumes
+    engine.dispose()
+
+
+def _files(directory):
+    return sorted(os.listdir(directory))
+
+
+def test_collect_deletes_only_old_orphans(uploads):
+    from backend.utils.resume_gc import collect_orphaned_resumes
+
+    session_factory, resumes = uploads
+    stats = collect_orphaned_resumes(str(resumes), grace_seconds=3600, batch_size=2, session_factory=session_factory)
+    assert stats["scanned"] == 6 and stats["skipped_recent"] == 1 and stats["referenced"] == 3
+    assert stats["orphaned"] == stats["deleted"] == 2 and stats["bytes_reclaimed"] == 20
+    assert _files(resumes) == [".keep", "applied.txt", "nested", "searched.txt", "uploading.txt", "windows.txt"]
+
+
+def test_dry_run_leaves_files_in_place(uploads):
+    from backend.utils.resume_gc import collect_orphaned_resumes
+
+    session_factory, resumes = uploads
+    before = _files(resumes)
+    stats = collect_orphaned_resumes(str(resumes), grace_seconds=3600, dry_run=True, session_factory=session_factory)
+    assert stats["dry_run"] and stats["orphaned"] == 2 and stats["bytes_reclaimed"] == 20
+    assert stats["deleted"] == stats["quarantined"] == 0
+    assert _files(resumes) == before
+
+
+def test_quarantine_moves_orphans(uploads, tmp_path):
+    from backend.utils.resume_gc import collect_orphaned_resumes
+
+    session_factory, resumes = uploads
+    quarantine = tmp_path / "quarantine"
+    stats = collect_orphaned_resumes(str(resumes), grace_seconds=3600, quarantine_dir=str(quarantine),
+                                     session_factory=session_factory)
+    assert stats["quarantined"] == 2 and stats["deleted"] == 0
+    assert _files(quarantine) == ["orphan-1.txt", "orphan-2.txt"]
+    assert "orphan-1.txt" not in _files(resumes)
+
+
+def test_zero_grace_still_keeps_referenced_files(uploads):
+    from backend.utils.resume_gc import collect_orphaned_resumes
+
+    session_factory, resumes = uploads
+    stats = collect_orphaned_resumes(str(resumes), grace_seconds=0, session_factory=session_factory)
+    assert stats["deleted"] == 3
+    assert _files(resumes) == [".keep", "applied.txt", "nested", "searched.txt", "windows.txt"]
+
+
+def test_missing_directory_is_a_no_op(tmp_path):
+    from backend.utils.resume_gc import collect_orphaned_resumes
+
+    stats = collect_orphaned_resumes(str(tmp_path / "absent"))
+    assert stats["scanned"] == 0 and stats["deleted"] == 0
+
+
+def test_gc_resumes_script(client, tmp_path, capsys):
+    from scripts.gc_resumes import main
+
+    resumes = tmp_path / "resumes"
+    resumes.mkdir()
+    for name in ("stale.txt", "fresh.txt"):
+        (resumes / name).write_bytes(b"x" * 10)
+    os.utime(resumes / "stale.txt", (OLD, OLD))
+
+    main(["--resumes-dir", str(resumes), "--grace-hours", "1", "--dry-run", "--json"])
+    stats = json.loads(capsys.readouterr().out)
+    assert stats["orphaned"] == 1 and stats["skipped_recent"] == 1
+    assert _files(resumes) == ["fresh.txt", "stale.txt"]
+
+    main(["--resumes-dir", str(resumes), "--grace-hours", "1", "--quarantine", str(tmp_path / "q")])
+    assert "quarantined 1 orphans" in capsys.readouterr().out
+    assert _files(resumes) == ["fresh.txt"] and _files(tmp_path / "q") == ["stale.txt"]
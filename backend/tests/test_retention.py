@@ -0,0 +1,151 @@
+import datetime
+import json
+import os
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+
+@pytest.fixture
+def history(tmp_path):
+    """Empty schema in its own SQLite file plus a resumes/ directory."""
+    from backend.models import Base
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'history.db'}")
+    Base.metadata.create_all(engine)
+    resumes = tmp_path / "resumes"
+    resumes.mkdir()
+    yield sessionmaker(bind=engine), str(resumes)
+    engine.dispose()
+
+
+def _search(session_factory, resumes_dir, name, age_days, candidate_id=None, fingerprint=None, results=2):
+    from backend.models import MatchResult, MatchSearch
+
+    path = os.path.join(resumes_dir, name)
+    with open(path, "wb") as f:
+        f.write(b"x" * 100)
+    created = datetime.datetime.utcnow() - datetime.timedelta(days=age_days)
+    with session_factory() as db:
+        search = MatchSearch(candidate_id=candidate_id, fingerprint=fingerprint, resume_path=path, created_at=created)
+        db.add(search)
+        db.flush()
+        db.add_all([MatchResult(search_id=search.id, job_title=f"job {i}", score=0.5) for i in range(results)])
+        db.commit()
+        return search.id
+
+
+def _remaining(session_factory):
+    from backend.models import MatchResult, MatchSearch
+
+    with session_factory() as db:
+        return {s.id for s in db.query(MatchSearch.id)}, db.query(MatchResult).count()
+
+
+def test_age_retention_deletes_rows_and_files(history):
+    from backend.utils.retention import compact_match_history
+
+    session_factory, resumes = history
+    old = _search(session_factory, resumes, "old.txt", age_days=40, candidate_id=1)
+    new = _search(session_factory, resumes, "new.txt", age_days=1, candidate_id=1)
+
+    stats = compact_match_history(max_age_days=30, max_searches_per_candidate=0, session_factory=session_factory, resumes_dir=resumes)
+    assert stats["searches_deleted"] == 1 and stats["results_deleted"] == 2
+    assert stats["files_deleted"] == 1 and stats["bytes_reclaimed"] == 100
+    assert _remaining(session_factory) == ({new}, 2)
+    assert os.listdir(resumes) == ["new.txt"]
+    assert old not in _remaining(session_factory)[0]
+
+
+def test_per_candidate_cap_keeps_newest_in_batches(history):
+    from backend.utils.retention import compact_match_history
+
+    session_factory, resumes = history
+    mine = [_search(session_factory, resumes, f"c{i}.txt", age_days=10 - i, candidate_id=7) for i in range(4)]
+    # anonymous searches are capped per resume fingerprint
+    anon = [_search(session_factory, resumes, f"a{i}.txt", age_days=10 - i, fingerprint="fp") for i in range(3)]
+    other = _search(session_factory, resumes, "other.txt", age_days=50, fingerprint="other")
+
+    stats = compact_match_history(max_age_days=0, max_searches_per_candidate=2, batch_size=1,
+                                  session_factory=session_factory, resumes_dir=resumes)
+    assert stats["searches_deleted"] == 3 and stats["batches"] == 3
+    assert _remaining(session_factory)[0] == {mine[2], mine[3], anon[1], anon[2], other}
+
+
+def test_dry_run_reports_without_deleting(history):
+    from backend.utils.retention import compact_match_history
+
+    session_factory, resumes = history
+    ids = {_search(session_factory, resumes, f"s{i}.txt", age_days=100, candidate_id=1) for i in range(3)}
+
+    stats = compact_match_history(max_age_days=30, dry_run=True, session_factory=session_factory, resumes_dir=resumes)
+    assert stats["dry_run"] and stats["searches_deleted"] == 3 and stats["results_deleted"] == 6
+    assert stats["files_deleted"] == 3 and stats["bytes_reclaimed"] == 300
+    assert _remaining(session_factory) == (ids, 6)
+    assert len(os.listdir(resumes)) == 3
+
+
+def test_files_outside_the_resumes_dir_are_never_removed(history, tmp_path):
+    from backend.models import MatchSearch
+    from backend.utils.retention import compact_match_history
+
+    session_factory, resumes = history
+    search_id = _search(session_factory, resumes, "s.txt", age_days=100)
+    outside = tmp_path / "important.txt"
+    outside.write_bytes(b"keep me")
+    with session_factory() as db:
+        db.query(MatchSearch).filter(MatchSearch.id == search_id).update({MatchSearch.resume_path: str(outside)})
+        db.commit()
+
+    stats = compact_match_history(max_age_days=30, session_factory=session_factory, resumes_dir=resumes)
+    assert stats["searches_deleted"] == 1 and stats["files_deleted"] == 0
+    assert outside.exists()
+
+
+def test_no_policy_deletes_nothing(history):
+    from backend.utils.retention import compact_match_history
+
+    session_factory, resumes = history
+    ids = {_search(session_factory, resumes, "s.txt", age_days=1000, candidate_id=1)}
+    stats = compact_match_history(max_age_days=0, max_searches_per_candidate=0, session_factory=session_factory, resumes_dir=resumes)
+    assert stats["searches_deleted"] == 0 and _remaining(session_factory)[0] == ids
+
+
+def test_compact_history_script(client, capsys):
+    from backend.models import SessionLocal
+    from scripts.compact_history import main
+
+    ancient = _search(SessionLocal, "resumes", "ancient-history.txt", age_days=3650, candidate_id=None, fingerprint="ancient")
+
+    main(["--max-age-days", "3000", "--dry-run", "--json"])
+    assert json.loads(capsys.readouterr().out)["searches_deleted"] == 1
+    assert ancient in _remaining(SessionLocal)[0]
+
+    main(["--max-age-days", "3000"])
+    assert capsys.readouterr().out.startswith("Deleted 1 searches, 2 results and 1 resume files")
+    assert ancient not in _remaining(SessionLocal)[0]
+    assert not os.path.exists(os.path.join("resumes", "ancient-history.txt"))
+
+
+def test_cap_ranks_the_table_once_and_combines_with_age(history):
+    from sqlalchemy import event
+
+    from backend.utils.retention import compact_match_history
+
+    session_factory, resumes = history
+    ids = [_search(session_factory, resumes, f"s{i}.txt", age_days=60 - 10 * i, candidate_id=3) for i in range(6)]
+    windows = []
+    event.listen(session_factory.kw["bind"], "before_cursor_execute",
+                 lambda conn, cursor, statement, *args: windows.append(statement) if "row_number" in statement else None)
+
+    # ages 60, 50, 40 expire; of the rest (30, 20, 10) the cap keeps the newest two
+    expected = {"searches_deleted": 4, "results_deleted": 8, "files_deleted": 4}
+    dry = compact_match_history(max_age_days=35, max_searches_per_candidate=2, batch_size=1, dry_run=True,
+                                session_factory=session_factory, resumes_dir=resumes)
+    assert {k: dry[k] for k in expected} == expected
+    stats = compact_match_history(max_age_days=35, max_searches_per_candidate=2, batch_size=1,
+                                  session_factory=session_factory, resumes_dir=resumes)
+    assert {k: stats[k] for k in expected} == expected and stats["batches"] == 4
+    assert _remaining(session_factory)[0] == {ids[4], ids[5]}
+    assert len(windows) == 2  # one ranking query per run, not per batch
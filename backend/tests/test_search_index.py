@@ -0,0 +1,107 @@
+from sqlalchemy import text
+
+
+def test_backfill_fills_jobs_without_embedding(client):
+    from backend.models import Job, SessionLocal
+    from scripts.backfill_search_index import backfill_job_embeddings
+
+    with SessionLocal() as db:
+        unset = Job(title="No vector", description="embedding failed at create time", requirements={}, embedding=None)
+        legacy = Job(title="Legacy null", description="stored before none_as_null", requirements={})
+        db.add_all([unset, legacy])
+        db.flush()
+        # older rows hold the JSON text 'null' rather than SQL NULL
+        db.execute(text("UPDATE jobs SET embedding = 'null' WHERE id = :id"), {"id": legacy.id})
+        db.commit()
+        assert db.execute(text("SELECT typeof(embedding) FROM jobs WHERE id = :id"), {"id": unset.id}).scalar() == "null"
+        ids = (unset.id, legacy.id)
+
+    assert backfill_job_embeddings() >= 2
+    with SessionLocal() as db:
+        for job_id in ids:
+            vector = db.query(Job.embedding).filter(Job.id == job_id).scalar()
+            assert isinstance(vector, list) and len(vector) > 0
+    assert backfill_job_embeddings() == 0
+
+
+def test_backfill_force_reembeds_stored_vectors(client):
+    from backend.models import Job, SessionLocal
+    from scripts.backfill_search_index import backfill_job_embeddings
+
+    with SessionLocal() as db:
+        job = Job(title="Old vector", description="stored before windowed embeddings", requirements={}, embedding=[0.0, 1.0])
+        db.add(job)
+        db.commit()
+        job_id = job.id
+
+    backfill_job_embeddings()
+    with SessionLocal() as db:
+        assert db.query(Job.embedding).filter(Job.id == job_id).scalar() == [0.0, 1.0]
+    with SessionLocal() as db:
+        total = db.query(Job).count()
+    assert backfill_job_embeddings(force=True) == total
+    with SessionLocal() as db:
+        assert len(db.query(Job.embedding).filter(Job.id == job_id).scalar()) > 2
+
+
+def _jobs_db(tmp_path, jobs):
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+
+    from backend.models import Base, Job
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'search.db'}")
+    Base.metadata.create_all(engine)
+    with sessionmaker(bind=engine)() as db:
+        db.add_all([Job(title=title, description="Rust services", requirements={}, embedding=vector) for title, vector in jobs])
+        db.commit()
+    return engine
+
+
+def test_search_falls_back_to_like_without_fts5(tmp_path, monkeypatch):
+    from sqlalchemy.orm import Session
+
+    from backend.utils import search
+
+    engine = _jobs_db(tmp_path, [("Rust Engineer", None)])
+    # simulate an SQLite build without the fts5 module
+    broken = [(table, [ddl.replace("USING fts5", "USING no_such_fts") for ddl in ddls], backfill)
+              for table, ddls, backfill in search._FTS_TABLES]
+    monkeypatch.setattr(search, "_FTS_TABLES", broken)
+    search.ensure_search_indexes(engine)
+    assert not search.fts_available(engine)
+    with Session(engine) as db:
+        assert [h["title"] for h in search.search_jobs(db, "rust", rerank=False)] == ["Rust Engineer"]
+    engine.dispose()
+
+
+def test_search_blends_unembedded_hits_with_a_neutral_semantic_score(tmp_path):
+    from sqlalchemy.orm import Session
+
+    from backend.utils.search import search_jobs
+
+    engine = _jobs_db(tmp_path, [("Close", [1.0, 0.0]), ("Unembedded", None), ("Far", [0.0, 1.0])])
+    with Session(engine) as db:  # no FTS tables: every LIKE hit has lexical score 1.0
+        hits = search_jobs(db, "rust", embed_fn=lambda q: [1.0, 0.0], semantic_weight=0.5)
+    assert [h["title"] for h in hits] == ["Close", "Unembedded", "Far"]
+    assert hits[1]["semantic_score"] is None and hits[1]["score"] == 0.75
+    engine.dispose()
+
+
+def test_reembedding_a_job_refreshes_its_cached_context(client):
+    from backend.models import Job, SessionLocal
+    from backend.utils import job_contexts
+    from scripts.backfill_search_index import backfill_job_embeddings
+
+    with SessionLocal() as db:
+        job = Job(title="Cached", description="context cached before re-embedding", requirements={}, embedding=[0.0, 1.0])
+        db.add(job)
+        db.commit()
+        before = job_contexts.load_job_context(db, job.id)
+        assert job_contexts.load_job_context(db, job.id) is before
+
+    backfill_job_embeddings(force=True)
+    with SessionLocal() as db:
+        after = job_contexts.load_job_context(db, job.id)
+    assert after is not before
+    assert len(after.description_vector(lambda text: None)) > 2
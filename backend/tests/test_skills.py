@@ -0,0 +1,113 @@
+import numpy as np
+import pytest
+from sqlalchemy import text
+
+
+@pytest.fixture
+def db(client):
+    from backend.models import SessionLocal
+
+    with SessionLocal() as session:
+        yield session
+
+
+def test_get_or_create_skills_reuses_names_in_order(db):
+    from backend.models import Skill
+    from backend.utils.skills import get_or_create_skills
+
+    first = get_or_create_skills(db, ["Elixir", "elixir ", "", "Phoenix"])
+    assert first[0] is first[1] and first[2] is None
+    assert [s.name for s in (first[0], first[3])] == ["elixir", "phoenix"]
+    db.commit()
+    again = get_or_create_skills(db, ["Phoenix", "ELIXIR"])
+    assert [s.id for s in again] == [first[3].id, first[0].id]
+    assert db.query(Skill).filter(Skill.name.in_(["elixir", "phoenix"])).count() == 2
+
+
+def test_get_or_create_skills_uses_a_concurrently_created_row(db):
+    from backend.models import SessionLocal, Skill
+    from backend.utils.skills import get_or_create_skills
+
+    def embed_racing(label):
+        # another request creates the same skill between our lookup and insert
+        with SessionLocal() as other:
+            get_or_create_skills(other, [label])
+            other.commit()
+        return None
+
+    (skill,) = get_or_create_skills(db, ["Erlang"], embed_fn=embed_racing)
+    db.commit()
+    assert skill.name == "erlang"
+    assert db.query(Skill).filter(Skill.name == "erlang").count() == 1
+
+
+def test_set_job_skills_replaces_links_and_bumps_catalog_version(db):
+    from backend.models import Job, JobSkill, Skill
+    from backend.utils.skills import catalog_version, set_job_skills
+
+    job = Job(title="Data Engineer", description="pipelines", requirements={})
+    db.add(job)
+    db.flush()
+    before = catalog_version(db)
+    set_job_skills(db, job.id, ["Airflow", "Spark", "airflow"])
+    set_job_skills(db, job.id, ["Spark", "", "dbt"])
+    db.commit()
+    links = db.query(JobSkill).filter(JobSkill.job_id == job.id).order_by(JobSkill.position).all()
+    by_id = dict(db.query(Skill.id, Skill.name))
+    assert [(l.position, by_id[l.skill_id]) for l in links] == [(0, "spark"), (2, "dbt")]
+    assert catalog_version(db) == before + 2
+
+
+def test_vocabulary_refresh_loads_only_new_skills(db):
+    from backend.utils.skills import SkillVocabulary, get_or_create_skills
+    from ml.scoring_service import embed
+
+    vocab = SkillVocabulary()
+    vocab.refresh()
+    assert vocab.refresh() == 0
+    with_vector, without = get_or_create_skills(db, ["Terraform"], embed_fn=embed)[0], get_or_create_skills(db, ["Pulumi"])[0]
+    db.commit()
+    assert vocab.refresh() == 2
+    vectors = vocab.vectors([with_vector.id])
+    assert vectors.shape == (1, vocab.matrix.shape[1])
+    assert np.isclose(np.linalg.norm(vectors[0]), 1.0, atol=1e-5)
+    assert vocab.vectors([with_vector.id, without.id]) is None
+    assert vocab.names[vocab.row_of[without.id]] == "pulumi"
+
+
+def test_migrate_skill_vocabulary_links_legacy_jobs(db):
+    from backend.models import Job, JobSkill, Skill
+    from scripts.migrate_skill_vocabulary import migrate
+
+    legacy = Job(title="Legacy", description="old job", requirements={}, required_skills="Fortran, COBOL",
+                 skill_embeddings=[[1.0, 0, 0, 0], [0, 1.0, 0, 0]])
+    db.add(legacy)
+    db.commit()
+
+    stats = migrate(embed_fn=None, clear_legacy=True)
+    assert stats["jobs_linked"] >= 1 and stats["legacy_vectors_reused"] >= 2
+    db.expire_all()
+    links = db.query(JobSkill.skill_id).filter(JobSkill.job_id == legacy.id).order_by(JobSkill.position).all()
+    skills = {s.id: s for s in db.query(Skill).filter(Skill.id.in_([l.skill_id for l in links]))}
+    assert [skills[l.skill_id].name for l in links] == ["fortran", "cobol"]
+    assert skills[links[0].skill_id].embedding == [1.0, 0, 0, 0]
+    assert db.execute(text("SELECT typeof(skill_embeddings) FROM jobs WHERE id = :id"), {"id": legacy.id}).scalar() == "null"
+    # already linked jobs are left alone on a second run
+    migrate(embed_fn=None)
+    assert db.query(JobSkill.skill_id).filter(JobSkill.job_id == legacy.id).order_by(JobSkill.position).all() == links
+
+
+def test_vocabulary_refresh_publishes_a_new_snapshot(db):
+    from backend.utils.skills import SkillVocabulary, get_or_create_skills
+
+    vocab = SkillVocabulary()
+    vocab.refresh()
+    before = vocab.snapshot()
+    (skill,) = get_or_create_skills(db, ["Zig"])
+    db.commit()
+    after = vocab.snapshot([skill.id])
+    # a reader holding the old snapshot keeps a consistent, unchanged view
+    matrix, has_vector, names, row_of, _ = before
+    assert len(matrix) == len(has_vector) == len(names) == len(row_of) and skill.id not in row_of
+    assert len(after[2]) == len(names) + 1 and after[2][after[3][skill.id]] == "zig"
+    assert vocab.rows([skill.id], after)[0] == len(names)
@@ -0,0 +1,41 @@
+import os
+import subprocess
+import sys
+import textwrap
+
+from scripts.import_time_report import HEAVY_MODULES, PROJECT_ROOT, import_profile
+
+# Generous enough for a cold CI box; the point is to catch torch & co. creeping back in.
+STARTUP_IMPORT_BUDGET_SECONDS = float(os.getenv("STARTUP_IMPORT_BUDGET_SECONDS", "5"))
+
+
+def _env(tmp_path, **extra):
+    return dict(os.environ, DATABASE_URL=f"sqlite:///{tmp_path / 'startup.db'}", **extra)
+
+
+def test_backend_import_within_budget_and_without_ml_stack(tmp_path):
+    _, rows, heavy = import_profile("backend.main", _env(tmp_path))
+    assert heavy == []
+    total = next(r["cumulative_us"] for r in rows if r["module"] == "backend.main")
+    assert total / 1e6 < STARTUP_IMPORT_BUDGET_SECONDS
+
+
+def test_non_ml_endpoints_do_not_import_torch(tmp_path):
+    probe = textwrap.dedent(f"""
+        import sys
+        sys.path.insert(0, {PROJECT_ROOT!r})
+        from fastapi.testclient import TestClient
+        from backend.main import app
+        with TestClient(app) as c:
+            c.post("/api/users/register", json={{"email": "r@example.com", "password": "pw", "role": "recruiter", "full_name": "R"}})
+            assert c.post("/api/users/login", json={{"email": "r@example.com", "password": "pw"}}).status_code == 200
+            assert c.get("/api/jobs/").status_code == 200
+            assert c.get("/api/applications/history").status_code == 200
+            assert c.get("/health").status_code == 200
+            assert c.get("/metrics").status_code == 200
+        print("heavy:" + ",".join(m for m in {HEAVY_MODULES!r} if m in sys.modules))
+    """)
+    env = _env(tmp_path, WARMUP_ON_STARTUP="0", EMBEDDING_BACKEND="torch")
+    proc = subprocess.run([sys.executable, "-c", probe], capture_output=True, text=True, env=env, cwd=str(tmp_path))
+    assert proc.returncode == 0, proc.stderr
+    assert proc.stdout.strip().splitlines()[-1] == "heavy:"
@@ -0,0 +1,97 @@
+"""Load cached ml.contexts.JobContext objects for the scoring routes.
+
+Each job's context is keyed by id and a version made of Job.updated_at
+(set by every write that changes what scoring reads, including re-embedding)
+and the job's vocabulary skill ids, so nothing is hashed per request. The
+stored vectors (Job.embedding, Job.skill_embeddings) are only fetched, in
+one IN query, for jobs whose context is missing or stale.
+"""
+import os
+
+from ..models import SessionLocal, Job
+from .skills import get_skill_vocabulary, job_skill_ids, scoring_job
+
+try:
+    from ml.contexts import JobContext, get_job_context_cache, invalidate_job_context
+except ModuleNotFoundError:
+    import sys, os
+    project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+    if project_root not in sys.path:
+        sys.path.insert(0, project_root)
+    from ml.contexts import JobContext, get_job_context_cache, invalidate_job_context
+
+# Columns needed to version a job and build its context (vectors excluded).
+JOB_CONTEXT_COLUMNS = (Job.id, Job.title, Job.description, Job.requirements, Job.required_skills, Job.updated_at)
+
+# Number of jobs pulled per short-lived session while ranking a resume
+# against the catalog. Keeps memory bounded regardless of catalog size.
+SCORE_JOB_CHUNK_SIZE = int(os.getenv("SCORE_JOB_CHUNK_SIZE", "500"))
+
+
+def job_contexts_for(db, rows, skill_ids_by_job, vocabulary=None):
+    """JobContext for each JOB_CONTEXT_COLUMNS row (same order), cache first."""
+    cache = get_job_context_cache()
+    out = [None] * len(rows)
+    misses = []
+    for i, row in enumerate(rows):
+        skill_ids = skill_ids_by_job.get(row.id)
+        version = (row.updated_at, tuple(skill_ids or ()))
+        ctx = cache.get(row.id, version)
+        if ctx is None:
+            misses.append((i, row, skill_ids, version))
+        else:
+            out[i] = ctx
+    if misses:
+        vocabulary = vocabulary or get_skill_vocabulary()
+        stored = {
+            r.id: r
+            for r in db.query(Job.id, Job.embedding, Job.skill_embeddings).filter(Job.id.in_([m[1].id for m in misses]))
+        }
+        for i, row, skill_ids, version in misses:
+            vectors = stored.get(row.id)
+            job = scoring_job(row.description, row.requirements, row.required_skills,
+                              vectors.skill_embeddings if vectors else None, skill_ids, vocabulary)
+            out[i] = cache.put(JobContext(
+                job["description"], job["requirements"],
+                skill_embeddings=job["skill_embeddings"],
+                description_embedding=vectors.embedding if vectors else None,
+                job_id=row.id, version=version,
+            ))
+    return out
+
+
+def load_job_context(db, job_id):
+    """Cached JobContext for one job, or None if the job does not exist."""
+    row = db.query(*JOB_CONTEXT_COLUMNS).filter(Job.id == job_id).first()
+    if not row:
+        return None
+    return job_contexts_for(db, [row], job_skill_ids(db, [job_id]))[0]
+
+
+def iter_job_scoring_rows(chunk_size=SCORE_JOB_CHUNK_SIZE):
+    """Yield (row, skill_ids, job_context) for every job.
+
+    `row` is a JOB_CONTEXT_COLUMNS projection, `skill_ids` the job's
+    vocabulary skill ids in order and `job_context` its cached JobContext.
+    Rows are fetched in keyset-paginated chunks, each in its own session, so
+    no ORM Job instances stay alive and no DB connection is held while the
+    caller runs ML scoring between chunks.
+    """
+    vocabulary = get_skill_vocabulary()
+    last_id = 0
+    while True:
+        with SessionLocal() as db:
+            rows = (
+                db.query(*JOB_CONTEXT_COLUMNS)
+                .filter(Job.id > last_id)
+                .order_by(Job.id)
+                .limit(chunk_size)
+                .all()
+            )
+            skill_ids = job_skill_ids(db, [r.id for r in rows])
+            contexts = job_contexts_for(db, rows, skill_ids, vocabulary)
+        if not rows:
+            return
+        for row, ctx in zip(rows, contexts):
+            yield row, skill_ids.get(row.id), ctx
+        last_id = rows[-1].id
@@ -0,0 +1,338 @@
+"""In-process metrics with a Prometheus text-exposition endpoint.
+
+A small registry of counters, gauges and histograms (no client library):
+recording a value is a dict lookup, a bisect and a few additions under a
+lock, cheap enough to leave on for every request.
+
+    sourcematch_http_request_duration_seconds{method,route,status}
+        latency per route template (MetricsMiddleware)
+    sourcematch_http_requests_in_flight
+    sourcematch_stage_duration_seconds{stage}
+        scoring pipeline stages, recorded with `with stage("embed"): ...`
+        (ml.timing; upload_read, parse, fingerprint, embed, skill_match,
+        score, db_commit, sentence_encode, sentence_match, highlights)
+
+Collected at scrape time from the existing stats helpers: encoder calls,
+texts and seconds per backend, cache hits/misses/size (job contexts,
+experience, skill matchers, hash n-gram features), vocabulary/catalog size,
+the password hashing pool (queue depth, in flight, completed, rejected),
+process memory and warm-up readiness.
+
+Stages finished while a request is being served are also collected for
+that request (collect_request_timings()) for the Server-Timing header, see
+backend/utils/profiling.py.
+
+Configuration (environment):
+    METRICS_ENABLED    record request metrics and serve /metrics (default 1)
+"""
+import bisect
+import contextvars
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+try:
+    from ml.timing import add_stage_observer, stage
+except ModuleNotFoundError:
+    import sys
+    project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+    if project_root not in sys.path:
+        sys.path.insert(0, project_root)
+    from ml.timing import add_stage_observer, stage
+
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "1").strip().lower() not in ("0", "false", "no")
+
+# seconds; spans a hash-encoder call (~100us) to a cold model load
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+logger = logging.getLogger(__name__)
+
+
+def _format_labels(names, values, extra=None):
+    pairs = list(zip(names, values)) + (extra or [])
+    if not pairs:
+        return ""
+    escaped = (str(v).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"') for _, v in pairs)
+    return "{" + ",".join(f'{k}="{v}"' for (k, _), v in zip(pairs, escaped)) + "}"
+
+
+def _format_value(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def header(self):
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, *labels, amount=1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def render(self):
+        with self._lock:
+            items = list(self._values.items())
+        return self.header() + [f"{self.name}{_format_labels(self.labelnames, k)} {_format_value(v)}" for k, v in items]
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def set(self, value, *labels):
+        with self._lock:
+            self._values[labels] = value
+
+    def dec(self, *labels, amount=1):
+        self.inc(*labels, amount=-amount)
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value, *labels):
+        i = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(labels)
+            if entry is None:
+                # per-bucket (non-cumulative) counts, sum, count
+                entry = self._values[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            entry[0][i] += 1
+            entry[1] += value
+            entry[2] += 1
+
+    def snapshot(self, *labels):
+        """(cumulative bucket counts incl. +Inf, sum, count) for one label set, or None."""
+        with self._lock:
+            entry = self._values.get(labels)
+            if entry is None:
+                return None
+            counts, total, n = list(entry[0]), entry[1], entry[2]
+        cumulative, running = [], 0
+        for c in counts:
+            running += c
+            cumulative.append(running)
+        return cumulative, total, n
+
+    def render(self):
+        with self._lock:
+            keys = list(self._values)
+        lines = self.header()
+        bounds = [_format_value(b) for b in self.buckets] + ["+Inf"]
+        for key in keys:
+            cumulative, total, n = self.snapshot(*key)
+            for bound, c in zip(bounds, cumulative):
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, [('le', bound)])} {c}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, key)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, key)} {n}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics = []
+        self._collectors = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def collector(self, fn):
+        """Register `fn() -> [(name, kind, help, labelnames, [(label values, value)])]`, called per scrape."""
+        self._collectors.append(fn)
+        return fn
+
+    def render(self):
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        for fn in self._collectors:
+            try:
+                families = fn()
+            except Exception:
+                # one broken source must not take the whole scrape down
+                logger.exception("Metrics collector %s failed", getattr(fn, "__name__", fn))
+                continue
+            for name, kind, documentation, labelnames, samples in families:
+                lines += [f"# HELP {name} {documentation}", f"# TYPE {name} {kind}"]
+                lines += [f"{name}{_format_labels(labelnames, values)} {_format_value(v)}" for values, v in samples]
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+REQUEST_SECONDS = REGISTRY.register(Histogram(
+    "sourcematch_http_request_duration_seconds", "HTTP request latency by route template.", ("method", "route", "status")))
+REQUESTS_IN_FLIGHT = REGISTRY.register(Gauge(
+    "sourcematch_http_requests_in_flight", "HTTP requests currently being served."))
+STAGE_SECONDS = REGISTRY.register(Histogram(
+    "sourcematch_stage_duration_seconds", "Latency of scoring pipeline stages.", ("stage",)))
+
+
+# [(stage, seconds)] of the request being served, None outside requests
+_request_timings = contextvars.ContextVar("sourcematch_request_timings", default=None)
+
+
+@contextmanager
+def collect_request_timings():
+    """Collect the stages finished inside the block, including in threadpool
+    workers it starts (they run in a copy of this context). Yields the list."""
+    timings = []
+    token = _request_timings.set(timings)
+    try:
+        yield timings
+    finally:
+        _request_timings.reset(token)
+
+
+def observe_stage(name, seconds):
+    if METRICS_ENABLED:
+        STAGE_SECONDS.observe(seconds, name)
+    timings = _request_timings.get()
+    if timings is not None:
+        timings.append((name, seconds))
+
+
+add_stage_observer(observe_stage)
+
+
+def route_template(scope):
+    """Route template of a handled request, e.g. /api/jobs/{job_id}; "unmatched" if none.
+
+    Routes of an included router may only know their own part of the path
+    (FastAPI nests routers), so the concrete prefix is taken from the
+    request path.
+    """
+    route = scope.get("route")
+    template = getattr(route, "path_format", None) or getattr(route, "path", None)
+    if not template:
+        return "unmatched"
+    concrete = template
+    for name, value in (scope.get("path_params") or {}).items():
+        concrete = concrete.replace("{" + name + "}", str(value))
+    path = scope.get("path", "")
+    if concrete != path and path.endswith(concrete):
+        return path[:len(path) - len(concrete)] + template
+    return template
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording per-route latency and in-flight requests.
+
+    Routes are labelled with their template (e.g. /api/jobs/{job_id}), never
+    the raw path, so label cardinality stays bounded; unmatched paths share
+    one label.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        status = [500]
+
+        async def send_with_status(message):
+            if message["type"] == "http.response.start":
+                status[0] = message["status"]
+            await send(message)
+
+        REQUESTS_IN_FLIGHT.inc()
+        t0 = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            REQUESTS_IN_FLIGHT.dec()
+            REQUEST_SECONDS.observe(time.perf_counter() - t0, scope.get("method", ""), route_template(scope), str(status[0]))
+
+
+def render_metrics():
+    """The registry in Prometheus text exposition format (version 0.0.4)."""
+    return REGISTRY.render()
+
+
+@REGISTRY.collector
+def _model_metrics():
+    from ml.encoders import encode_stats
+
+    stats = encode_stats()
+    return [
+        ("sourcematch_model_calls_total", "counter", "Encoder calls (one batch each).", ("backend",),
+         [((b,), s["calls"]) for b, s in stats.items()]),
+        ("sourcematch_model_texts_total", "counter", "Texts embedded.", ("backend",),
+         [((b,), s["texts"]) for b, s in stats.items()]),
+        ("sourcematch_model_seconds_total", "counter", "Seconds spent in encoder calls.", ("backend",),
+         [((b,), s["seconds"]) for b, s in stats.items()]),
+    ]
+
+
+@REGISTRY.collector
+def _cache_metrics():
+    from ml.contexts import get_job_context_cache
+    from ml.encoders import _word_features
+    from ml.experience import experience_cache_stats
+    from ml.skill_matcher import _cached_matcher
+
+    caches = {"job_contexts": get_job_context_cache().stats(), "experience": experience_cache_stats()}
+    for name, fn in (("skill_matchers", _cached_matcher), ("hash_features", _word_features)):
+        info = fn.cache_info()
+        caches[name] = {"hits": info.hits, "misses": info.misses, "size": info.currsize}
+    return [
+        ("sourcematch_cache_hits_total", "counter", "Cache hits.", ("cache",), [((c,), s["hits"]) for c, s in caches.items()]),
+        ("sourcematch_cache_misses_total", "counter", "Cache misses.", ("cache",), [((c,), s["misses"]) for c, s in caches.items()]),
+        ("sourcematch_cache_entries", "gauge", "Entries currently cached.", ("cache",), [((c,), s["size"]) for c, s in caches.items()]),
+    ]
+
+
+@REGISTRY.collector
+def _scoring_state_metrics():
+    from .skills import get_skill_catalog, get_skill_vocabulary
+    from .warmup import readiness
+
+    vocabulary, catalog = get_skill_vocabulary().stats(), get_skill_catalog().stats()
+    return [
+        ("sourcematch_skill_vocabulary_size", "gauge", "Skills in the loaded vocabulary.", (), [((), vocabulary["skills"])]),
+        ("sourcematch_skill_catalog_jobs", "gauge", "Jobs in the loaded job-by-skill catalog.", (), [((), catalog["jobs"])]),
+        ("sourcematch_ready", "gauge", "1 when the model and scoring caches are warm.", (), [((), int(readiness()["ready"]))]),
+    ]
+
+
+@REGISTRY.collector
+def _password_hash_metrics():
+    from ..auth import hash_pool_stats
+
+    stats = hash_pool_stats()
+    return [
+        ("sourcematch_password_hash_queue_depth", "gauge", "Hashing jobs waiting for a worker.", (), [((), stats["queue_depth"])]),
+        ("sourcematch_password_hash_in_flight", "gauge", "Hashing jobs queued or running.", (), [((), stats["in_flight"])]),
+        ("sourcematch_password_hash_completed_total", "counter", "Hashing jobs completed.", (), [((), stats["completed"])]),
+        ("sourcematch_password_hash_rejected_total", "counter", "Hashing jobs rejected (pool saturated).", (), [((), stats["rejected"])]),
+    ]
+
+
+@REGISTRY.collector
+def _process_metrics():
+    from .procmem import process_memory
+
+    mem = process_memory() or {}
+    return [("sourcematch_process_memory_bytes", "gauge", "Memory of this worker process.", ("kind",),
+             [((k,), v) for k, v in mem.items() if v is not None])]
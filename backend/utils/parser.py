@@ -1,8 +1,11 @@
 import hashlib, os, re
-from PyPDF2 import PdfReader
+
+from .metrics import stage
 
 def extract_text_from_pdf(path):
     try:
+        # imported on first PDF upload, not when the app starts
+        from PyPDF2 import PdfReader
         reader = PdfReader(path)
         texts = []
         for p in reader.pages:
@@ -26,6 +29,13 @@ def fingerprint_text(text, salt="sourcematch_salt"):
     return hasher.hexdigest()
 
 def extract_text_and_fingerprint(path):
+    with stage("parse"):
+        text = _extract_text(path)
+    with stage("fingerprint"):
+        fingerprint = fingerprint_text(text)
+    return text, fingerprint
+
+def _extract_text(path):
     ext = os.path.splitext(path)[1].lower()
     if ext == ".pdf":
         text = extract_text_from_pdf(path)
@@ -51,5 +61,4 @@ def extract_text_and_fingerprint(path):
         if text is None:
             # fallback: decode ignoring errors
             text = raw.decode("utf-8", errors="ignore")
-    fingerprint = fingerprint_text(text)
-    return text, fingerprint
+    return text
@@ -0,0 +1,75 @@
+"""Per-process memory figures from /proc (Linux).
+
+RSS counts every resident page, including pages a pre-forked worker still
+shares copy-on-write with its parent and siblings. USS (private clean +
+private dirty) is what the process costs on its own; PSS splits shared pages
+evenly between the processes mapping them, so PSS summed over all workers is
+the real total.
+"""
+import os
+
+_ROLLUP_FIELDS = {
+    "Rss": "rss",
+    "Pss": "pss",
+    "Shared_Clean": "shared_clean",
+    "Shared_Dirty": "shared_dirty",
+    "Private_Clean": "private_clean",
+    "Private_Dirty": "private_dirty",
+    "Swap": "swap",
+}
+
+
+def process_memory(pid="self"):
+    """Memory of `pid` in bytes: rss, pss, uss, shared, swap.
+
+    Reads /proc/<pid>/smaps_rollup (Linux 4.14+). Falls back to VmRSS from
+    /proc/<pid>/status, with pss/uss None. Returns None when the process is
+    gone or /proc is unavailable.
+    """
+    values = {}
+    try:
+        with open(f"/proc/{pid}/smaps_rollup", encoding="ascii") as f:
+            for line in f:
+                key, _, rest = line.partition(":")
+                if key in _ROLLUP_FIELDS:
+                    values[_ROLLUP_FIELDS[key]] = int(rest.split()[0]) * 1024
+    except OSError:
+        try:
+            with open(f"/proc/{pid}/status", encoding="ascii") as f:
+                rss = next(int(line.split()[1]) * 1024 for line in f if line.startswith("VmRSS:"))
+        except (OSError, StopIteration):
+            return None
+        return {"rss": rss, "pss": None, "uss": None, "shared": None, "swap": None}
+    return {
+        "rss": values.get("rss", 0),
+        "pss": values.get("pss", 0),
+        "uss": values.get("private_clean", 0) + values.get("private_dirty", 0),
+        "shared": values.get("shared_clean", 0) + values.get("shared_dirty", 0),
+        "swap": values.get("swap", 0),
+    }
+
+
+def memory_report(pids):
+    """{pid: process_memory(pid)} for the processes still alive."""
+    report = {}
+    for pid in pids:
+        mem = process_memory(pid)
+        if mem is not None:
+            report[pid] = mem
+    return report
+
+
+def format_memory_report(report, labels=None):
+    """Text table of a memory_report(), in MB, with a PSS total."""
+    mb = lambda v: f"{v / 1e6:>9.1f}" if v is not None else f"{'-':>9}"
+    lines = [f"{'process':<16}{'pid':>8}{'RSS MB':>9}{'PSS MB':>9}{'USS MB':>9}{'shared':>9}"]
+    for pid, mem in report.items():
+        label = (labels or {}).get(pid, "")
+        lines.append(f"{label:<16}{pid:>8}{mb(mem['rss'])}{mb(mem['pss'])}{mb(mem['uss'])}{mb(mem['shared'])}")
+    if all(m["pss"] is not None for m in report.values()):
+        lines.append(f"{'total (PSS)':<16}{'':>8}{'':>9}{mb(sum(m['pss'] for m in report.values()))}")
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    print(format_memory_report(memory_report([os.getpid()]), {os.getpid(): "self"}))
@@ -0,0 +1,104 @@
+"""Structured candidate profile extracted from resume text at ingest time.
+
+`extract_profile` runs once when an application is created (and in bulk via
+scripts/backfill_profiles.py for older rows) and its fields are stored on the
+application: skills, years of experience, degree, graduation year and date
+of birth. The recruiter details endpoint then reads them from the row, and
+the listing can filter on them in SQL.
+
+Skills are the shared skill vocabulary entries (normalized names) found in
+the resume as whole words; when none match, the legacy token extraction is
+stored instead. Bump PROFILE_VERSION when extraction changes so the backfill
+picks rows up again.
+"""
+import re
+
+from sqlalchemy import or_, update
+
+from ..models import SessionLocal, Application
+from .skills import get_skill_vocabulary
+
+try:
+    from ml.experience import extract_experience
+    from ml.scoring_service import extract_skills_from_text
+    from ml.skill_matcher import normalize_text_for_matching
+except ModuleNotFoundError:
+    import sys, os
+    project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+    if project_root not in sys.path:
+        sys.path.insert(0, project_root)
+    from ml.experience import extract_experience
+    from ml.scoring_service import extract_skills_from_text
+    from ml.skill_matcher import normalize_text_for_matching
+
+PROFILE_VERSION = 1
+PROFILE_MAX_SKILLS = 20
+
+_DOB_RE = re.compile(r"(\d{2}[/-]\d{2}[/-]\d{4})|(\d{4}[/-]\d{2}[/-]\d{2})")
+_GRADUATION_RE = re.compile(r"(?:year of passing|graduat(?:ed|ion) in|passed in|class of)\s*[:\-]?\s*([12][0-9]{3})", re.I)
+_DEGREE_RE = re.compile(r"\b(B\.?Sc|BSc|B\.?Tech|BTech|Bachelor of [A-Za-z ]+|Master of [A-Za-z ]+|M\.?Sc|MBA|B\.?E\.?)\b", re.I)
+
+
+def _first_whole_word_hit(norm_text, offsets):
+    # scoring accepts plain substrings ("go" in "good"); a stored profile
+    # should only list skills that appear as whole words
+    for start, end in offsets:
+        if (start == 0 or norm_text[start - 1] == " ") and (end == len(norm_text) or norm_text[end] == " "):
+            return start
+    return None
+
+
+def _profile_skills(resume_text):
+    vocabulary = get_skill_vocabulary()
+    state = vocabulary.snapshot()
+    if state[2]:
+        norm_text = normalize_text_for_matching(resume_text)
+        found = []
+        for name, d in zip(state[2], vocabulary.lexical_matcher(state).match(norm_text)):
+            if d["method"] == "substring":
+                start = _first_whole_word_hit(norm_text, d["offsets"])
+                if start is not None:
+                    found.append((start, name))
+        if found:
+            return [name for _, name in sorted(found)][:PROFILE_MAX_SKILLS]
+    return sorted(extract_skills_from_text(resume_text))[:PROFILE_MAX_SKILLS]
+
+
+def extract_profile(resume_text):
+    """Return the profile column values for an Application with this resume text."""
+    text = str(resume_text or "")
+    dob = _DOB_RE.search(text)
+    graduation = _GRADUATION_RE.search(text)
+    degree = _DEGREE_RE.search(text)
+    experience = extract_experience(text)
+    return {
+        "profile_skills": _profile_skills(text),
+        "years_experience": round(experience["years"], 2) if experience["found"] else None,
+        "degree": degree.group(0).strip() if degree else None,
+        "graduation_year": int(graduation.group(1)) if graduation else None,
+        "date_of_birth": dob.group(0) if dob else None,
+        "profile_version": PROFILE_VERSION,
+    }
+
+
+def backfill_profiles(batch_size=500, session_factory=SessionLocal, force=False):
+    """Extract profiles for applications without a current one.
+
+    Works in id-ordered batches, one transaction and one executemany UPDATE
+    per batch. With force=True every row is re-extracted. Returns rows updated.
+    """
+    get_skill_vocabulary().refresh()
+    updated = 0
+    last_id = 0
+    while True:
+        with session_factory() as db:
+            query = db.query(Application.id, Application.resume_text).filter(Application.id > last_id)
+            if not force:
+                query = query.filter(or_(Application.profile_version.is_(None), Application.profile_version < PROFILE_VERSION))
+            rows = query.order_by(Application.id).limit(batch_size).all()
+            if not rows:
+                return updated
+            db.execute(update(Application), [{"id": r.id, **extract_profile(r.resume_text)} for r in rows])
+            db.commit()
+        updated += len(rows)
+        last_id = rows[-1].id
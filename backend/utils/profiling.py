@@ -0,0 +1,234 @@
+"""Per-request Server-Timing headers and an opt-in sampling profiler.
+
+ServerTimingMiddleware collects the stages finished while a request is served
+(metrics.observe_stage, e.g. db_read, embed, skill_match, sentence_encode,
+sentence_match and highlights for /recruiter/explain) and reports them, summed
+per stage, in a `Server-Timing` response header:
+
+    Server-Timing: db_read;dur=0.8, embed;dur=41.2, ..., total;dur=57.9
+
+A request is also profiled when a recruiter (the admin role) sends
+`X-Profile: 1` with a valid token, or when it falls into the
+PROFILE_SAMPLE_RATE fraction. A daemon thread then samples the Python stacks
+of the threads serving it every PROFILE_INTERVAL_MS: the event loop thread
+(idle samples dropped) and any thread currently inside the route's endpoint
+or one of its dependencies, which covers sync handlers in the threadpool. A
+concurrent request to the same endpoint is sampled too; profile a quiet
+worker when that matters. The result is stored in memory as folded stacks
+(`frame;frame;frame count`, one line per distinct stack, input for
+flamegraph.pl or speedscope), its id returned in an `X-Profile-Id` header,
+and served to recruiters at /api/profiles/{id}. Profiles live in the memory of
+the worker process that served the request.
+
+Configuration (environment):
+    SERVER_TIMING_ENABLED   add the Server-Timing header (default 1)
+    PROFILE_SAMPLE_RATE     fraction of all requests to profile (default 0)
+    PROFILE_INTERVAL_MS     sampling interval (default 5)
+    PROFILE_MAX_SECONDS     stop sampling a request after this long (default 30)
+    PROFILE_MAX_STORED      profiles kept, oldest dropped first (default 50)
+"""
+import collections
+import os
+import random
+import sys
+import threading
+import time
+import uuid
+
+from fastapi.concurrency import run_in_threadpool
+from jose import JWTError, jwt
+
+from ..auth import ALGORITHM, SECRET_KEY
+from .metrics import collect_request_timings, route_template
+
+SERVER_TIMING_ENABLED = os.getenv("SERVER_TIMING_ENABLED", "1").strip().lower() not in ("0", "false", "no")
+PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))
+PROFILE_INTERVAL_MS = float(os.getenv("PROFILE_INTERVAL_MS", "5"))
+PROFILE_MAX_SECONDS = float(os.getenv("PROFILE_MAX_SECONDS", "30"))
+PROFILE_MAX_STORED = int(os.getenv("PROFILE_MAX_STORED", "50"))
+
+PROFILE_HEADER = b"x-profile"
+
+_PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")) + os.sep
+
+_profiles = collections.OrderedDict()
+_profiles_lock = threading.Lock()
+
+
+def _summed(timings):
+    """{stage: seconds} with repeated stages summed, in first-seen order."""
+    summed = {}
+    for name, seconds in list(timings):
+        summed[name] = summed.get(name, 0.0) + seconds
+    return summed
+
+
+def server_timing_header(timings, total_seconds):
+    """`name;dur=ms, ...` per stage, then the total so far."""
+    parts = [f"{name};dur={seconds * 1000:.1f}" for name, seconds in _summed(timings).items()]
+    parts.append(f"total;dur={total_seconds * 1000:.1f}")
+    return ", ".join(parts)
+
+
+def _frame_label(code):
+    filename = code.co_filename
+    if filename.startswith(_PROJECT_ROOT):
+        filename = filename[len(_PROJECT_ROOT):]
+    else:
+        filename = os.path.basename(filename)
+    return f"{code.co_name} ({filename}:{code.co_firstlineno})"
+
+
+def _route_codes(scope):
+    """Code objects of the matched endpoint and its dependencies (empty before routing)."""
+    codes = set()
+    dependants = [getattr(scope.get("route"), "dependant", None)]
+    while dependants:
+        dependant = dependants.pop()
+        if dependant is None:
+            continue
+        code = getattr(getattr(dependant, "call", None), "__code__", None)
+        if code is not None:
+            codes.add(code)
+        dependants.extend(dependant.dependencies)
+    code = getattr(scope.get("endpoint"), "__code__", None)
+    if code is not None:
+        codes.add(code)
+    return codes
+
+
+class SamplingProfiler:
+    """Samples the stacks serving one request into folded-stack counts."""
+
+    def __init__(self, scope, interval=PROFILE_INTERVAL_MS / 1000.0, max_seconds=PROFILE_MAX_SECONDS):
+        self.scope = scope
+        self.interval = interval
+        self.max_seconds = max_seconds
+        self.loop_thread = threading.get_ident()
+        self.counts = collections.Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        deadline = time.monotonic() + self.max_seconds
+        codes = set()
+        while not self._stop.wait(self.interval) and time.monotonic() < deadline:
+            if not codes:
+                codes = _route_codes(self.scope)
+            self.sample(codes)
+
+    def sample(self, codes):
+        own = threading.get_ident()
+        for ident, frame in sys._current_frames().items():
+            if ident == own:
+                continue
+            stack = []
+            serving = ident == self.loop_thread
+            while frame is not None:
+                stack.append(frame.f_code)
+                serving = serving or frame.f_code in codes
+                frame = frame.f_back
+            if not serving or not stack:
+                continue
+            if ident == self.loop_thread and stack[0].co_name == "select" and stack[0].co_filename.endswith("selectors.py"):
+                continue  # event loop idle, waiting for I/O
+            root = "event_loop" if ident == self.loop_thread else "worker"
+            self.counts[";".join([root] + [_frame_label(code) for code in reversed(stack)])] += 1
+        self.samples += 1
+
+    def folded(self):
+        """Folded stacks, heaviest first."""
+        return "".join(f"{stack} {n}\n" for stack, n in self.counts.most_common())
+
+
+def _store_profile(profile):
+    with _profiles_lock:
+        _profiles[profile["id"]] = profile
+        while len(_profiles) > PROFILE_MAX_STORED:
+            _profiles.popitem(last=False)
+
+
+def list_profiles():
+    """Stored profiles without their stacks, newest first."""
+    with _profiles_lock:
+        profiles = list(_profiles.values())
+    return [{k: v for k, v in p.items() if k != "folded"} for p in reversed(profiles)]
+
+
+def get_profile(profile_id):
+    with _profiles_lock:
+        return _profiles.get(profile_id)
+
+
+def _requested_by_recruiter(scope):
+    """True for `X-Profile: 1` sent with a valid recruiter token (checked from its role claim only)."""
+    headers = dict(scope.get("headers") or [])
+    if headers.get(PROFILE_HEADER, b"").strip().lower() not in (b"1", b"true", b"yes"):
+        return False
+    scheme, _, token = headers.get(b"authorization", b"").decode("latin-1").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return False
+    try:
+        payload = jwt.decode(token.strip(), SECRET_KEY, algorithms=[ALGORITHM])
+    except JWTError:
+        return False
+    return payload.get("role") == "recruiter"
+
+
+class ServerTimingMiddleware:
+    """ASGI middleware adding Server-Timing headers and running opt-in profiles."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        profiler = None
+        if _requested_by_recruiter(scope) or (PROFILE_SAMPLE_RATE > 0 and random.random() < PROFILE_SAMPLE_RATE):
+            profiler = SamplingProfiler(scope).start()
+        profile_id = uuid.uuid4().hex if profiler else None
+        status = [500]
+        t0 = time.perf_counter()
+
+        with collect_request_timings() as timings:
+            async def send_with_timing(message):
+                if message["type"] == "http.response.start":
+                    status[0] = message["status"]
+                    headers = list(message.get("headers") or [])
+                    if SERVER_TIMING_ENABLED:
+                        value = server_timing_header(timings, time.perf_counter() - t0)
+                        headers.append((b"server-timing", value.encode("latin-1")))
+                    if profile_id:
+                        headers.append((b"x-profile-id", profile_id.encode("latin-1")))
+                    message = {**message, "headers": headers}
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_with_timing)
+            finally:
+                if profiler:
+                    # joining the sampler can take up to one interval; keep it off the event loop
+                    await run_in_threadpool(profiler.stop)
+                    _store_profile({
+                        "id": profile_id,
+                        "method": scope.get("method", ""),
+                        "route": route_template(scope),
+                        "path": scope.get("path", ""),
+                        "status": status[0],
+                        "started_at": time.time() - (time.perf_counter() - t0),
+                        "duration_ms": (time.perf_counter() - t0) * 1000,
+                        "samples": profiler.samples,
+                        "interval_ms": profiler.interval * 1000,
+                        "stages_ms": {name: round(seconds * 1000, 3) for name, seconds in _summed(timings).items()},
+                        "folded": profiler.folded(),
+                    })
@@ -0,0 +1,122 @@
+"""Garbage collector for orphaned resume files.
+
+Streams the resumes/ directory with os.scandir, checks each batch of file
+names against Application.resume_path and MatchSearch.resume_path with two
+IN queries, and deletes (or moves to a quarantine directory) files that no
+row references and that are older than a grace period. Only one batch of
+directory entries is held in memory at a time, so it scales to millions of
+files.
+
+Configuration (environment):
+    RESUME_GC_GRACE_SECONDS  minimum file age before it may be collected
+    RESUME_GC_BATCH_SIZE     directory entries checked per DB round trip
+"""
+import logging
+import os
+import time
+
+from ..models import SessionLocal, Application, MatchSearch
+from .storage import RESUMES_DIR
+
+RESUME_GC_GRACE_SECONDS = float(os.getenv("RESUME_GC_GRACE_SECONDS", str(24 * 3600)))
+RESUME_GC_BATCH_SIZE = int(os.getenv("RESUME_GC_BATCH_SIZE", "500"))
+
+logger = logging.getLogger(__name__)
+
+
+def _stored_path_variants(name, resumes_dir):
+    """Spellings under which a file may have been recorded in resume_path.
+
+    Routes store os.path.join("resumes", filename) relative to the server's
+    working directory, so match relative, absolute and both separator styles.
+    """
+    bases = {resumes_dir, os.path.abspath(resumes_dir), os.path.basename(os.path.normpath(resumes_dir))}
+    variants = set()
+    for base in bases:
+        base = base.rstrip("/\\")
+        variants.add(os.path.join(base, name))
+        variants.add(f"{base}/{name}")
+        variants.add(f"{base}\\{name}")
+    return variants
+
+
+def _iter_candidate_batches(resumes_dir, cutoff, batch_size, stats):
+    batch = []
+    with os.scandir(resumes_dir) as it:
+        for entry in it:
+            if entry.name.startswith("."):
+                continue
+            try:
+                if not entry.is_file(follow_symlinks=False):
+                    continue
+                st = entry.stat(follow_symlinks=False)
+            except OSError:
+                continue
+            stats["scanned"] += 1
+            if st.st_mtime > cutoff:
+                stats["skipped_recent"] += 1
+                continue
+            batch.append((entry.name, entry.path, st.st_size))
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+    if batch:
+        yield batch
+
+
+def _referenced_names(db, batch, resumes_dir):
+    variant_to_name = {}
+    for name, _, _ in batch:
+        for v in _stored_path_variants(name, resumes_dir):
+            variant_to_name[v] = name
+    variants = list(variant_to_name)
+    referenced = set()
+    for column in (Application.resume_path, MatchSearch.resume_path):
+        for (path,) in db.query(column).filter(column.in_(variants)).distinct():
+            referenced.add(variant_to_name[path])
+    return referenced
+
+
+def collect_orphaned_resumes(resumes_dir=RESUMES_DIR, grace_seconds=None, quarantine_dir=None,
+                             batch_size=None, dry_run=False, session_factory=SessionLocal):
+    """Delete or quarantine resume files no Application/MatchSearch references.
+
+    Files modified within `grace_seconds` are left alone so uploads whose row
+    has not been committed yet are never collected. When `quarantine_dir` is
+    given, orphans are moved there instead of deleted. Returns a stats dict.
+    """
+    grace = RESUME_GC_GRACE_SECONDS if grace_seconds is None else grace_seconds
+    batch_size = max(1, int(batch_size or RESUME_GC_BATCH_SIZE))
+    stats = {"scanned": 0, "skipped_recent": 0, "referenced": 0, "orphaned": 0,
+             "deleted": 0, "quarantined": 0, "errors": 0, "bytes_reclaimed": 0, "dry_run": bool(dry_run)}
+    if not os.path.isdir(resumes_dir):
+        return stats
+    if quarantine_dir and not dry_run:
+        os.makedirs(quarantine_dir, exist_ok=True)
+
+    cutoff = time.time() - grace
+    for batch in _iter_candidate_batches(resumes_dir, cutoff, batch_size, stats):
+        with session_factory() as db:
+            referenced = _referenced_names(db, batch, resumes_dir)
+        stats["referenced"] += len(referenced)
+        for name, path, size in batch:
+            if name in referenced:
+                continue
+            stats["orphaned"] += 1
+            if dry_run:
+                stats["bytes_reclaimed"] += size
+                continue
+            try:
+                if quarantine_dir:
+                    os.replace(path, os.path.join(quarantine_dir, name))
+                    stats["quarantined"] += 1
+                else:
+                    os.remove(path)
+                    stats["deleted"] += 1
+                stats["bytes_reclaimed"] += size
+            except FileNotFoundError:
+                pass
+            except OSError:
+                stats["errors"] += 1
+                logger.warning("Failed to collect orphaned resume file: %s", path, exc_info=True)
+    return stats
@@ -0,0 +1,143 @@
+"""Retention and compaction for saved match searches.
+
+Every /api/applications/score call stores a MatchSearch, its MatchResult rows
+and the uploaded resume file. This module trims that history by age and by a
+per-candidate cap, deleting in id-ordered batches (one short transaction per
+batch) and removing resume files only after the batch has committed.
+
+Anonymous searches (no candidate_id) are grouped by resume fingerprint for the
+per-candidate cap.
+
+Configuration (environment):
+    RETENTION_MAX_AGE_DAYS               delete searches older than this (0 = off)
+    RETENTION_MAX_SEARCHES_PER_CANDIDATE keep only the newest N per candidate (0 = off)
+    RETENTION_BATCH_SIZE                 searches deleted per transaction
+    RETENTION_INTERVAL_SECONDS           run in a background thread every N seconds (0 = off;
+                                         run_backend.py --workers runs it in worker 0 only)
+"""
+import datetime
+import logging
+import os
+import threading
+
+from sqlalchemy import String, cast, func, or_, select
+
+from ..models import SessionLocal, MatchSearch, MatchResult
+from .storage import RESUMES_DIR, remove_resume_file, resolve_resume_path
+
+RETENTION_MAX_AGE_DAYS = float(os.getenv("RETENTION_MAX_AGE_DAYS", "0"))
+RETENTION_MAX_SEARCHES_PER_CANDIDATE = int(os.getenv("RETENTION_MAX_SEARCHES_PER_CANDIDATE", "0"))
+RETENTION_BATCH_SIZE = int(os.getenv("RETENTION_BATCH_SIZE", "500"))
+RETENTION_INTERVAL_SECONDS = float(os.getenv("RETENTION_INTERVAL_SECONDS", "0"))
+
+logger = logging.getLogger(__name__)
+
+
+def _over_quota_ids(db, max_per_candidate):
+    """Ids of searches beyond the newest `max_per_candidate` of their owner, ascending.
+
+    The window over the whole table runs once per compaction run; batches
+    then page through this list instead of re-ranking the table each time.
+    """
+    owner = func.coalesce(cast(MatchSearch.candidate_id, String), MatchSearch.fingerprint)
+    ranked = select(
+        MatchSearch.id.label("id"),
+        func.row_number().over(
+            partition_by=owner,
+            order_by=(MatchSearch.created_at.desc(), MatchSearch.id.desc()),
+        ).label("rn"),
+    ).subquery()
+    return list(db.execute(select(ranked.c.id).where(ranked.c.rn > max_per_candidate).order_by(ranked.c.id)).scalars())
+
+
+def compact_match_history(max_age_days=None, max_searches_per_candidate=None, batch_size=None,
+                          dry_run=False, session_factory=SessionLocal, resumes_dir=RESUMES_DIR):
+    """Delete match searches past retention, with their results and resume files.
+
+    Arguments default to the RETENTION_* settings. Returns a stats dict with
+    searches/results deleted, resume files removed and bytes reclaimed. With
+    dry_run=True nothing is deleted and the stats describe what would be.
+    """
+    max_age_days = RETENTION_MAX_AGE_DAYS if max_age_days is None else max_age_days
+    max_per_candidate = RETENTION_MAX_SEARCHES_PER_CANDIDATE if max_searches_per_candidate is None else max_searches_per_candidate
+    batch_size = max(1, int(batch_size or RETENTION_BATCH_SIZE))
+
+    stats = {"searches_deleted": 0, "results_deleted": 0, "files_deleted": 0, "bytes_reclaimed": 0, "batches": 0, "dry_run": bool(dry_run)}
+    if not max_age_days and not max_per_candidate:
+        return stats
+    cutoff = datetime.datetime.utcnow() - datetime.timedelta(days=max_age_days) if max_age_days else None
+
+    # Rank before the age pass: expired searches are older than every
+    # surviving one, so deleting them does not change the survivors' ranks.
+    over_quota = []
+    if max_per_candidate:
+        with session_factory() as db:
+            over_quota = _over_quota_ids(db, max_per_candidate)
+
+    def run_batch(query):
+        with session_factory() as db:
+            rows = db.execute(query).all()
+            if not rows:
+                return rows
+            ids = [r.id for r in rows]
+            n_results = db.query(func.count(MatchResult.id)).filter(MatchResult.search_id.in_(ids)).scalar() or 0
+            if not dry_run:
+                db.query(MatchResult).filter(MatchResult.search_id.in_(ids)).delete(synchronize_session=False)
+                db.query(MatchSearch).filter(MatchSearch.id.in_(ids)).delete(synchronize_session=False)
+                db.commit()
+
+        stats["batches"] += 1
+        stats["searches_deleted"] += len(ids)
+        stats["results_deleted"] += n_results
+        # files go only after the rows are gone, so a failed commit never orphans a live search
+        for r in rows:
+            if dry_run:
+                fp = resolve_resume_path(r.resume_path, resumes_dir)
+                freed = os.path.getsize(fp) if fp and os.path.isfile(fp) else 0
+            else:
+                freed = remove_resume_file(r.resume_path, resumes_dir)
+            if freed:
+                stats["files_deleted"] += 1
+                stats["bytes_reclaimed"] += freed
+        return rows
+
+    searches = select(MatchSearch.id, MatchSearch.resume_path).order_by(MatchSearch.id)
+    last_id = 0
+    while cutoff is not None:
+        rows = run_batch(searches.where(MatchSearch.created_at < cutoff, MatchSearch.id > last_id).limit(batch_size))
+        if not rows:
+            break
+        last_id = rows[-1].id
+    for start in range(0, len(over_quota), batch_size):
+        query = searches.where(MatchSearch.id.in_(over_quota[start:start + batch_size]))
+        if cutoff is not None:
+            # already counted by the age pass (matters for dry runs)
+            query = query.where(or_(MatchSearch.created_at >= cutoff, MatchSearch.created_at.is_(None)))
+        run_batch(query)
+
+    return stats
+
+
+def start_retention_worker(interval_seconds=None):
+    """Run compact_match_history periodically in a daemon thread.
+
+    Returns (thread, stop_event); set the event to stop the loop. Returns
+    (None, None) when the interval is not positive.
+    """
+    interval = RETENTION_INTERVAL_SECONDS if interval_seconds is None else interval_seconds
+    if not interval or interval <= 0:
+        return None, None
+    stop = threading.Event()
+
+    def _loop():
+        while not stop.wait(interval):
+            try:
+                stats = compact_match_history()
+                if stats["searches_deleted"]:
+                    logger.info("Match history retention: %s", stats)
+            except Exception:
+                logger.exception("Match history retention run failed")
+
+    thread = threading.Thread(target=_loop, name="match-retention", daemon=True)
+    thread.start()
+    return thread, stop
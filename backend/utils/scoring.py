@@ -2,6 +2,10 @@
 try:
     from ml.scoring_service import score_job_application as ml_score
     from ml.scoring_service import explain_job_application as ml_explain
+    from ml.scoring_service import embed as ml_embed, embed_document as ml_embed_document
+    from ml.contexts import ResumeContext
+    from ml.encoders import EMBEDDING_BACKEND
+    from ml import scoring_service as ml_service
 except ModuleNotFoundError:
     # If the package import fails (for example when running uvicorn from inside
     # the `backend/` directory), add the project root to sys.path so the
@@ -13,11 +17,35 @@ except ModuleNotFoundError:
         sys.path.insert(0, project_root)
     from ml.scoring_service import score_job_application as ml_score
     from ml.scoring_service import explain_job_application as ml_explain
+    from ml.scoring_service import embed as ml_embed, embed_document as ml_embed_document
+    from ml.contexts import ResumeContext
+    from ml.encoders import EMBEDDING_BACKEND
+    from ml import scoring_service as ml_service
 
 
-def score_job_application(job, application):
-    return ml_score(job, application)
+def score_job_application(job, application, skill_match=None):
+    return ml_score(job, application, skill_match=skill_match)
 
 
 def explain_job_application(job, application):
     return ml_explain(job, application)
+
+
+def resume_context(text, fingerprint=None):
+    """Build the ResumeContext shared by every job one resume is scored against."""
+    return ResumeContext(text, fingerprint)
+
+
+def resume_vector(resume_ctx):
+    """Unit resume vector of a ResumeContext, or None if the model is unavailable."""
+    return resume_ctx.try_vector(ml_embed_document)
+
+
+def warm_model():
+    """Load the embedding encoder and run one inference."""
+    ml_embed("warm up the embedding model")
+
+
+def model_status():
+    encoder = ml_service.model
+    return {"loaded": encoder is not None, "backend": getattr(encoder, "name", EMBEDDING_BACKEND)}
@@ -0,0 +1,305 @@
+"""Full-text search over jobs and resumes backed by SQLite FTS5.
+
+`jobs_fts` mirrors each job's title, description and skills (the
+`required_skills` string plus `requirements.required_skills`) and is kept in
+sync by triggers on the jobs table, so every insert/update/delete path --
+including bulk deletes -- updates the index. Keyword hits are ranked with
+bm25 and the top candidates are re-ranked by cosine similarity between the
+query embedding and each job's stored description embedding.
+
+`applications_fts` indexes Application.resume_text the same way (populated by
+an insert trigger at apply time, backfilled on creation) and backs the
+recruiter resume search.
+
+On non-SQLite databases, or when the FTS5 tables could not be created, the
+search falls back to a LIKE scan.
+"""
+import logging
+import os
+import re
+
+import numpy as np
+from sqlalchemy import DateTime, text
+
+from ..models import Job, Application, User
+
+# How many bm25 candidates are re-ranked semantically, and the weight of the
+# semantic score in the blended ranking (0 = lexical only).
+SEARCH_RERANK_CANDIDATES = int(os.getenv("SEARCH_RERANK_CANDIDATES", "200"))
+SEARCH_SEMANTIC_WEIGHT = float(os.getenv("SEARCH_SEMANTIC_WEIGHT", "0.5"))
+
+logger = logging.getLogger(__name__)
+
+_JOB_SKILLS_SQL = (
+    "coalesce({t}.required_skills, '') || ' ' || "
+    "coalesce(CASE WHEN json_valid({t}.requirements) THEN json_extract({t}.requirements, '$.required_skills') END, '')"
+)
+
+_JOBS_FTS_DDL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS jobs_fts USING fts5(title, description, skills, tokenize='porter unicode61')",
+    f"""CREATE TRIGGER IF NOT EXISTS jobs_fts_ai AFTER INSERT ON jobs BEGIN
+        INSERT INTO jobs_fts(rowid, title, description, skills)
+        VALUES (new.id, new.title, new.description, {_JOB_SKILLS_SQL.format(t='new')});
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS jobs_fts_ad AFTER DELETE ON jobs BEGIN
+        DELETE FROM jobs_fts WHERE rowid = old.id;
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS jobs_fts_au AFTER UPDATE OF title, description, required_skills, requirements ON jobs BEGIN
+        DELETE FROM jobs_fts WHERE rowid = old.id;
+        INSERT INTO jobs_fts(rowid, title, description, skills)
+        VALUES (new.id, new.title, new.description, {_JOB_SKILLS_SQL.format(t='new')});
+    END""",
+]
+
+_APPLICATIONS_FTS_DDL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS applications_fts USING fts5(resume_text, tokenize='porter unicode61')",
+    """CREATE TRIGGER IF NOT EXISTS applications_fts_ai AFTER INSERT ON applications BEGIN
+        INSERT INTO applications_fts(rowid, resume_text) VALUES (new.id, coalesce(new.resume_text, ''));
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS applications_fts_ad AFTER DELETE ON applications BEGIN
+        DELETE FROM applications_fts WHERE rowid = old.id;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS applications_fts_au AFTER UPDATE OF resume_text ON applications BEGIN
+        DELETE FROM applications_fts WHERE rowid = old.id;
+        INSERT INTO applications_fts(rowid, resume_text) VALUES (new.id, coalesce(new.resume_text, ''));
+    END""",
+]
+
+_APPLICATIONS_FTS_BACKFILL = """
+    INSERT INTO applications_fts(rowid, resume_text)
+    SELECT id, coalesce(resume_text, '') FROM applications
+"""
+
+_JOBS_FTS_BACKFILL = f"""
+    INSERT INTO jobs_fts(rowid, title, description, skills)
+    SELECT j.id, j.title, j.description, {_JOB_SKILLS_SQL.format(t='j')} FROM jobs j
+"""
+
+
+_FTS_TABLES = [
+    ("jobs_fts", _JOBS_FTS_DDL, _JOBS_FTS_BACKFILL),
+    ("applications_fts", _APPLICATIONS_FTS_DDL, _APPLICATIONS_FTS_BACKFILL),
+]
+
+
+# engine -> whether the FTS tables exist; set by ensure_search_indexes, or
+# checked once on first use in processes that never call it
+_fts_ready = {}
+
+
+def _table_exists(conn, name) -> bool:
+    return conn.execute(text("SELECT 1 FROM sqlite_master WHERE name = :n"), {"n": name}).first() is not None
+
+
+def fts_available(engine) -> bool:
+    """True when the FTS tables can be queried (SQLite with FTS5 set up)."""
+    if engine.dialect.name != "sqlite":
+        return False
+    ready = _fts_ready.get(engine)
+    if ready is None:
+        with engine.connect() as conn:
+            ready = all(_table_exists(conn, table) for table, _, _ in _FTS_TABLES)
+        _fts_ready[engine] = ready
+    return ready
+
+
+def ensure_search_indexes(engine) -> None:
+    """Create the FTS tables and sync triggers, backfilling when first created."""
+    if engine.dialect.name != "sqlite":
+        return
+    try:
+        with engine.begin() as conn:
+            for table, ddls, backfill in _FTS_TABLES:
+                created = not _table_exists(conn, table)
+                for ddl in ddls:
+                    conn.exec_driver_sql(ddl)
+                if created:
+                    conn.exec_driver_sql(backfill)
+        _fts_ready[engine] = True
+    except Exception:
+        # FTS5 may be missing from the local SQLite build; search falls back to LIKE
+        logger.exception("Failed to create full-text search indexes")
+        _fts_ready[engine] = False
+
+
+def rebuild_search_indexes(engine) -> None:
+    """Re-populate the FTS tables from their source tables."""
+    if not fts_available(engine):
+        return
+    with engine.begin() as conn:
+        for table, _, backfill in _FTS_TABLES:
+            conn.exec_driver_sql(f"DELETE FROM {table}")
+            conn.exec_driver_sql(backfill)
+
+
+_QUERY_TERM = re.compile(r'"([^"]*)"|(\S+)')
+
+
+def build_match_query(q: str) -> str:
+    """Turn user input into a safe FTS5 MATCH expression.
+
+    Supports "quoted phrases" and trailing-* prefix terms; every other
+    character is treated as plain text, so user input can never raise an FTS5
+    syntax error. Terms are ANDed.
+    """
+    parts = []
+    for phrase, word in _QUERY_TERM.findall(q or ""):
+        if phrase:
+            tokens = re.findall(r"\w+", phrase)
+            if tokens:
+                parts.append('"' + " ".join(tokens) + '"')
+            continue
+        tokens = re.findall(r"\w+", word)
+        prefix = word.endswith("*")
+        for i, token in enumerate(tokens):
+            # only the last token of a prefix word (e.g. "node.j*") keeps the '*'
+            star = "*" if prefix and i == len(tokens) - 1 else ""
+            parts.append(f'"{token}"{star}')
+    return " ".join(parts)
+
+
+def _cosine_to_many(query_vec, vectors):
+    q = np.asarray(query_vec, dtype=np.float32).reshape(-1)
+    m = np.asarray(vectors, dtype=np.float32)
+    denom = np.linalg.norm(m, axis=1) * (np.linalg.norm(q) or 1.0)
+    denom[denom == 0] = 1.0
+    return (m @ q) / denom
+
+
+def _lexical_candidates(db, q, limit):
+    """Return [(job_id, lexical_score, snippet)] best-first; scores in 0..1."""
+    if fts_available(db.get_bind()):
+        match = build_match_query(q)
+        if not match:
+            return []
+        rows = db.execute(text(
+            "SELECT rowid, bm25(jobs_fts, 5.0, 1.0, 3.0) AS rank, "
+            "snippet(jobs_fts, 1, '<mark>', '</mark>', '…', 16) AS snip "
+            "FROM jobs_fts WHERE jobs_fts MATCH :q ORDER BY rank LIMIT :n"
+        ), {"q": match, "n": limit}).all()
+        if not rows:
+            return []
+        # bm25 is lower-is-better and unbounded; min-max it into 0..1
+        best, worst = rows[0].rank, rows[-1].rank
+        span = (worst - best) or 1.0
+        return [(r.rowid, 1.0 - (r.rank - best) / span if len(rows) > 1 else 1.0, r.snip) for r in rows]
+
+    terms = re.findall(r"\w+", q or "")
+    if not terms:
+        return []
+    query = db.query(Job.id)
+    for t in terms:
+        like = f"%{t}%"
+        query = query.filter((Job.title.ilike(like)) | (Job.description.ilike(like)) | (Job.required_skills.ilike(like)))
+    return [(r.id, 1.0, None) for r in query.order_by(Job.id.desc()).limit(limit)]
+
+
+def search_jobs(db, q, limit=20, rerank=True, embed_fn=None, semantic_weight=None):
+    """Keyword search over jobs with optional semantic re-ranking.
+
+    Returns a list of dicts (job fields plus `score`, `lexical_score`,
+    `semantic_score` and a description `snippet`), best first.
+    `semantic_score` is None for jobs without a stored embedding.
+    """
+    weight = SEARCH_SEMANTIC_WEIGHT if semantic_weight is None else semantic_weight
+    n_candidates = max(int(limit), SEARCH_RERANK_CANDIDATES) if rerank and weight > 0 else int(limit)
+    candidates = _lexical_candidates(db, q, n_candidates)
+    if not candidates:
+        return []
+
+    ids = [c[0] for c in candidates]
+    columns = [Job.id, Job.title, Job.company, Job.location, Job.experience_level, Job.required_skills,
+               Job.salary_min, Job.salary_max]
+    if rerank and weight > 0:
+        columns.append(Job.embedding)
+    rows = {r.id: r for r in db.query(*columns).filter(Job.id.in_(ids))}
+
+    semantic = {}
+    if rerank and weight > 0 and embed_fn is not None:
+        with_vec = [jid for jid in ids if jid in rows and rows[jid].embedding]
+        if with_vec:
+            try:
+                sims = _cosine_to_many(embed_fn(q), [rows[jid].embedding for jid in with_vec])
+                semantic = {jid: float(s) for jid, s in zip(with_vec, sims)}
+            except Exception:
+                # model unavailable: keep the lexical order
+                logger.warning("Semantic re-ranking unavailable; returning lexical ranking", exc_info=True)
+                semantic = {}
+
+    # Hits without a stored embedding are blended with the candidates' mean
+    # semantic score, so they are neither boosted nor buried relative to
+    # re-ranked hits.
+    neutral = float(np.mean(list(semantic.values()))) if semantic else None
+
+    hits = []
+    for jid, lexical, snip in candidates:
+        row = rows.get(jid)
+        if row is None:
+            continue
+        sem = semantic.get(jid)
+        blended = sem if sem is not None else neutral
+        score = lexical if blended is None else (1.0 - weight) * lexical + weight * blended
+        hits.append({
+            "id": row.id,
+            "title": row.title,
+            "company": row.company,
+            "location": row.location,
+            "experience_level": row.experience_level,
+            "required_skills": row.required_skills,
+            "salary_min": row.salary_min,
+            "salary_max": row.salary_max,
+            "snippet": snip,
+            "score": float(score),
+            "lexical_score": float(lexical),
+            "semantic_score": sem,
+        })
+    hits.sort(key=lambda h: h["score"], reverse=True)
+    return hits[: int(limit)]
+
+
+def search_applications(db, q, recruiter_id, page=1, page_size=20):
+    """Search resume text of applications to `recruiter_id`'s jobs.
+
+    Returns (total, rows) where rows are best-first mappings with application,
+    job and candidate fields plus a highlighted `snippet` of the resume.
+    """
+    offset = (max(1, int(page)) - 1) * int(page_size)
+    if fts_available(db.get_bind()):
+        match = build_match_query(q)
+        if not match:
+            return 0, []
+        params = {"q": match, "rid": recruiter_id, "limit": int(page_size), "offset": offset}
+        where = (
+            "FROM applications_fts "
+            "JOIN applications a ON a.id = applications_fts.rowid "
+            "JOIN jobs j ON j.id = a.job_id "
+            "LEFT JOIN users u ON u.id = a.candidate_id "
+            "WHERE applications_fts MATCH :q AND j.recruiter_id = :rid"
+        )
+        total = db.execute(text(f"SELECT count(*) {where}"), params).scalar() or 0
+        rows = db.execute(text(
+            "SELECT a.id AS application_id, a.job_id, j.title AS job_title, a.candidate_id, "
+            "u.full_name AS candidate_name, u.email AS candidate_email, a.score, a.status, a.created_at, "
+            "snippet(applications_fts, 0, '<mark>', '</mark>', '…', 24) AS snippet "
+            f"{where} ORDER BY bm25(applications_fts) LIMIT :limit OFFSET :offset"
+        ).columns(created_at=DateTime), params).mappings().all()
+        return total, rows
+
+    terms = re.findall(r"\w+", q or "")
+    if not terms:
+        return 0, []
+    query = (
+        db.query(
+            Application.id.label("application_id"), Application.job_id, Job.title.label("job_title"),
+            Application.candidate_id, User.full_name.label("candidate_name"), User.email.label("candidate_email"),
+            Application.score, Application.status, Application.created_at,
+        )
+        .join(Job, Application.job_id == Job.id)
+        .outerjoin(User, Application.candidate_id == User.id)
+        .filter(Job.recruiter_id == recruiter_id)
+    )
+    for t in terms:
+        query = query.filter(Application.resume_text.ilike(f"%{t}%"))
+    total = query.count()
+    rows = [dict(r._asdict(), snippet=None) for r in query.order_by(Application.created_at.desc()).offset(offset).limit(int(page_size))]
+    return total, rows
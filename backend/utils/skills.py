@@ -0,0 +1,359 @@
+"""Global skill vocabulary shared by all jobs.
+
+Each distinct normalized skill ("node js", "python", ...) is stored once in the
+`skills` table with one embedding; jobs point at it through `job_skills`,
+ordered like the job's required skill list. Scoring keeps every skill vector
+in a single L2-normalized float32 matrix (`SkillVocabulary`) and gathers a
+job's vectors by row, so a skill shared by thousands of jobs is embedded,
+stored and loaded once.
+
+`SkillCatalog` is the job-by-skill incidence matrix (scipy CSR) over that
+vocabulary: given the boolean vector of vocabulary skills a resume has, one
+sparse matrix-vector product yields skill_score for every job.
+
+Jobs created before the vocabulary existed keep working from
+Job.skill_embeddings until scripts/migrate_skill_vocabulary.py moves them over.
+"""
+import datetime
+import logging
+import threading
+
+import numpy as np
+from sqlalchemy import insert, select, update
+from sqlalchemy.exc import IntegrityError
+
+from ..models import DataVersion, Job, SessionLocal, Skill, JobSkill
+
+try:
+    from ml.skill_matcher import SkillMatcher, normalize_text_for_matching
+    from ml.scoring_service import match_skill_vocabulary
+except ModuleNotFoundError:
+    import sys, os
+    project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+    if project_root not in sys.path:
+        sys.path.insert(0, project_root)
+    from ml.skill_matcher import SkillMatcher, normalize_text_for_matching
+    from ml.scoring_service import match_skill_vocabulary
+
+logger = logging.getLogger(__name__)
+
+
+def job_skill_list(requirements, required_skills=None):
+    """The ordered skill list a job is scored against.
+
+    `requirements["required_skills"]` when set, otherwise the comma-separated
+    `Job.required_skills` string the recruiter form submits.
+    """
+    skills = (requirements or {}).get("required_skills") or []
+    if not skills and required_skills:
+        skills = [s.strip() for s in required_skills.split(",") if s.strip()]
+    return [str(s) for s in skills]
+
+
+def get_or_create_skills(db, labels, embed_fn=None, known_vectors=None):
+    """Return Skill rows for `labels` (same order), creating missing ones.
+
+    Existing skills are found with one IN query on the normalized name; only
+    skills new to the vocabulary are embedded. `known_vectors` may map a
+    normalized name to an already computed vector (used when migrating legacy
+    per-job embeddings). Labels that normalize to "" map to None.
+
+    Each new skill is inserted under a SAVEPOINT: when a concurrent request
+    created the same name since the lookup, the unique constraint fails and
+    that row is used instead.
+    """
+    names = [normalize_text_for_matching(label) for label in labels]
+    wanted = sorted({n for n in names if n})
+    existing = {}
+    if wanted:
+        existing = {s.name: s for s in db.query(Skill).filter(Skill.name.in_(wanted))}
+    for label, name in zip(labels, names):
+        if not name or name in existing:
+            continue
+        vector = (known_vectors or {}).get(name)
+        if vector is None and embed_fn:
+            try:
+                vector = embed_fn(label)
+            except Exception:
+                # model unavailable: store the rest without vectors rather than retrying per skill
+                logger.warning("Failed to embed skill %r", label, exc_info=True)
+                vector = None
+                embed_fn = None
+        skill = Skill(name=name, label=label, embedding=None if vector is None else np.asarray(vector, dtype=float).tolist())
+        try:
+            with db.begin_nested():
+                db.add(skill)
+        except IntegrityError:
+            skill = db.query(Skill).filter(Skill.name == name).one()
+        existing[name] = skill
+    return [existing.get(n) if n else None for n in names]
+
+
+CATALOG_VERSION = "job_skills"
+
+
+def bump_catalog_version(db):
+    """Mark job_skills as changed; call in the transaction that changes it.
+
+    Works on a Session or a Connection. SkillCatalog.refresh() rebuilds when
+    the version differs from the one it was built at (ids and rowids are
+    reused after deletes, so row counts cannot tell).
+    """
+    table = DataVersion.__table__
+    bump = update(table).where(table.c.name == CATALOG_VERSION).values(version=table.c.version + 1)
+    if db.execute(bump).rowcount:
+        return
+    try:
+        with db.begin_nested():
+            db.execute(insert(table).values(name=CATALOG_VERSION, version=1))
+    except IntegrityError:
+        # another transaction created the row first
+        db.execute(bump)
+
+
+def catalog_version(db):
+    table = DataVersion.__table__
+    return db.execute(select(table.c.version).where(table.c.name == CATALOG_VERSION)).scalar() or 0
+
+
+def set_job_skills(db, job_id, labels, embed_fn=None, known_vectors=None):
+    """Replace the job_skills rows of `job_id` with `labels`, in order."""
+    db.flush()  # links still pending from an earlier call must be deleted too
+    db.query(JobSkill).filter(JobSkill.job_id == job_id).delete(synchronize_session=False)
+    skills = get_or_create_skills(db, labels, embed_fn=embed_fn, known_vectors=known_vectors)
+    for position, skill in enumerate(skills):
+        if skill is not None:
+            db.add(JobSkill(job_id=job_id, position=position, skill_id=skill.id))
+    bump_catalog_version(db)
+    db.query(Job).filter(Job.id == job_id).update({Job.updated_at: datetime.datetime.utcnow()}, synchronize_session=False)
+    return skills
+
+
+def job_skill_ids(db, job_ids):
+    """Map each job id to its skill ids ordered by position ({} for none)."""
+    out = {}
+    if not job_ids:
+        return out
+    rows = (
+        db.query(JobSkill.job_id, JobSkill.skill_id)
+        .filter(JobSkill.job_id.in_(list(job_ids)))
+        .order_by(JobSkill.job_id, JobSkill.position)
+    )
+    for job_id, skill_id in rows:
+        out.setdefault(job_id, []).append(skill_id)
+    return out
+
+
+class SkillVocabulary:
+    """In-memory matrix of every skill embedding, one row per skill id.
+
+    Rows are L2-normalized so a dot product is a cosine similarity. Skills
+    are immutable once created, so `refresh()` only loads ids above the
+    highest one already held (a single cheap query when nothing changed).
+    Skills stored without an embedding get a zero row and `has_vector` False.
+    """
+
+    def __init__(self, session_factory=SessionLocal):
+        self._session_factory = session_factory
+        self._lock = threading.Lock()
+        # (matrix, has_vector, names, row_of, max_id) swapped as one tuple so
+        # readers never pair a new row_of with an old matrix; take one
+        # snapshot() per operation instead of reading the attributes below
+        # one by one
+        self._state = (np.zeros((0, 0), dtype=np.float32), np.zeros(0, dtype=bool), (), {}, 0)
+        self._matcher = None
+
+    matrix = property(lambda self: self._state[0])
+    has_vector = property(lambda self: self._state[1])
+    names = property(lambda self: self._state[2])
+    row_of = property(lambda self: self._state[3])
+    max_id = property(lambda self: self._state[4])
+
+    def __len__(self):
+        return len(self._state[2])
+
+    def snapshot(self, skill_ids=()):
+        """Current state tuple, refreshed first if any of `skill_ids` is unknown."""
+        state = self._state
+        if any(sid not in state[3] for sid in skill_ids):
+            self.refresh()
+            state = self._state
+        return state
+
+    def refresh(self):
+        """Load skills created since the last refresh. Returns rows added."""
+        with self._lock:
+            matrix, has_vector, names, row_of, max_id = self._state
+            with self._session_factory() as db:
+                rows = (
+                    db.query(Skill.id, Skill.name, Skill.embedding)
+                    .filter(Skill.id > max_id)
+                    .order_by(Skill.id)
+                    .all()
+                )
+            if not rows:
+                return 0
+            vectors = [np.asarray(r.embedding, dtype=np.float32).reshape(-1) if r.embedding else None for r in rows]
+            dim = matrix.shape[1] or next((v.shape[0] for v in vectors if v is not None), 0)
+            if dim and not matrix.shape[1]:
+                # every skill loaded so far lacked a vector; widen their zero rows
+                matrix = np.zeros((len(names), dim), dtype=np.float32)
+            block = np.zeros((len(rows), dim), dtype=np.float32)
+            present = np.zeros(len(rows), dtype=bool)
+            for i, v in enumerate(vectors):
+                if v is None or v.shape[0] != dim:
+                    continue
+                norm = float(np.linalg.norm(v))
+                if norm > 0:
+                    block[i] = v / norm
+                    present[i] = True
+            start = len(names)
+            row_of = dict(row_of)
+            row_of.update((r.id, start + i) for i, r in enumerate(rows))
+            self._state = (
+                block if start == 0 else np.vstack([matrix, block]),
+                np.concatenate([has_vector, present]),
+                names + tuple(r.name for r in rows),
+                row_of,
+                rows[-1].id,
+            )
+            return len(rows)
+
+    def rows(self, skill_ids, state=None):
+        """Matrix row index of each skill id (refreshing once for unknown ids)."""
+        row_of = (state or self.snapshot(skill_ids))[3]
+        return np.fromiter((row_of[sid] for sid in skill_ids), dtype=np.intp, count=len(skill_ids))
+
+    def lexical_matcher(self, state=None):
+        """SkillMatcher over every vocabulary name, rebuilt when the vocabulary grows."""
+        names = (state or self._state)[2]
+        matcher = self._matcher
+        if matcher is None or len(matcher.skills) != len(names):
+            matcher = SkillMatcher(list(names))
+            self._matcher = matcher
+        return matcher
+
+    def stats(self):
+        matrix, has_vector, names, _, _ = self._state
+        return {"skills": len(names), "with_vector": int(has_vector.sum()), "dim": int(matrix.shape[1])}
+
+    def vectors(self, skill_ids):
+        """(len(skill_ids), dim) array of skill vectors, or None if any lacks one."""
+        if not skill_ids:
+            return None
+        state = self.snapshot(skill_ids)
+        idx = self.rows(skill_ids, state)
+        if not state[1][idx].all():
+            return None
+        return state[0][idx]
+
+
+_vocabulary = None
+_vocabulary_lock = threading.Lock()
+
+
+def get_skill_vocabulary():
+    """Process-wide SkillVocabulary, loaded on first use."""
+    global _vocabulary
+    if _vocabulary is None:
+        with _vocabulary_lock:
+            if _vocabulary is None:
+                vocab = SkillVocabulary()
+                vocab.refresh()
+                _vocabulary = vocab
+    return _vocabulary
+
+
+class SkillCatalog:
+    """Sparse job-by-skill incidence matrix over the vocabulary.
+
+    Row i is job `job_ids[i]`, column j is vocabulary row j, and the entry is
+    how often the skill appears in the job's list. `refresh()` rebuilds it
+    only when the job_skills version (bump_catalog_version) changed.
+    """
+
+    def __init__(self, vocabulary, session_factory=SessionLocal):
+        self.vocabulary = vocabulary
+        self._session_factory = session_factory
+        self._lock = threading.Lock()
+        # (version, job_ids, incidence, n_skills) swapped as one tuple so
+        # readers never see a half-updated catalog; incidence is None until
+        # the first refresh (scipy is imported then, not at app import)
+        self._state = (None, np.zeros(0, dtype=np.int64), None, np.zeros(0))
+
+    def __len__(self):
+        return len(self._state[1])
+
+    def refresh(self):
+        """Rebuild from job_skills if it changed. Returns True when rebuilt."""
+        from scipy import sparse
+
+        with self._lock:
+            with self._session_factory() as db:
+                version = catalog_version(db)
+                if version == self._state[0]:
+                    return False
+                rows = db.query(JobSkill.job_id, JobSkill.skill_id).order_by(JobSkill.job_id, JobSkill.position).all()
+            job_col = np.fromiter((r[0] for r in rows), dtype=np.int64, count=len(rows))
+            skill_ids = [r[1] for r in rows]
+            vocab_state = self.vocabulary.snapshot(skill_ids)
+            cols = self.vocabulary.rows(skill_ids, vocab_state)
+            job_ids, job_rows = np.unique(job_col, return_inverse=True)
+            incidence = sparse.csr_matrix(
+                (np.ones(len(rows), dtype=np.float32), (job_rows, cols)),
+                shape=(len(job_ids), len(vocab_state[2])),
+            )
+            n_skills = np.bincount(job_rows, minlength=len(job_ids))
+            self._state = (version, job_ids, incidence, n_skills)
+            return True
+
+    def stats(self):
+        _, job_ids, incidence, _ = self._state
+        return {"jobs": len(job_ids), "links": int(incidence.nnz) if incidence is not None else 0, "loaded": incidence is not None}
+
+    def resume_mask(self, resume_text, resume_vec):
+        """Boolean vector over the vocabulary of skills present in the resume (text or ResumeContext)."""
+        vocab = self.vocabulary
+        state = vocab.snapshot()
+        return match_skill_vocabulary(resume_text, resume_vec, state[0], state[1], vocab.lexical_matcher(state))
+
+    def skill_scores(self, mask):
+        """{job_id: skill_score} for every catalog job, from one sparse mat-vec."""
+        _, job_ids, incidence, n_skills = self._state
+        if incidence is None:
+            return {}
+        m = np.zeros(incidence.shape[1], dtype=np.float32)
+        k = min(len(mask), len(m))
+        m[:k] = mask[:k]
+        scores = (incidence @ m) / np.maximum(1, n_skills)
+        return dict(zip(job_ids.tolist(), scores.tolist()))
+
+
+_catalog = None
+
+
+def get_skill_catalog():
+    """Process-wide SkillCatalog over the shared vocabulary (call refresh() before use)."""
+    global _catalog
+    if _catalog is None:
+        with _vocabulary_lock:
+            if _catalog is None:
+                _catalog = SkillCatalog(get_skill_vocabulary())
+    return _catalog
+
+
+def scoring_job(description, requirements, required_skills=None, skill_embeddings=None, skill_ids=None, vocabulary=None):
+    """Build the job dict ml.scoring_service expects.
+
+    Skill vectors come from the shared vocabulary matrix when the job has
+    job_skills rows, falling back to legacy per-job skill_embeddings.
+    """
+    skills = job_skill_list(requirements, required_skills)
+    reqs = dict(requirements or {})
+    reqs["required_skills"] = skills
+    vectors = None
+    if skill_ids and len(skill_ids) == len(skills):
+        vectors = (vocabulary or get_skill_vocabulary()).vectors(skill_ids)
+    if vectors is None and skill_embeddings:
+        vectors = skill_embeddings
+    return {"description": description, "requirements": reqs, "skill_embeddings": vectors}
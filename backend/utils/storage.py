@@ -0,0 +1,45 @@
+"""Helpers for resume files stored under the resumes/ directory."""
+import logging
+import os
+
+RESUMES_DIR = os.getenv("RESUMES_DIR", "resumes")
+
+logger = logging.getLogger(__name__)
+
+
+def resolve_resume_path(path, resumes_dir=RESUMES_DIR):
+    """Return the absolute path for `path` if it lives inside `resumes_dir`, else None.
+
+    Guards every delete so a bad DB value can never remove files elsewhere.
+    """
+    if not path:
+        return None
+    root = os.path.abspath(resumes_dir)
+    file_path = os.path.abspath(str(path))
+    try:
+        if os.path.commonpath([root, file_path]) != root or file_path == root:
+            return None
+    except ValueError:
+        # different drives on Windows
+        return None
+    return file_path
+
+
+def remove_resume_file(path, resumes_dir=RESUMES_DIR) -> int:
+    """Remove a stored resume file, returning the number of bytes freed.
+
+    Missing files and paths outside `resumes_dir` are ignored (0 bytes).
+    Filesystem errors are logged rather than raised so DB cleanup can proceed.
+    """
+    file_path = resolve_resume_path(path, resumes_dir)
+    if not file_path:
+        return 0
+    try:
+        size = os.path.getsize(file_path)
+        os.remove(file_path)
+        return size
+    except FileNotFoundError:
+        return 0
+    except OSError:
+        logger.warning("Failed to delete resume file: %s", file_path, exc_info=True)
+        return 0
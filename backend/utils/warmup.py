@@ -0,0 +1,126 @@
+"""Background warm-up of the scoring stack and readiness reporting.
+
+Without warm-up the first /apply or /score request in each worker pays for
+loading the embedding model, the skill vocabulary matrix, the job-by-skill
+catalog and every JobContext. `start_warmup()` (called at startup) does that
+work in a daemon thread, one timed stage at a time, and `readiness()` reports
+the result for the /ready endpoint so load balancers only route to warm
+workers.
+
+Configuration (environment):
+    WARMUP_ON_STARTUP      start the warm-up thread at app startup (default 1)
+    WARMUP_JOB_CONTEXTS    preload JobContexts for at most this many jobs
+                           (default: the JobContext cache size)
+"""
+import logging
+import os
+import threading
+import time
+
+from .job_contexts import iter_job_scoring_rows
+from .skills import get_skill_catalog, get_skill_vocabulary
+from . import scoring as scoring_utils
+
+try:
+    from ml.contexts import get_job_context_cache
+except ModuleNotFoundError:
+    import sys
+    project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+    if project_root not in sys.path:
+        sys.path.insert(0, project_root)
+    from ml.contexts import get_job_context_cache
+
+WARMUP_ON_STARTUP = os.getenv("WARMUP_ON_STARTUP", "1").strip().lower() not in ("0", "false", "no")
+WARMUP_JOB_CONTEXTS = int(os.getenv("WARMUP_JOB_CONTEXTS", "-1"))
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_state = {"status": "idle", "started_at": None, "finished_at": None, "seconds": None, "stages": {}}
+_thread = None
+
+
+def _warm_vocabulary():
+    get_skill_vocabulary().refresh()
+
+
+def _warm_catalog():
+    get_skill_catalog().refresh()
+
+
+def _warm_job_contexts():
+    limit = WARMUP_JOB_CONTEXTS if WARMUP_JOB_CONTEXTS >= 0 else get_job_context_cache().max_size
+    loaded = 0
+    for _ in iter_job_scoring_rows():
+        loaded += 1
+        if loaded >= limit:
+            break
+    return {"jobs": loaded}
+
+
+# (name, callable) in run order; a callable may return extra details for the stage
+STAGES = (
+    ("model", scoring_utils.warm_model),
+    ("vocabulary", _warm_vocabulary),
+    ("catalog", _warm_catalog),
+    ("job_contexts", _warm_job_contexts),
+)
+
+
+def run_warmup():
+    """Run every warm-up stage in order, recording timings. Returns the final state."""
+    with _lock:
+        _state.update(status="running", started_at=time.time(), finished_at=None, seconds=None, stages={})
+    t_start = time.perf_counter()
+    failed = False
+    for name, stage in STAGES:
+        t0 = time.perf_counter()
+        entry = {"ok": True}
+        try:
+            details = stage()
+            if details:
+                entry.update(details)
+        except Exception as e:
+            failed = True
+            entry = {"ok": False, "error": f"{type(e).__name__}: {e}"}
+            logger.exception("Warm-up stage %s failed", name)
+        entry["seconds"] = round(time.perf_counter() - t0, 4)
+        with _lock:
+            _state["stages"][name] = entry
+    with _lock:
+        _state.update(status="failed" if failed else "ready", finished_at=time.time(),
+                      seconds=round(time.perf_counter() - t_start, 4))
+        return dict(_state)
+
+
+def start_warmup():
+    """Start run_warmup() in a daemon thread (once per process). Returns the thread."""
+    global _thread
+    with _lock:
+        if _thread is not None:
+            return _thread
+        _thread = threading.Thread(target=run_warmup, name="scoring-warmup", daemon=True)
+    _thread.start()
+    return _thread
+
+
+def readiness():
+    """Readiness report: warm-up state and timings, model state and cache fill.
+
+    `ready` is True once warm-up finished without errors, or, when warm-up
+    never ran in this process, once the model has been loaded lazily.
+    """
+    with _lock:
+        state = {k: (dict(v) if isinstance(v, dict) else v) for k, v in _state.items()}
+    model = scoring_utils.model_status()
+    ready = state["status"] == "ready" or (state["status"] == "idle" and model["loaded"])
+    return {
+        "ready": ready,
+        "warmup": state,
+        "model": model,
+        "caches": {
+            "vocabulary": get_skill_vocabulary().stats(),
+            "catalog": get_skill_catalog().stats(),
+            "job_contexts": get_job_context_cache().stats(),
+        },
+    }
@@ -0,0 +1,91 @@
+"""
+Authenticated request throughput with and without the auth user cache.
+
+Creates a recruiter in a throwaway SQLite database and hammers a recruiter-only
+endpoint through a local TestClient, once with the cache disabled (legacy
+behaviour: one `User` query per request) and once with it enabled. Also times
+the `get_current_recruiter` dependency on its own and counts SQL statements.
+
+Usage:
+    python benchmarks/bench_auth.py --requests 2000
+"""
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--requests", type=int, default=2000)
+    ap.add_argument("--json", dest="json_path", default=None, help="write results to this file")
+    args = ap.parse_args(argv)
+
+    workdir = tempfile.mkdtemp(prefix="sm_bench_")
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(workdir, 'bench.db')}"
+
+    from sqlalchemy import event
+    from fastapi.testclient import TestClient
+    from backend import auth
+    from backend.models import engine, init_db, SessionLocal, User
+    from backend.main import app
+
+    init_db()
+    with SessionLocal() as db:
+        user = User(email="recruiter@example.com", password_hash="x", role="recruiter", full_name="Recruiter")
+        db.add(user)
+        db.commit()
+        db.refresh(user)
+        token = auth.create_access_token(auth.token_claims_for(user))
+
+    statements = {"n": 0}
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _count(*_):
+        statements["n"] += 1
+
+    client = TestClient(app)
+    headers = {"Authorization": f"Bearer {token}"}
+    results = []
+    print(f"{'mode':<10}{'dependency us':>15}{'req/s':>10}{'SQL/req':>10}")
+    for mode, ttl in (("before", 0.0), ("after", 60.0)):
+        auth.AUTH_USER_CACHE_TTL = ttl
+        auth.invalidate_user_cache()
+
+        # dependency alone
+        n_dep = args.requests * 5
+        with SessionLocal() as db:
+            t0 = time.perf_counter()
+            for _ in range(n_dep):
+                auth.get_current_recruiter(token=token, db=db)
+            dep_us = (time.perf_counter() - t0) / n_dep * 1e6
+
+        # full request path on a cheap recruiter-only endpoint (empty listing)
+        client.get("/api/users/recruiter/users?role=none", headers=headers)
+        statements["n"] = 0
+        t0 = time.perf_counter()
+        for _ in range(args.requests):
+            r = client.get("/api/users/recruiter/users?role=none", headers=headers)
+            assert r.status_code == 200, r.text
+        elapsed = time.perf_counter() - t0
+        rps = args.requests / elapsed
+        sql_per_req = statements["n"] / args.requests
+        results.append({"mode": mode, "dependency_us": dep_us, "requests_per_second": rps, "sql_per_request": sql_per_req})
+        print(f"{mode:<10}{dep_us:>15.1f}{rps:>10.0f}{sql_per_req:>10.2f}")
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump({"requests": args.requests, "results": results}, f, indent=2)
+    engine.dispose()
+    shutil.rmtree(workdir, ignore_errors=True)
+    return results
+
+
+if __name__ == "__main__":
+    main()
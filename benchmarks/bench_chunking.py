@@ -0,0 +1,124 @@
+"""
+Benchmark of chunked long-document embedding (ml/chunking.py).
+
+Embeds a synthetic corpus of long, resume-like documents three ways and
+reports documents/sec, tokens/sec and the padding overhead (padded tokens /
+real tokens) of each:
+
+    truncated          one encode() per document, first window only (the
+                       old behaviour: the model drops the rest)
+    chunked-unsorted   every window embedded, batched in document order
+    chunked-sorted     every window embedded, batched longest-first across
+                       documents (what embed_document/embed_documents do)
+
+The hash backend has no length limit of its own; pass --window to chunk it
+anyway (e.g. to run offline).
+
+Usage:
+    python benchmarks/bench_chunking.py
+    EMBEDDING_BACKEND=hash python benchmarks/bench_chunking.py --window 254 --documents 200 --json out.json
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+WORDS = (
+    "python react docker kubernetes fastapi sqlalchemy aws terraform java spring "
+    "node typescript postgres redis kafka spark airflow pandas numpy pytorch "
+    "microservices api design testing ci cd agile leadership mentoring cloud linux "
+    "built led shipped designed migrated scaled owned reduced latency by across teams"
+).split()
+
+
+def corpus(n, min_words, max_words, seed=42):
+    """Documents of `min_words`..`max_words` words in sentences of 6-30 words."""
+    rng = random.Random(seed)
+    docs = []
+    for _ in range(n):
+        target = rng.randint(min_words, max_words)
+        sentences = []
+        count = 0
+        while count < target:
+            k = rng.randint(6, 30)
+            sentences.append(" ".join(rng.choice(WORDS) for _ in range(k)).capitalize() + ".")
+            count += k
+        docs.append(" ".join(sentences))
+    return docs
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--documents", type=int, default=100)
+    ap.add_argument("--min-words", type=int, default=150)
+    ap.add_argument("--max-words", type=int, default=1500)
+    ap.add_argument("--window", type=int, default=None, help="window in tokens (default: the encoder's limit)")
+    ap.add_argument("--batch-size", type=int, default=32)
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--json", dest="json_path", default=None, help="write results to this file")
+    args = ap.parse_args(argv)
+
+    from ml.chunking import embed_documents, padding_stats, split_documents
+    from ml.encoders import EMBEDDING_BACKEND, get_encoder
+
+    encoder = get_encoder()
+    window = args.window or encoder.max_tokens
+    if not window:
+        ap.error(f"the {EMBEDDING_BACKEND} encoder has no length limit; pass --window")
+    docs = corpus(args.documents, args.min_words, args.max_words)
+    encoder.encode(docs[:4])
+
+    windows = split_documents(docs, encoder, window)
+    first = [spans[0][2] for spans in windows]
+    all_counts = [n for spans in windows for _, _, n in spans]
+    total_tokens = sum(all_counts)
+    truncated_docs = [d[:spans[0][1]] for d, spans in zip(docs, windows)]
+
+    def truncated():
+        for start in range(0, len(truncated_docs), args.batch_size):
+            encoder.encode(truncated_docs[start:start + args.batch_size], batch_size=args.batch_size)
+
+    modes = {
+        "truncated": (truncated, sum(first), padding_stats(first, args.batch_size, sort=False)),
+        "chunked-unsorted": (lambda: embed_documents(docs, encoder, window, batch_size=args.batch_size, sort_by_length=False),
+                             total_tokens, padding_stats(all_counts, args.batch_size, sort=False)),
+        "chunked-sorted": (lambda: embed_documents(docs, encoder, window, batch_size=args.batch_size),
+                           total_tokens, padding_stats(all_counts, args.batch_size, sort=True)),
+    }
+
+    results = []
+    print(f"backend {EMBEDDING_BACKEND}, window {window} tokens, {len(docs)} documents, "
+          f"{len(all_counts)} windows, {total_tokens} tokens")
+    print(f"\n{'mode':<18}{'docs/s':>9}{'tokens/s':>11}{'tokens':>9}{'padding':>9}")
+    for name, (fn, tokens, (real, padded)) in modes.items():
+        best = float("inf")
+        for _ in range(args.repeat):
+            t0 = time.perf_counter()
+            fn()
+            best = min(best, time.perf_counter() - t0)
+        row = {
+            "mode": name,
+            "seconds": best,
+            "documents_per_second": len(docs) / best,
+            "tokens_per_second": tokens / best,
+            "tokens": tokens,
+            "padding_ratio": padded / real if real else 1.0,
+        }
+        results.append(row)
+        print(f"{name:<18}{row['documents_per_second']:>9.1f}{row['tokens_per_second']:>11.0f}"
+              f"{tokens:>9}{row['padding_ratio']:>9.2f}")
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump({"backend": EMBEDDING_BACKEND, "window": window, "documents": len(docs),
+                       "windows": len(all_counts), "results": results}, f, indent=2)
+    return results
+
+
+if __name__ == "__main__":
+    main()
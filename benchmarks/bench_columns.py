@@ -0,0 +1,187 @@
+"""
+Memory/latency benchmark for deferred columns and projection queries.
+
+Builds a throwaway SQLite database with synthetic jobs and applications and
+compares the legacy "load full ORM rows" queries against the projection
+queries now used by list_jobs, get_recruiter_applications and score_resume.
+
+Usage:
+    python benchmarks/bench_columns.py --jobs 10000 --applications 100000
+    python benchmarks/bench_columns.py --jobs 1000 --applications 5000 --json out.json
+"""
+
+import argparse
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+WORDS = (
+    "python react docker kubernetes fastapi sqlalchemy aws terraform java spring "
+    "node typescript postgres redis kafka spark airflow pandas numpy pytorch "
+    "microservices api design testing ci cd agile leadership mentoring cloud linux"
+).split()
+
+
+def _text(rng, n_words):
+    return " ".join(rng.choice(WORDS) for _ in range(n_words))
+
+
+def populate(engine, n_jobs, n_apps, skill_dim, seed=42):
+    """Bulk insert synthetic rows via Core so setup time stays reasonable."""
+    from backend.models import Base, Job, Application, User
+
+    rng = random.Random(seed)
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        conn.execute(User.__table__.insert(), [
+            {"id": 1, "email": "recruiter@example.com", "password_hash": "x", "role": "recruiter", "full_name": "Recruiter"},
+            {"id": 2, "email": "candidate@example.com", "password_hash": "x", "role": "candidate", "full_name": "Candidate"},
+        ])
+        batch = []
+        for i in range(1, n_jobs + 1):
+            skills = rng.sample(WORDS, 5)
+            batch.append({
+                "id": i,
+                "recruiter_id": 1,
+                "title": f"Engineer {i}",
+                "description": _text(rng, 300),
+                "requirements": {"required_skills": skills, "min_experience": rng.randint(0, 8)},
+                "required_skills": ",".join(skills),
+                "skill_embeddings": [[round(rng.uniform(-1, 1), 6) for _ in range(skill_dim)] for _ in skills],
+            })
+            if len(batch) >= 1000:
+                conn.execute(Job.__table__.insert(), batch)
+                batch = []
+        if batch:
+            conn.execute(Job.__table__.insert(), batch)
+        batch = []
+        for i in range(1, n_apps + 1):
+            batch.append({
+                "id": i,
+                "job_id": rng.randint(1, n_jobs),
+                "candidate_id": 2,
+                "resume_path": f"resumes/{i}.txt",
+                "resume_text": _text(rng, 500),
+                "score": rng.random(),
+                "status": rng.choice(["applied", "shortlisted", "rejected"]),
+                "explanation": {"embedding_similarity": rng.random(), "matched_skills": rng.sample(WORDS, 3), "reasons": []},
+                "fingerprint": f"{i:064x}",
+            })
+            if len(batch) >= 5000:
+                conn.execute(Application.__table__.insert(), batch)
+                batch = []
+        if batch:
+            conn.execute(Application.__table__.insert(), batch)
+
+
+def measure(fn, repeat):
+    """Return (best wall-clock seconds, peak traced bytes) over `repeat` runs."""
+    best = float("inf")
+    peak = 0
+    for _ in range(repeat):
+        tracemalloc.start()
+        t0 = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - t0
+        _, run_peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        best = min(best, elapsed)
+        peak = max(peak, run_peak)
+    return best, peak
+
+
+def build_cases():
+    from sqlalchemy.orm import undefer
+    from backend.models import SessionLocal, Job, Application, User
+    from backend.routes.jobs import JOB_LIST_COLUMNS
+    from backend.utils.job_contexts import iter_job_scoring_rows
+    from ml.contexts import get_job_context_cache
+
+    # measure the streaming scan itself, not a warm JobContext cache
+    get_job_context_cache().max_size = 0
+
+    def list_jobs_full():
+        with SessionLocal() as db:
+            return len(db.query(Job).options(undefer("*")).all())
+
+    def list_jobs_projection():
+        with SessionLocal() as db:
+            return len([r._asdict() for r in db.query(*JOB_LIST_COLUMNS).order_by(Job.id).all()])
+
+    def recruiter_apps_full():
+        with SessionLocal() as db:
+            apps = db.query(Application).options(undefer("*")).join(Job).join(User, Application.candidate_id == User.id).all()
+            out = []
+            for a in apps:
+                # legacy listing touched job and candidate per row
+                out.append((a.id, a.job.title, a.candidate.email, a.explanation))
+            return len(out)
+
+    def recruiter_apps_projection():
+        with SessionLocal() as db:
+            rows = db.query(
+                Application.id, Application.job_id, Application.candidate_id, Application.resume_path,
+                Application.score, Application.status, Application.explanation, Application.created_at,
+                Job.title, User.full_name, User.email,
+            ).join(Job, Application.job_id == Job.id).join(User, Application.candidate_id == User.id).all()
+            return len(rows)
+
+    def score_jobs_full():
+        with SessionLocal() as db:
+            jobs = db.query(Job).options(undefer("*")).all()
+        return sum(len(j.skill_embeddings or []) for j in jobs)
+
+    def score_jobs_chunked():
+        return sum(len(ctx.skills) for _, _, ctx in iter_job_scoring_rows())
+
+    return [
+        ("list_jobs", list_jobs_full, list_jobs_projection),
+        ("recruiter_applications", recruiter_apps_full, recruiter_apps_projection),
+        ("score_resume_job_scan", score_jobs_full, score_jobs_chunked),
+    ]
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--jobs", type=int, default=10000)
+    ap.add_argument("--applications", type=int, default=100000)
+    ap.add_argument("--skill-dim", type=int, default=384)
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--json", dest="json_path", default=None, help="write results to this file")
+    args = ap.parse_args(argv)
+
+    workdir = tempfile.mkdtemp(prefix="sm_bench_")
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(workdir, 'bench.db')}"
+    from backend.models import engine
+
+    print(f"Populating {args.jobs} jobs / {args.applications} applications in {workdir} ...")
+    t0 = time.perf_counter()
+    populate(engine, args.jobs, args.applications, args.skill_dim)
+    print(f"  done in {time.perf_counter() - t0:.1f}s")
+
+    results = []
+    print(f"\n{'case':<26}{'legacy s':>10}{'new s':>10}{'legacy MB':>12}{'new MB':>10}{'mem saved':>11}")
+    for name, legacy, new in build_cases():
+        lt, lm = measure(legacy, args.repeat)
+        nt, nm = measure(new, args.repeat)
+        saved = 1.0 - (nm / lm) if lm else 0.0
+        results.append({"case": name, "legacy_seconds": lt, "new_seconds": nt, "legacy_peak_bytes": lm, "new_peak_bytes": nm})
+        print(f"{name:<26}{lt:>10.3f}{nt:>10.3f}{lm / 1e6:>12.1f}{nm / 1e6:>10.1f}{saved:>10.0%}")
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump({"jobs": args.jobs, "applications": args.applications, "results": results}, f, indent=2)
+    engine.dispose()
+    shutil.rmtree(workdir, ignore_errors=True)
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+"""
+Throughput/memory benchmark of the embedding backends (ml/encoders.py).
+
+Each backend runs in its own subprocess so RSS numbers are not shared:
+the child loads the encoder, warms it up, encodes a synthetic corpus of
+resume-like sentences and reports load time, sentences/sec and RSS. The
+parent also reports the cosine similarity of each backend's vectors to the
+torch ones (parity).
+
+Usage:
+    python benchmarks/bench_encoders.py
+    python benchmarks/bench_encoders.py --backends torch onnx onnx-int8 --sentences 2000 --json out.json
+"""
+
+import argparse
+import json
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+WORDS = (
+    "python react docker kubernetes fastapi sqlalchemy aws terraform java spring "
+    "node typescript postgres redis kafka spark airflow pandas numpy pytorch "
+    "microservices api design testing ci cd agile leadership mentoring cloud linux "
+    "built led shipped designed migrated scaled owned reduced latency by across teams"
+).split()
+
+# backend label -> environment for the child process
+BACKENDS = {
+    "torch": {"EMBEDDING_BACKEND": "torch"},
+    "onnx": {"EMBEDDING_BACKEND": "onnx", "EMBEDDING_QUANTIZE": "0"},
+    "onnx-int8": {"EMBEDDING_BACKEND": "onnx", "EMBEDDING_QUANTIZE": "1"},
+}
+PARITY_SENTENCES = 64
+
+
+def corpus(n, seed=42):
+    rng = random.Random(seed)
+    return [" ".join(rng.choice(WORDS) for _ in range(rng.randint(4, 40))) for _ in range(n)]
+
+
+def _rss_mb():
+    """(current RSS, peak RSS) of this process in MB."""
+    try:
+        with open("/proc/self/status", encoding="ascii") as f:
+            fields = dict(line.split(":", 1) for line in f if ":" in line)
+        return int(fields["VmRSS"].split()[0]) / 1024, int(fields["VmHWM"].split()[0]) / 1024
+    except (OSError, KeyError):
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+        return peak, peak
+
+
+def child(args):
+    import numpy as np
+    from ml.encoders import get_encoder
+
+    sentences = corpus(args.sentences)
+    rss_before, _ = _rss_mb()
+    t0 = time.perf_counter()
+    encoder = get_encoder()
+    encoder.encode(sentences[:8], batch_size=args.batch_size)
+    load_seconds = time.perf_counter() - t0
+
+    best = float("inf")
+    for _ in range(args.repeat):
+        t0 = time.perf_counter()
+        vecs = encoder.encode(sentences, batch_size=args.batch_size)
+        best = min(best, time.perf_counter() - t0)
+    single = sentences[:100]
+    t0 = time.perf_counter()
+    for s in single:
+        encoder.encode([s])
+    single_seconds = time.perf_counter() - t0
+    rss, peak = _rss_mb()
+
+    np.save(args.vectors_out, np.asarray(vecs[:PARITY_SENTENCES], dtype=np.float32))
+    print(json.dumps({
+        "load_seconds": load_seconds,
+        "sentences_per_second": len(sentences) / best,
+        "single_call_ms": single_seconds / len(single) * 1000,
+        "rss_mb": rss,
+        "peak_rss_mb": peak,
+        "model_rss_mb": rss - rss_before,
+    }))
+
+
+def run_backend(label, args, workdir):
+    vectors_out = os.path.join(workdir, f"{label}.npy")
+    env = dict(os.environ, **BACKENDS[label])
+    cmd = [sys.executable, os.path.abspath(__file__), "--child",
+           "--sentences", str(args.sentences), "--batch-size", str(args.batch_size),
+           "--repeat", str(args.repeat), "--vectors-out", vectors_out]
+    proc = subprocess.run(cmd, env=env, capture_output=True, text=True)
+    if proc.returncode != 0:
+        return {"backend": label, "error": (proc.stderr.strip().splitlines() or ["failed"])[-1]}
+    result = json.loads(proc.stdout.strip().splitlines()[-1])
+    result["backend"] = label
+    result["vectors"] = vectors_out
+    return result
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--backends", nargs="+", default=list(BACKENDS), choices=list(BACKENDS))
+    ap.add_argument("--sentences", type=int, default=1000)
+    ap.add_argument("--batch-size", type=int, default=32)
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--json", dest="json_path", default=None, help="write results to this file")
+    ap.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    ap.add_argument("--vectors-out", default=None, help=argparse.SUPPRESS)
+    args = ap.parse_args(argv)
+
+    if args.child:
+        return child(args)
+
+    import numpy as np
+
+    workdir = tempfile.mkdtemp(prefix="sm_bench_enc_")
+    results = [run_backend(label, args, workdir) for label in args.backends]
+    reference = next((r for r in results if r["backend"] == "torch" and "error" not in r), None)
+    ref_vecs = np.load(reference["vectors"]) if reference else None
+
+    print(f"\n{'backend':<12}{'load s':>8}{'sent/s':>10}{'1-call ms':>11}{'RSS MB':>9}{'peak MB':>9}{'min cos':>9}")
+    for r in results:
+        if "error" in r:
+            print(f"{r['backend']:<12}  error: {r['error']}")
+            continue
+        vecs = np.load(r.pop("vectors"))
+        if ref_vecs is not None:
+            cos = np.sum(vecs * ref_vecs, axis=1) / np.clip(
+                np.linalg.norm(vecs, axis=1) * np.linalg.norm(ref_vecs, axis=1), 1e-12, None)
+            r["min_cosine_vs_torch"] = float(cos.min())
+            r["mean_cosine_vs_torch"] = float(cos.mean())
+        print(f"{r['backend']:<12}{r['load_seconds']:>8.2f}{r['sentences_per_second']:>10.1f}"
+              f"{r['single_call_ms']:>11.2f}{r['rss_mb']:>9.0f}{r['peak_rss_mb']:>9.0f}"
+              f"{r.get('min_cosine_vs_torch', float('nan')):>9.4f}")
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump({"sentences": args.sentences, "batch_size": args.batch_size, "results": results}, f, indent=2)
+    shutil.rmtree(workdir, ignore_errors=True)
+    return results
+
+
+if __name__ == "__main__":
+    main()
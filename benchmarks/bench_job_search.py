@@ -0,0 +1,83 @@
+"""
+Latency benchmark for keyword job search (SQLite FTS5) at catalog scale.
+
+Bulk-inserts synthetic jobs into a throwaway database with the FTS triggers in
+place, then times lexical search for a set of single-term, multi-term, phrase
+and prefix queries.
+
+Usage:
+    python benchmarks/bench_job_search.py --jobs 100000
+"""
+import argparse
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from bench_columns import WORDS, _text  # noqa: E402
+
+QUERIES = ["kubernetes", "python docker", '"machine learning"', "terra*", "react typescript node", "nonexistentterm"]
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--jobs", type=int, default=100000)
+    ap.add_argument("--repeat", type=int, default=50)
+    ap.add_argument("--json", dest="json_path", default=None, help="write results to this file")
+    args = ap.parse_args(argv)
+
+    workdir = tempfile.mkdtemp(prefix="sm_bench_")
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(workdir, 'bench.db')}"
+    from backend.models import Job, SessionLocal, engine, init_db
+    from backend.utils.search import ensure_search_indexes, search_jobs
+
+    init_db()
+    ensure_search_indexes(engine)
+    rng = random.Random(7)
+    # descriptions mention the job's own skills amid a large filler vocabulary,
+    # so each skill term matches a realistic fraction of postings
+    filler = [f"term{i}" for i in range(20000)] + ["machine learning"] * 50
+    t0 = time.perf_counter()
+    with engine.begin() as conn:
+        batch = []
+        for i in range(1, args.jobs + 1):
+            skills = rng.sample(WORDS, 5)
+            batch.append({"id": i, "recruiter_id": 1, "title": f"{rng.choice(WORDS).title()} Engineer",
+                          "description": " ".join(rng.choice(filler) for _ in range(110)) + " " + " ".join(skills),
+                          "requirements": {"required_skills": skills}, "required_skills": ",".join(skills)})
+            if len(batch) >= 2000:
+                conn.execute(Job.__table__.insert(), batch)
+                batch = []
+        if batch:
+            conn.execute(Job.__table__.insert(), batch)
+    print(f"Inserted and indexed {args.jobs} jobs in {time.perf_counter() - t0:.1f}s\n")
+
+    results = []
+    print(f"{'query':<26}{'hits':>6}{'p50 ms':>9}{'p95 ms':>9}")
+    with SessionLocal() as db:
+        for q in QUERIES:
+            times = []
+            for _ in range(args.repeat):
+                t = time.perf_counter()
+                hits = search_jobs(db, q, limit=20, rerank=False)
+                times.append((time.perf_counter() - t) * 1e3)
+            times.sort()
+            p50, p95 = times[len(times) // 2], times[min(len(times) - 1, int(len(times) * 0.95))]
+            results.append({"query": q, "hits": len(hits), "p50_ms": p50, "p95_ms": p95})
+            print(f"{q:<26}{len(hits):>6}{p50:>9.2f}{p95:>9.2f}")
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump({"jobs": args.jobs, "results": results}, f, indent=2)
+    engine.dispose()
+    shutil.rmtree(workdir, ignore_errors=True)
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+Login-burst throughput benchmark for the bounded password hashing pool.
+
+Registers a user in a throwaway SQLite database, then fires `--concurrency`
+simultaneous logins at the ASGI app (in-process, via httpx) while probing
+`/health` to see how much the burst delays unrelated requests. Runs once with
+the pool disabled (legacy: hashing on the shared request threadpool) and once
+with the bounded pool.
+
+Usage:
+    python benchmarks/bench_login.py --logins 200 --concurrency 50 --rounds 20000
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+
+def _pct(values, p):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(p / 100.0 * (len(values) - 1))))]
+
+
+async def _burst(app, n_logins, concurrency, email, password):
+    import httpx
+
+    transport = httpx.ASGITransport(app=app)
+    latencies, health_latencies, statuses = [], [], {}
+    sem = asyncio.Semaphore(concurrency)
+    done = asyncio.Event()
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        async def one_login():
+            async with sem:
+                t0 = time.perf_counter()
+                r = await client.post("/api/users/login", json={"email": email, "password": password})
+                latencies.append(time.perf_counter() - t0)
+                statuses[r.status_code] = statuses.get(r.status_code, 0) + 1
+
+        async def probe_health():
+            while not done.is_set():
+                t0 = time.perf_counter()
+                await client.get("/health")
+                health_latencies.append(time.perf_counter() - t0)
+                await asyncio.sleep(0.01)
+
+        prober = asyncio.create_task(probe_health())
+        t0 = time.perf_counter()
+        await asyncio.gather(*(one_login() for _ in range(n_logins)))
+        elapsed = time.perf_counter() - t0
+        done.set()
+        await prober
+
+    ok = statuses.get(200, 0)
+    return {
+        "elapsed_seconds": elapsed,
+        "logins_per_second": ok / elapsed if elapsed else 0.0,
+        "p50_ms": _pct(latencies, 50) * 1e3,
+        "p95_ms": _pct(latencies, 95) * 1e3,
+        "health_p95_ms": _pct(health_latencies, 95) * 1e3,
+        "health_mean_ms": (statistics.mean(health_latencies) * 1e3) if health_latencies else 0.0,
+        "statuses": statuses,
+    }
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--logins", type=int, default=200)
+    ap.add_argument("--concurrency", type=int, default=50)
+    ap.add_argument("--rounds", type=int, default=None, help="sha256_crypt rounds (default: passlib default)")
+    ap.add_argument("--workers", type=int, default=None, help="pool size for the 'after' run")
+    ap.add_argument("--json", dest="json_path", default=None, help="write results to this file")
+    args = ap.parse_args(argv)
+
+    workdir = tempfile.mkdtemp(prefix="sm_bench_")
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(workdir, 'bench.db')}"
+    if args.rounds:
+        os.environ["PASSWORD_HASH_ROUNDS"] = str(args.rounds)
+
+    from backend import auth
+    from backend.models import engine, init_db, SessionLocal, User
+    from backend.main import app
+
+    init_db()
+    email, password = "bench@example.com", "benchmark-password"
+    with SessionLocal() as db:
+        db.add(User(email=email, password_hash=auth.get_password_hash(password), role="candidate", full_name="Bench"))
+        db.commit()
+
+    pool_workers = args.workers if args.workers is not None else auth.PASSWORD_HASH_WORKERS
+    results = []
+    print(f"{'mode':<8}{'login/s':>9}{'p50 ms':>9}{'p95 ms':>9}{'health p95':>12}  statuses")
+    for mode, workers in (("before", 0), ("after", pool_workers)):
+        auth.PASSWORD_HASH_WORKERS = workers
+        auth._hash_executor = None
+        res = asyncio.run(_burst(app, args.logins, args.concurrency, email, password))
+        res["mode"] = mode
+        res["workers"] = workers
+        results.append(res)
+        print(f"{mode:<8}{res['logins_per_second']:>9.1f}{res['p50_ms']:>9.1f}{res['p95_ms']:>9.1f}{res['health_p95_ms']:>12.1f}  {res['statuses']}")
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump({"logins": args.logins, "concurrency": args.concurrency, "results": results}, f, indent=2)
+    engine.dispose()
+    shutil.rmtree(workdir, ignore_errors=True)
+    return results
+
+
+if __name__ == "__main__":
+    main()
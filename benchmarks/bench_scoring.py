@@ -0,0 +1,314 @@
+"""
+Benchmark suite for the scoring, parsing and API hot paths.
+
+Builds a synthetic job catalog and resume corpus (sizes configurable) in a
+throwaway database and times, call by call:
+
+    score_job_application      ml.scoring_service, job/application dicts
+    match_required_skills      ml.scoring_service
+    explain_job_application    ml.scoring_service
+    exp_years_match            ml.scoring_service
+    parser                     backend.utils.parser.extract_text_and_fingerprint
+    api_score                  POST /api/applications/score (TestClient)
+    api_apply                  POST /api/applications/apply
+    api_recruiter_applications GET  /api/applications/recruiter/applications
+
+Each case runs --runs times with --iterations calls per run (after
+--warmup untimed calls). The JSON result has, per case, p50/p95/p99/mean
+latency over all calls, throughput, the p50 and throughput of every run
+(benchmarks/compare_results.py uses them as repeated measurements), the
+peak Python allocation of one extra traced pass (tracemalloc) and the peak
+RSS of the process at the end of the case.
+
+The embedding backend defaults to the offline hash encoder so results
+measure this code rather than the model; pass --backend torch (or onnx)
+to include model inference.
+
+Usage:
+    python benchmarks/bench_scoring.py --json results.json
+    python benchmarks/bench_scoring.py --jobs 1000 --applications 5000 --runs 10 --cases api_score parser
+"""
+
+import argparse
+import datetime
+import io
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+SKILLS = (
+    "Python", "React", "Docker", "Kubernetes", "FastAPI", "SQLAlchemy", "AWS", "Terraform", "Java", "Spring",
+    "Node.js", "TypeScript", "PostgreSQL", "Redis", "Kafka", "Spark", "Airflow", "pandas", "NumPy", "PyTorch",
+    "machine learning", "C++", "Go", "Rust", "GraphQL", "CI/CD", "Linux", "Azure", "GCP", "Elasticsearch",
+)
+FILLER = (
+    "built led shipped designed migrated scaled owned reduced latency across teams services platform "
+    "customers data pipelines reliability on-call mentoring roadmap stakeholders production features"
+).split()
+DEGREES = ("B.Sc. in Computer Science", "Master of Science in Data Science", "B.Tech in Information Technology", "PhD in Physics")
+
+CASES = (
+    "score_job_application",
+    "match_required_skills",
+    "explain_job_application",
+    "exp_years_match",
+    "parser",
+    "api_score",
+    "api_apply",
+    "api_recruiter_applications",
+)
+
+
+def job_corpus(n, rng):
+    jobs = []
+    for i in range(n):
+        skills = rng.sample(SKILLS, rng.randint(2, 6))
+        description = " ".join(rng.choice(FILLER + [s.lower() for s in skills]) for _ in range(rng.randint(40, 160)))
+        jobs.append({
+            "title": f"{rng.choice(skills)} Engineer {i}",
+            "description": description,
+            "requirements": {"required_skills": skills, "min_experience": rng.randint(0, 8)},
+        })
+    return jobs
+
+
+def resume_corpus(n, rng):
+    """Resume texts with skills, date ranges, a years claim and a degree."""
+    resumes = []
+    for _ in range(n):
+        lines = [f"Software engineer with {rng.randint(1, 15)} years of experience."]
+        year = rng.randint(2005, 2016)
+        for _ in range(rng.randint(2, 5)):
+            end = year + rng.randint(1, 4)
+            skills = ", ".join(rng.sample(SKILLS, rng.randint(2, 5)))
+            lines.append(f"Engineer, Company {rng.randint(1, 999)} ({year} - {end}). "
+                         + " ".join(rng.choice(FILLER) for _ in range(rng.randint(15, 60))) + f". Used {skills}.")
+            year = end
+        lines.append(f"{rng.choice(DEGREES)}, {rng.randint(2000, 2020)}.")
+        lines.append("Skills: " + ", ".join(rng.sample(SKILLS, rng.randint(4, 10))))
+        resumes.append("\n".join(lines))
+    return resumes
+
+
+def _rss_mb():
+    """(current RSS, peak RSS) of this process in MB."""
+    try:
+        with open("/proc/self/status", encoding="ascii") as f:
+            fields = dict(line.split(":", 1) for line in f if ":" in line)
+        return int(fields["VmRSS"].split()[0]) / 1024, int(fields["VmHWM"].split()[0]) / 1024
+    except (OSError, KeyError):
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+        return peak, peak
+
+
+def _reset_peak_rss():
+    """Reset VmHWM to the current RSS (Linux); a no-op elsewhere."""
+    try:
+        with open("/proc/self/clear_refs", "w", encoding="ascii") as f:
+            f.write("5")
+    except OSError:
+        pass
+
+
+def percentile(sorted_values, q):
+    """Linear-interpolated percentile (0-100) of an ascending list."""
+    if not sorted_values:
+        return None
+    k = (len(sorted_values) - 1) * q / 100.0
+    lo = int(k)
+    hi = min(lo + 1, len(sorted_values) - 1)
+    return sorted_values[lo] + (sorted_values[hi] - sorted_values[lo]) * (k - lo)
+
+
+def run_case(fn, runs, iterations, warmup):
+    """Time `fn(i)` for i in 0..; returns the stats dict for one case."""
+    for i in range(warmup):
+        fn(i)
+    _reset_peak_rss()
+    samples, run_p50, run_throughput = [], [], []
+    call = warmup
+    for _ in range(runs):
+        times = []
+        t_run = time.perf_counter()
+        for _ in range(iterations):
+            t0 = time.perf_counter()
+            fn(call)
+            times.append((time.perf_counter() - t0) * 1e3)
+            call += 1
+        elapsed = time.perf_counter() - t_run
+        samples.extend(times)
+        run_p50.append(statistics.median(times))
+        run_throughput.append(iterations / elapsed if elapsed > 0 else None)
+    _, peak_rss = _rss_mb()
+
+    tracemalloc.start()
+    for _ in range(min(iterations, 10)):
+        fn(call)
+        call += 1
+    _, alloc_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    ordered = sorted(samples)
+    return {
+        "calls": len(samples),
+        "runs": runs,
+        "p50_ms": percentile(ordered, 50),
+        "p95_ms": percentile(ordered, 95),
+        "p99_ms": percentile(ordered, 99),
+        "mean_ms": statistics.fmean(samples),
+        "stdev_ms": statistics.stdev(samples) if len(samples) > 1 else 0.0,
+        "throughput_per_s": statistics.fmean([t for t in run_throughput if t]),
+        "run_p50_ms": run_p50,
+        "run_throughput_per_s": run_throughput,
+        "peak_alloc_mb": alloc_peak / 1e6,
+        "peak_rss_mb": peak_rss,
+    }
+
+
+def setup_api(client, jobs, resumes, n_applications, rng):
+    """Create users and jobs through the API, bulk insert applications. Returns (headers, candidate_id, job_ids)."""
+    from backend.models import Application, engine
+    from backend.utils.profile import extract_profile
+
+    def login(email, role):
+        client.post("/api/users/register", json={"email": email, "password": "bench-pw", "role": role, "full_name": email.split("@")[0]})
+        r = client.post("/api/users/login", json={"email": email, "password": "bench-pw"})
+        r.raise_for_status()
+        body = r.json()
+        return {"Authorization": f"Bearer {body['access_token']}"}, body["user"]["id"]
+
+    headers, _ = login("recruiter@bench.example", "recruiter")
+    _, candidate_id = login("candidate@bench.example", "candidate")
+    job_ids = []
+    for job in jobs:
+        r = client.post("/api/jobs/", json=job, headers=headers)
+        r.raise_for_status()
+        job_ids.append(r.json()["id"])
+
+    profiles = [extract_profile(text) for text in resumes]
+    rows = []
+    for i in range(n_applications):
+        k = i % len(resumes)
+        rows.append({"job_id": rng.choice(job_ids), "candidate_id": candidate_id, "resume_path": f"resumes/bench_{i}.txt",
+                     "resume_text": resumes[k], "score": rng.random(), "status": "applied",
+                     "explanation": {"reasons": []}, "fingerprint": f"bench-{k}", **profiles[k]})
+    with engine.begin() as conn:
+        for start in range(0, len(rows), 1000):
+            conn.execute(Application.__table__.insert(), rows[start:start + 1000])
+    return headers, candidate_id, job_ids
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--jobs", type=int, default=200, help="jobs in the synthetic catalog")
+    ap.add_argument("--resumes", type=int, default=50, help="distinct synthetic resumes")
+    ap.add_argument("--applications", type=int, default=1000, help="applications for the recruiter listing")
+    ap.add_argument("--runs", type=int, default=5, help="repeated runs per case")
+    ap.add_argument("--iterations", type=int, default=30, help="calls per run")
+    ap.add_argument("--warmup", type=int, default=3, help="untimed calls before each case")
+    ap.add_argument("--cases", nargs="+", default=list(CASES), choices=list(CASES))
+    ap.add_argument("--backend", default=os.getenv("EMBEDDING_BACKEND", "hash"), help="embedding backend (default hash)")
+    ap.add_argument("--seed", type=int, default=42)
+    ap.add_argument("--json", dest="json_path", default=None, help="write results to this file")
+    args = ap.parse_args(argv)
+
+    workdir = tempfile.mkdtemp(prefix="sm_bench_scoring_")
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(workdir, 'bench.db')}"
+    os.environ["EMBEDDING_BACKEND"] = args.backend
+    os.environ["RETENTION_INTERVAL_SECONDS"] = "0"
+    os.environ["WARMUP_ON_STARTUP"] = "0"
+    cwd = os.getcwd()
+    os.chdir(workdir)  # uploaded resumes go to ./resumes
+    os.makedirs("resumes", exist_ok=True)
+
+    from fastapi.testclient import TestClient
+    from backend.main import app
+    from backend.utils import parser
+    from ml import scoring_service as ss
+
+    rng = random.Random(args.seed)
+    jobs = job_corpus(args.jobs, rng)
+    resumes = resume_corpus(args.resumes, rng)
+    applications = [{"resume_text": text} for text in resumes]
+    resume_files = []
+    for i, text in enumerate(resumes):
+        path = os.path.join(workdir, f"resume_{i}.txt")
+        # every fourth file is UTF-16 to exercise the decoding fallbacks
+        with open(path, "w", encoding="utf-16" if i % 4 == 3 else "utf-8") as f:
+            f.write(text)
+        resume_files.append(path)
+
+    results = {}
+    try:
+        with TestClient(app) as client:
+            t0 = time.perf_counter()
+            headers, candidate_id, job_ids = setup_api(client, jobs, resumes, args.applications, rng)
+            print(f"backend {args.backend}: {len(job_ids)} jobs, {len(resumes)} resumes, "
+                  f"{args.applications} applications set up in {time.perf_counter() - t0:.1f}s")
+
+            def pair(i):
+                return jobs[i % len(jobs)], applications[(i * 7) % len(applications)]
+
+            def upload(i):
+                return {"resume": (f"r{i}.txt", io.BytesIO(resumes[i % len(resumes)].encode("utf-8")), "text/plain")}
+
+            def api_score(i):
+                client.post("/api/applications/score", params={"top_k": 10}, files=upload(i)).raise_for_status()
+
+            def api_apply(i):
+                client.post("/api/applications/apply", data={"job_id": job_ids[i % len(job_ids)], "candidate_id": candidate_id},
+                            files=upload(i)).raise_for_status()
+
+            def api_listing(i):
+                client.get("/api/applications/recruiter/applications", headers=headers).raise_for_status()
+
+            fns = {
+                "score_job_application": lambda i: ss.score_job_application(*pair(i)),
+                "match_required_skills": lambda i: ss.match_required_skills(
+                    pair(i)[0]["requirements"]["required_skills"], pair(i)[1]["resume_text"]),
+                "explain_job_application": lambda i: ss.explain_job_application(*pair(i)),
+                "exp_years_match": lambda i: ss.exp_years_match(pair(i)[0]["requirements"]["min_experience"], pair(i)[1]),
+                "parser": lambda i: parser.extract_text_and_fingerprint(resume_files[i % len(resume_files)]),
+                "api_score": api_score,
+                "api_apply": api_apply,
+                "api_recruiter_applications": api_listing,
+            }
+
+            print(f"\n{'case':<28}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'ops/s':>9}{'alloc MB':>10}{'RSS MB':>8}")
+            for name in args.cases:
+                r = results[name] = run_case(fns[name], args.runs, args.iterations, args.warmup)
+                print(f"{name:<28}{r['p50_ms']:>9.2f}{r['p95_ms']:>9.2f}{r['p99_ms']:>9.2f}"
+                      f"{r['throughput_per_s']:>9.1f}{r['peak_alloc_mb']:>10.2f}{r['peak_rss_mb']:>8.0f}")
+    finally:
+        os.chdir(cwd)
+        from backend.models import engine
+        engine.dispose()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    report = {
+        "suite": "scoring",
+        "created_at": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "config": {"backend": args.backend, "jobs": args.jobs, "resumes": args.resumes, "applications": args.applications,
+                   "runs": args.runs, "iterations": args.iterations, "warmup": args.warmup, "seed": args.seed},
+        "cases": results,
+    }
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    return report
+
+
+if __name__ == "__main__":
+    main()
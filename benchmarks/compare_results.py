@@ -0,0 +1,204 @@
+"""
+Compare two bench_scoring.py result files and gate on regressions.
+
+For every case present in both files:
+
+    latency   the per-run p50s of each file are treated as repeated
+              measurements; the relative change of their medians gets a
+              bootstrap confidence interval (--confidence, resampling the
+              runs), widened by the standard error of each median implied
+              by the per-call spread (stdev_ms, capped by the p50..p95
+              spread, over calls). Runs of one
+              invocation share a process, so the bootstrap alone misses
+              between-invocation noise; the widening keeps jittery cases
+              from gating on a few lucky runs. A case regresses when the
+              whole interval lies above +--latency-threshold. With fewer
+              than --min-runs runs in either file the latency verdict is
+              "inconclusive": reported, warned about, never a failure.
+    memory    peak Python allocation and peak RSS; a case regresses when
+              either grows by more than --memory-threshold and by more
+              than --memory-min-mb (single measurements, so small absolute
+              changes are ignored as noise).
+
+Prints (and with --markdown writes) a compact markdown table and exits 1
+when any case regressed, 0 otherwise.
+
+Usage:
+    python benchmarks/compare_results.py baseline.json candidate.json
+    python benchmarks/compare_results.py old.json new.json --latency-threshold 0.10 --markdown report.md
+"""
+
+import argparse
+import json
+import math
+import random
+import statistics
+import sys
+
+BOOTSTRAP_SAMPLES = 2000
+# standard error of a median is about this times that of a mean (normal data)
+MEDIAN_SE_FACTOR = math.sqrt(math.pi / 2)
+P95_Z = statistics.NormalDist().inv_cdf(0.95)
+MEMORY_METRICS = (("peak_alloc_mb", "alloc"), ("peak_rss_mb", "RSS"))
+
+
+def _runs(case):
+    runs = [v for v in case.get("run_p50_ms") or [] if v is not None]
+    return runs or [case["p50_ms"]]
+
+
+def relative_change_ci(base, new, confidence=0.95, samples=BOOTSTRAP_SAMPLES, seed=0):
+    """(estimate, low, high) of median(new) / median(base) - 1.
+
+    The interval comes from resampling both sets of runs with replacement;
+    low/high are None when either side has a single run.
+    """
+    estimate = statistics.median(new) / statistics.median(base) - 1.0
+    if len(base) < 2 or len(new) < 2:
+        return estimate, None, None
+    rng = random.Random(seed)
+    deltas = sorted(
+        statistics.median(rng.choices(new, k=len(new))) / statistics.median(rng.choices(base, k=len(base))) - 1.0
+        for _ in range(samples)
+    )
+    tail = (1.0 - confidence) / 2
+    return estimate, deltas[int(tail * (samples - 1))], deltas[int((1 - tail) * (samples - 1))]
+
+
+def call_noise(case):
+    """Relative standard error of a case's p50 implied by its per-call spread.
+
+    The spread is stdev_ms, capped by the normal-equivalent p50..p95 spread
+    so a handful of GC pauses in a long tail don't swamp it.
+    """
+    calls, stdev, p50 = case.get("calls") or 0, case.get("stdev_ms") or 0.0, case.get("p50_ms") or 0.0
+    if calls < 2 or p50 <= 0:
+        return 0.0
+    if case.get("p95_ms") is not None:
+        stdev = min(stdev, (case["p95_ms"] - p50) / P95_Z)
+    return MEDIAN_SE_FACTOR * stdev / p50 / math.sqrt(calls)
+
+
+def compare_case(base, new, args):
+    """Verdict and deltas for one case present in both files."""
+    estimate, low, high = relative_change_ci(_runs(base), _runs(new), args.confidence)
+    z = statistics.NormalDist().inv_cdf(0.5 + args.confidence / 2)
+    margin = z * math.hypot(call_noise(base), call_noise(new))
+    low = (estimate if low is None else low) - margin
+    high = (estimate if high is None else high) + margin
+    runs = min(len(_runs(base)), len(_runs(new)))
+    inconclusive = runs < args.min_runs
+    slower = not inconclusive and low > args.latency_threshold
+    faster = not inconclusive and high < -args.latency_threshold
+    row = {
+        "p50_base_ms": base["p50_ms"],
+        "p50_new_ms": new["p50_ms"],
+        "p50_change": estimate,
+        "p50_ci": [low, high],
+        "runs": runs,
+        "p95_change": new["p95_ms"] / base["p95_ms"] - 1.0 if base.get("p95_ms") and new.get("p95_ms") else None,
+        "regressions": [],
+        "improvements": [],
+    }
+    if slower:
+        row["regressions"].append("latency")
+    elif faster:
+        row["improvements"].append("latency")
+    for key, label in MEMORY_METRICS:
+        b, n = base.get(key), new.get(key)
+        if b is None or n is None:
+            continue
+        change = n / b - 1.0 if b > 0 else (0.0 if n == 0 else float("inf"))
+        row[f"{key}_change"] = change
+        if abs(n - b) < args.memory_min_mb:
+            continue
+        if change > args.memory_threshold:
+            row["regressions"].append(label)
+        elif change < -args.memory_threshold:
+            row["improvements"].append(label)
+    if row["regressions"]:
+        row["verdict"] = "regression"
+    elif inconclusive:
+        row["verdict"] = "inconclusive"
+    else:
+        row["verdict"] = "improvement" if row["improvements"] else "unchanged"
+    return row
+
+
+def _pct(value):
+    return "n/a" if value is None else f"{value * 100:+.1f}%"
+
+
+def markdown_table(rows, missing, added, args):
+    lines = [
+        f"| case | p50 base ms | p50 new ms | Δ p50 ({args.confidence:.0%} CI) | Δ p95 | Δ alloc | Δ RSS | verdict |",
+        "|---|---:|---:|---|---:|---:|---:|---|",
+    ]
+    for name, r in rows.items():
+        ci = f" [{_pct(r['p50_ci'][0])}, {_pct(r['p50_ci'][1])}]"
+        verdict = r["verdict"]
+        if r["regressions"] or r["improvements"]:
+            verdict += f" ({', '.join(r['regressions'] or r['improvements'])})"
+        elif verdict == "inconclusive":
+            verdict += f" ({r['runs']} runs)"
+        lines.append(f"| {name} | {r['p50_base_ms']:.2f} | {r['p50_new_ms']:.2f} | {_pct(r['p50_change'])}{ci} "
+                     f"| {_pct(r['p95_change'])} | {_pct(r.get('peak_alloc_mb_change'))} "
+                     f"| {_pct(r.get('peak_rss_mb_change'))} | {'**' + verdict + '**' if r['regressions'] else verdict} |")
+    for name in missing:
+        lines.append(f"| {name} | | | | | | | missing in candidate |")
+    for name in added:
+        lines.append(f"| {name} | | | | | | | new |")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("baseline")
+    ap.add_argument("candidate")
+    ap.add_argument("--latency-threshold", type=float, default=0.05, help="relative p50 slowdown to tolerate (default 0.05)")
+    ap.add_argument("--memory-threshold", type=float, default=0.10, help="relative memory growth to tolerate (default 0.10)")
+    ap.add_argument("--memory-min-mb", type=float, default=1.0, help="ignore memory changes smaller than this (default 1 MB)")
+    ap.add_argument("--confidence", type=float, default=0.95)
+    ap.add_argument("--min-runs", type=int, default=5,
+                    help="runs per file needed for a latency verdict (default 5, bench_scoring.py's default)")
+    ap.add_argument("--markdown", dest="markdown_path", default=None, help="also write the table to this file")
+    ap.add_argument("--json", dest="json_path", default=None, help="write the comparison to this file")
+    args = ap.parse_args(argv)
+
+    with open(args.baseline, encoding="utf-8") as f:
+        base = json.load(f)
+    with open(args.candidate, encoding="utf-8") as f:
+        new = json.load(f)
+
+    differing = sorted(k for k in set(base.get("config", {})) | set(new.get("config", {}))
+                       if base.get("config", {}).get(k) != new.get("config", {}).get(k))
+    if differing:
+        print(f"warning: benchmark config differs ({', '.join(differing)}); results may not be comparable", file=sys.stderr)
+
+    rows = {name: compare_case(base["cases"][name], new["cases"][name], args)
+            for name in base["cases"] if name in new["cases"]}
+    missing = [name for name in base["cases"] if name not in new["cases"]]
+    added = [name for name in new["cases"] if name not in base["cases"]]
+
+    short = [name for name, r in rows.items() if r["runs"] < args.min_runs]
+    if short:
+        print(f"warning: fewer than {args.min_runs} runs for {', '.join(short)}; latency not gated "
+              f"(rerun bench_scoring.py with --runs {args.min_runs} or more)", file=sys.stderr)
+
+    table = markdown_table(rows, missing, added, args)
+    print(table)
+    regressed = [name for name, r in rows.items() if r["regressions"]]
+    print(f"\n{len(regressed)} regression(s)" + (f": {', '.join(regressed)}" if regressed else ""))
+
+    if args.markdown_path:
+        with open(args.markdown_path, "w", encoding="utf-8") as f:
+            f.write(table + "\n")
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump({"baseline": args.baseline, "candidate": args.candidate, "cases": rows,
+                       "missing": missing, "added": added, "regressions": regressed}, f, indent=2)
+    return 1 if regressed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,158 @@
+# Chunked embedding of long documents.
+#
+# all-MiniLM-L6-v2 only sees the first 256 word pieces of its input, so a
+# plain encode() of a resume or job description ignores everything after
+# roughly the first page. embed_documents() instead splits each text into
+# overlapping windows that fit the model (word boundaries, sized with the
+# encoder's own tokenizer), encodes the windows of all documents together in
+# length-sorted batches so each batch pads to a similar length, and pools
+# each document's window vectors (token-weighted mean, L2-normalized) into
+# one document vector. The window vectors and their character spans are kept
+# on the result for passage-level explanations.
+#
+# A text that fits in one window is encoded exactly as before, so short
+# texts (and encoders without a length limit) get unchanged vectors.
+import os
+import re
+
+import numpy as np
+
+CHUNK_OVERLAP_TOKENS = int(os.getenv("CHUNK_OVERLAP_TOKENS", "32"))
+CHUNK_BATCH_SIZE = int(os.getenv("CHUNK_BATCH_SIZE", "32"))
+# upper bound on windows per document (~16k word pieces at the default window)
+MAX_CHUNKS_PER_DOCUMENT = int(os.getenv("MAX_CHUNKS_PER_DOCUMENT", "64"))
+
+_WORD_RE = re.compile(r"\S+")
+
+
+class DocumentEmbedding:
+    """Pooled vector of one document plus the vectors of its windows.
+
+    `spans[i]` is the (start, end) character range of window i in the
+    original text, `token_counts[i]` its length in word pieces and
+    `chunk_vectors[i]` its unit vector.
+    """
+
+    __slots__ = ("vector", "chunk_vectors", "spans", "token_counts")
+
+    def __init__(self, vector, chunk_vectors, spans, token_counts):
+        self.vector = vector
+        self.chunk_vectors = chunk_vectors
+        self.spans = spans
+        self.token_counts = token_counts
+
+    def __len__(self):
+        return len(self.spans)
+
+    def passages(self, text, query_vec, top_k=3):
+        """The `top_k` windows most similar to `query_vec`, best first."""
+        if not self.spans or query_vec is None:
+            return []
+        sims = self.chunk_vectors @ np.asarray(query_vec, dtype=np.float32).reshape(-1)
+        order = np.argsort(-sims)[:top_k]
+        return [{"start": self.spans[i][0], "end": self.spans[i][1], "similarity": float(sims[i]),
+                 "text": text[self.spans[i][0]:self.spans[i][1]]} for i in order]
+
+
+def window_bounds(word_tokens, window, overlap=CHUNK_OVERLAP_TOKENS):
+    """Split a sequence of per-word token counts into overlapping windows.
+
+    Returns (first_word, end_word, n_tokens) triples. Each window holds as
+    many whole words as fit in `window` tokens (at least one word); the next
+    window starts early enough to repeat about `overlap` tokens.
+    """
+    n = len(word_tokens)
+    bounds = []
+    start = 0
+    while start < n:
+        total = 0
+        end = start
+        while end < n and (end == start or total + word_tokens[end] <= window):
+            total += word_tokens[end]
+            end += 1
+        bounds.append((start, end, total))
+        if end >= n:
+            break
+        back = 0
+        nxt = end
+        while nxt > start + 1 and back + word_tokens[nxt - 1] <= overlap:
+            nxt -= 1
+            back += word_tokens[nxt]
+        start = nxt
+    return bounds
+
+
+def split_documents(texts, encoder, window=None, overlap=CHUNK_OVERLAP_TOKENS):
+    """Per text, a list of (start_char, end_char, n_tokens) windows.
+
+    Token counts come from `encoder.count_tokens`, called once per distinct
+    word across all texts. With no window (encoder without a length limit)
+    or a text that fits, the text is a single window.
+    """
+    window = window or encoder.max_tokens
+    words_per_text = [[(m.start(), m.end()) for m in _WORD_RE.finditer(t or "")] for t in texts]
+    if not window:
+        return [[(0, len(t or ""), len(w))] if w else [] for t, w in zip(texts, words_per_text)]
+
+    distinct = sorted({t[a:b] for t, words in zip(texts, words_per_text) for a, b in words})
+    cost = dict(zip(distinct, encoder.count_tokens(distinct))) if distinct else {}
+    out = []
+    for text, words in zip(texts, words_per_text):
+        if not words:
+            out.append([])
+            continue
+        counts = [max(1, cost[text[a:b]]) for a, b in words]
+        if sum(counts) <= window:
+            out.append([(0, len(text), sum(counts))])
+            continue
+        bounds = window_bounds(counts, window, overlap)[:MAX_CHUNKS_PER_DOCUMENT]
+        out.append([(words[first][0], words[end - 1][1], n) for first, end, n in bounds])
+    return out
+
+
+def embed_documents(texts, encoder, window=None, overlap=CHUNK_OVERLAP_TOKENS, batch_size=CHUNK_BATCH_SIZE,
+                    sort_by_length=True):
+    """DocumentEmbedding for each text (empty texts get a zero vector and no windows).
+
+    `window` defaults to the encoder's max_tokens; `sort_by_length=False`
+    batches windows in document order (for benchmarking the padding cost).
+    """
+    texts = [t or "" for t in texts]
+    windows = split_documents(texts, encoder, window, overlap)
+    # every window of every document, longest first, so each batch holds
+    # windows of similar length and pads little
+    flat = [(n, d, j) for d, spans in enumerate(windows) for j, (_, _, n) in enumerate(spans)]
+    if sort_by_length:
+        flat.sort(key=lambda item: -item[0])
+    vectors = [np.zeros((len(spans), encoder.dim), dtype=np.float32) for spans in windows]
+    for start in range(0, len(flat), batch_size):
+        batch = flat[start:start + batch_size]
+        chunk_texts = [texts[d][windows[d][j][0]:windows[d][j][1]] for _, d, j in batch]
+        encoded = np.asarray(encoder.encode(chunk_texts, batch_size=len(batch)), dtype=np.float32)
+        for (_, d, j), vec in zip(batch, encoded):
+            vectors[d][j] = vec
+
+    out = []
+    for spans, chunk_vecs in zip(windows, vectors):
+        if not spans:
+            out.append(DocumentEmbedding(np.zeros(encoder.dim, dtype=np.float32), chunk_vecs, [], []))
+            continue
+        if len(spans) == 1:
+            # the whole text in one window: keep the encoder's vector as is
+            out.append(DocumentEmbedding(chunk_vecs[0], chunk_vecs, [spans[0][:2]], [spans[0][2]]))
+            continue
+        norms = np.linalg.norm(chunk_vecs, axis=1, keepdims=True)
+        chunk_vecs = chunk_vecs / np.where(norms > 0, norms, 1.0)
+        counts = np.array([n for _, _, n in spans], dtype=np.float32)
+        pooled = (chunk_vecs * counts[:, None]).sum(axis=0) / counts.sum()
+        norm = float(np.linalg.norm(pooled))
+        out.append(DocumentEmbedding(pooled / norm if norm > 0 else pooled, chunk_vecs,
+                                     [(a, b) for a, b, _ in spans], [n for _, _, n in spans]))
+    return out
+
+
+def padding_stats(token_counts, batch_size=CHUNK_BATCH_SIZE, sort=True):
+    """(real tokens, padded tokens) when `token_counts` windows are batched."""
+    counts = sorted(token_counts, reverse=True) if sort else list(token_counts)
+    padded = sum(max(counts[i:i + batch_size]) * len(counts[i:i + batch_size]) for i in range(0, len(counts), batch_size))
+    return sum(counts), padded
@@ -0,0 +1,244 @@
+# Precompiled per-job and per-resume scoring state.
+#
+# A JobContext holds everything scoring derives from a job -- skill list,
+# the lexical SkillMatcher, skill vectors as one L2-normalized float32 matrix
+# and the description vector -- so it is computed once per job version
+# instead of on every score_job_application call. Contexts live in a
+# process-wide LRU cache keyed by job id; an entry is reused only while its
+# content version matches and is dropped by invalidate_job_context() when the
+# job changes.
+#
+# A ResumeContext is the resume-side counterpart, built once per upload:
+# normalized text, sentence splits, experience and (lazily) the resume and
+# sentence embeddings, so scoring one resume against N jobs does the
+# resume-side work exactly once.
+from collections import OrderedDict
+import hashlib
+import json
+import os
+import re
+import threading
+
+import numpy as np
+
+try:
+    from ml.experience import experience_for
+    from ml.skill_matcher import get_skill_matcher, normalize_text_for_matching
+except ImportError:
+    from experience import experience_for
+    from skill_matcher import get_skill_matcher, normalize_text_for_matching
+
+JOB_CONTEXT_CACHE_SIZE = int(os.getenv("JOB_CONTEXT_CACHE_SIZE", "10000"))
+
+_SENTENCE_SPLIT_RE = re.compile(r"(?<=[.!?\n])\s+")
+
+
+def unit_vector(vec):
+    """float32 copy of `vec` scaled to unit length (zeros stay zeros)."""
+    v = np.asarray(vec, dtype=np.float32).reshape(-1)
+    norm = float(np.linalg.norm(v))
+    return v / norm if norm > 0 else v
+
+
+def job_content_version(description, requirements, *extra):
+    """Stable hash of the job fields scoring depends on."""
+    h = hashlib.sha1()
+    h.update((description or "").encode("utf-8", "ignore"))
+    h.update(json.dumps(requirements or {}, sort_keys=True, default=str).encode("utf-8"))
+    for part in extra:
+        h.update(repr(part).encode("utf-8"))
+    return h.hexdigest()
+
+
+class JobContext:
+    """Compiled, read-mostly scoring view of one job.
+
+    `skill_vectors` rows are unit vectors for skills whose embedding was
+    stored (`skill_precomputed`); missing rows are embedded once, on first
+    semantic use, by `ensure_skill_vectors`.
+    """
+
+    def __init__(self, description, requirements=None, skill_embeddings=None, description_embedding=None, job_id=None, version=None):
+        self.job_id = job_id
+        self.description = description or ""
+        self.requirements = dict(requirements or {})
+        self.skills = list(self.requirements.get("required_skills", []) or [])
+        self.min_experience = self.requirements.get("min_experience", 0) or 0
+        self.version = version or job_content_version(self.description, self.requirements)
+        self.matcher = get_skill_matcher(self.skills)
+
+        n = len(self.skills)
+        self.skill_precomputed = np.zeros(n, dtype=bool)
+        self.skill_vectors = None
+        if skill_embeddings is not None and len(skill_embeddings) > 0 and n:
+            rows = [None] * n
+            for i in range(min(n, len(skill_embeddings))):
+                if skill_embeddings[i] is not None:
+                    rows[i] = unit_vector(skill_embeddings[i])
+            dim = next((r.shape[0] for r in rows if r is not None), 0)
+            if dim:
+                self.skill_vectors = np.zeros((n, dim), dtype=np.float32)
+                for i, r in enumerate(rows):
+                    if r is not None and r.shape[0] == dim:
+                        self.skill_vectors[i] = r
+                        self.skill_precomputed[i] = True
+        self._skill_has_vector = self.skill_precomputed.copy()
+        self._description_vector = unit_vector(description_embedding) if description_embedding is not None else None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_job(cls, job):
+        """Build from the job dict shape scoring has always accepted."""
+        return cls(
+            job.get("description", ""),
+            job.get("requirements", {}) or {},
+            skill_embeddings=job.get("skill_embeddings"),
+            description_embedding=job.get("embedding"),
+            job_id=job.get("id"),
+        )
+
+    def description_vector(self, embed_fn):
+        """Unit description vector; embedded once if none was stored."""
+        if self._description_vector is None:
+            self._description_vector = unit_vector(embed_fn(self.description))
+        return self._description_vector
+
+    def ensure_skill_vectors(self, embed_fn):
+        """Fill rows for skills without a stored vector (once). Returns the matrix or None."""
+        missing = [i for i, s in enumerate(self.skills) if s and not self._skill_has_vector[i]]
+        if not missing:
+            return self.skill_vectors
+        with self._lock:
+            for i in missing:
+                if self._skill_has_vector[i]:
+                    continue
+                v = unit_vector(embed_fn(self.skills[i]))
+                if self.skill_vectors is None:
+                    self.skill_vectors = np.zeros((len(self.skills), v.shape[0]), dtype=np.float32)
+                self.skill_vectors[i] = v
+                self._skill_has_vector[i] = True
+        return self.skill_vectors
+
+    def skill_has_vector(self):
+        return self._skill_has_vector
+
+
+class ResumeContext:
+    """Resume-side scoring state, built once per uploaded resume.
+
+    Also answers `get("resume_text")` / `get("fingerprint")` so code written
+    against the application dict keeps working.
+    """
+
+    def __init__(self, resume_text, fingerprint=None):
+        self.resume_text = resume_text or ""
+        self.fingerprint = fingerprint
+        self.norm_text = normalize_text_for_matching(self.resume_text)
+        self.sentences = [s.strip() for s in _SENTENCE_SPLIT_RE.split(self.resume_text) if s.strip()]
+        self.experience = experience_for({"resume_text": self.resume_text, "fingerprint": fingerprint})
+        self.document = None
+        self._vector = None
+        self._vector_error = None
+        self._sentence_vectors = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_application(cls, application):
+        if isinstance(application, cls):
+            return application
+        return cls(application.get("resume_text", ""), application.get("fingerprint"))
+
+    def get(self, key, default=None):
+        return {"resume_text": self.resume_text, "fingerprint": self.fingerprint}.get(key, default)
+
+    def vector(self, embed_fn):
+        """Unit resume vector, embedded on first use. Re-raises an embedding failure.
+
+        `embed_fn` returns either a vector or an ml.chunking.DocumentEmbedding;
+        the latter is kept as `document` (per-window vectors for passages).
+        """
+        if self._vector is None and self._vector_error is None:
+            with self._lock:
+                if self._vector is None and self._vector_error is None:
+                    try:
+                        result = embed_fn(self.resume_text)
+                        if hasattr(result, "chunk_vectors"):
+                            self.document = result
+                            result = result.vector
+                        self._vector = unit_vector(result)
+                    except Exception as e:
+                        self._vector_error = e
+        if self._vector_error is not None:
+            raise self._vector_error
+        return self._vector
+
+    def try_vector(self, embed_fn):
+        """vector(), or None when the model is unavailable."""
+        try:
+            return self.vector(embed_fn)
+        except Exception:
+            return None
+
+    def sentence_vectors(self, encode_fn):
+        """(n_sentences, dim) unit vectors for `sentences`, encoded in one batch once."""
+        if self._sentence_vectors is None and self.sentences:
+            vecs = np.asarray(encode_fn(self.sentences), dtype=np.float32)
+            norms = np.linalg.norm(vecs, axis=1, keepdims=True)
+            self._sentence_vectors = vecs / np.where(norms > 0, norms, 1.0)
+        return self._sentence_vectors
+
+
+class JobContextCache:
+    """Thread-safe LRU of JobContext by job id, validated by content version."""
+
+    def __init__(self, max_size=JOB_CONTEXT_CACHE_SIZE):
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, job_id, version):
+        with self._lock:
+            ctx = self._entries.get(job_id)
+            if ctx is not None and ctx.version == version:
+                self._entries.move_to_end(job_id)
+                self.hits += 1
+                return ctx
+            self.misses += 1
+            return None
+
+    def put(self, ctx):
+        if self.max_size <= 0 or ctx.job_id is None:
+            return ctx
+        with self._lock:
+            self._entries[ctx.job_id] = ctx
+            self._entries.move_to_end(ctx.job_id)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+        return ctx
+
+    def invalidate(self, job_id=None):
+        with self._lock:
+            if job_id is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(job_id, None)
+
+    def stats(self):
+        return {"size": len(self._entries), "max_size": self.max_size, "hits": self.hits, "misses": self.misses}
+
+
+_job_contexts = JobContextCache()
+
+
+def get_job_context_cache():
+    return _job_contexts
+
+
+def invalidate_job_context(job_id=None):
+    """Drop the cached context of `job_id` (all jobs when None)."""
+    _job_contexts.invalidate(job_id)
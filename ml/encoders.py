@@ -0,0 +1,303 @@
+# Pluggable sentence encoders behind ml.scoring_service.embed / get_model.
+#
+# An encoder turns a list of texts into an (n, EMBEDDING_DIM) float32 array
+# of unit vectors. The backend is picked with EMBEDDING_BACKEND:
+#   torch  sentence-transformers on PyTorch (default)
+#   onnx   the same all-MiniLM-L6-v2 exported to ONNX and run with ONNX
+#          Runtime: tokenizer, transformer, mean pooling and L2 norm, no torch
+#          at inference time. EMBEDDING_QUANTIZE=1 uses a dynamically
+#          quantized int8 copy of the graph.
+#   hash   deterministic hashed character n-gram vectors: no model, no
+#          network, microseconds per text. For tests, benchmarks and offline
+#          build machines; lexical rather than semantic similarity.
+# The ONNX graph is exported once from the locally cached sentence-transformers
+# weights (scripts/export_onnx.py, or automatically on first use) into
+# ONNX_MODEL_DIR.
+from functools import lru_cache
+import json
+import os
+import re
+import threading
+import time
+import zlib
+
+import numpy as np
+
+MODEL_NAME = "all-MiniLM-L6-v2"
+EMBEDDING_DIM = 384
+
+EMBEDDING_BACKEND = os.getenv("EMBEDDING_BACKEND", "torch").strip().lower()
+EMBEDDING_QUANTIZE = os.getenv("EMBEDDING_QUANTIZE", "0").strip().lower() in ("1", "true", "yes")
+EMBEDDING_THREADS = int(os.getenv("EMBEDDING_THREADS", "0"))
+ONNX_MODEL_DIR = os.getenv("ONNX_MODEL_DIR") or os.path.join(
+    os.path.expanduser("~"), ".cache", "sourcematch", "onnx", MODEL_NAME)
+
+HASH_NGRAM_RANGE = (3, 5)
+
+ONNX_FP32_FILE = "model.onnx"
+ONNX_INT8_FILE = "model.int8.onnx"
+
+
+# per backend: encode() calls, texts encoded and seconds spent (for metrics)
+_encode_stats = {}
+_encode_stats_lock = threading.Lock()
+
+
+def _record_encode(name, n_texts, seconds):
+    with _encode_stats_lock:
+        stats = _encode_stats.setdefault(name, {"calls": 0, "texts": 0, "seconds": 0.0})
+        stats["calls"] += 1
+        stats["texts"] += n_texts
+        stats["seconds"] += seconds
+
+
+def encode_stats():
+    """{backend: {"calls", "texts", "seconds"}} of encode() calls so far in this process."""
+    with _encode_stats_lock:
+        return {name: dict(stats) for name, stats in _encode_stats.items()}
+
+
+class Encoder:
+    """Interface: `encode(texts)` -> (len(texts), dim) float32 unit vectors.
+
+    `convert_to_numpy` is accepted (and ignored) so encoders are drop-in for
+    code written against SentenceTransformer.encode. `max_tokens` is how many
+    word pieces of one input the model sees (None: no limit) and
+    `count_tokens` how many each word costs; ml/chunking.py uses both to
+    split long documents into windows the model does not truncate.
+    """
+
+    name = "base"
+    dim = EMBEDDING_DIM
+    max_tokens = None
+
+    def encode(self, texts, batch_size=32, convert_to_numpy=True):
+        raise NotImplementedError
+
+    def count_tokens(self, words):
+        return [1] * len(words)
+
+
+def _normalize_rows(vecs):
+    vecs = np.asarray(vecs, dtype=np.float32)
+    norms = np.linalg.norm(vecs, axis=1, keepdims=True)
+    return vecs / np.where(norms > 0, norms, 1.0)
+
+
+class TorchEncoder(Encoder):
+    """sentence-transformers on PyTorch CPU (the original inference path)."""
+
+    name = "torch"
+
+    def __init__(self, model_name=MODEL_NAME):
+        from sentence_transformers import SentenceTransformer
+
+        print("Loading embedding model:", model_name)
+        self.model = SentenceTransformer(model_name)
+        self.dim = self.model.get_sentence_embedding_dimension() or EMBEDDING_DIM
+        # [CLS] and [SEP] take two of the max_seq_length positions
+        self.max_tokens = int(self.model.max_seq_length) - 2
+
+    def count_tokens(self, words):
+        return [len(ids) for ids in self.model.tokenizer(list(words), add_special_tokens=False)["input_ids"]]
+
+    def encode(self, texts, batch_size=32, convert_to_numpy=True):
+        t0 = time.perf_counter()
+        texts = list(texts)
+        out = np.asarray(self.model.encode(texts, batch_size=batch_size, convert_to_numpy=True), dtype=np.float32)
+        _record_encode(self.name, len(texts), time.perf_counter() - t0)
+        return out
+
+
+def export_onnx(out_dir=ONNX_MODEL_DIR, model_name=MODEL_NAME, quantize=False):
+    """Export the cached sentence-transformers model to `out_dir`.
+
+    Writes model.onnx (transformer only; pooling and normalization run in
+    numpy), tokenizer.json and encoder.json, plus model.int8.onnx when
+    `quantize` is set. Needs torch and onnx; returns `out_dir`.
+    """
+    import torch
+    from sentence_transformers import SentenceTransformer
+
+    os.makedirs(out_dir, exist_ok=True)
+    st = SentenceTransformer(model_name, device="cpu")
+    transformer = st[0]
+    hf_model = transformer.auto_model.eval()
+    tokenizer = transformer.tokenizer
+    tokenizer.save_pretrained(out_dir)
+
+    sample = tokenizer(["export sample"], return_tensors="pt")
+    input_names = [n for n in ("input_ids", "attention_mask", "token_type_ids") if n in sample]
+    dynamic_axes = {n: {0: "batch", 1: "sequence"} for n in input_names}
+    dynamic_axes["last_hidden_state"] = {0: "batch", 1: "sequence"}
+    fp32_path = os.path.join(out_dir, ONNX_FP32_FILE)
+    with torch.no_grad():
+        torch.onnx.export(
+            hf_model,
+            tuple(sample[n] for n in input_names),
+            fp32_path,
+            input_names=input_names,
+            output_names=["last_hidden_state"],
+            dynamic_axes=dynamic_axes,
+            opset_version=14,
+            do_constant_folding=True,
+            dynamo=False,
+        )
+    with open(os.path.join(out_dir, "encoder.json"), "w", encoding="utf-8") as f:
+        json.dump({
+            "model_name": model_name,
+            "dim": st.get_sentence_embedding_dimension() or EMBEDDING_DIM,
+            "max_seq_length": int(transformer.max_seq_length),
+            "pad_token": tokenizer.pad_token,
+            "pad_token_id": int(tokenizer.pad_token_id or 0),
+        }, f, indent=2)
+    if quantize:
+        quantize_onnx(out_dir)
+    return out_dir
+
+
+def quantize_onnx(model_dir=ONNX_MODEL_DIR):
+    """Write model.int8.onnx next to model.onnx (dynamic int8 weight quantization)."""
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+
+    int8_path = os.path.join(model_dir, ONNX_INT8_FILE)
+    quantize_dynamic(os.path.join(model_dir, ONNX_FP32_FILE), int8_path, weight_type=QuantType.QInt8)
+    return int8_path
+
+
+class OnnxEncoder(Encoder):
+    """all-MiniLM-L6-v2 on ONNX Runtime with mean pooling and L2 normalization."""
+
+    name = "onnx"
+
+    def __init__(self, model_dir=ONNX_MODEL_DIR, quantize=EMBEDDING_QUANTIZE, threads=EMBEDDING_THREADS):
+        import onnxruntime as ort
+        from tokenizers import Tokenizer
+
+        model_file = ONNX_INT8_FILE if quantize else ONNX_FP32_FILE
+        if not os.path.exists(os.path.join(model_dir, ONNX_FP32_FILE)):
+            print("Exporting embedding model to ONNX:", model_dir)
+            export_onnx(model_dir)
+        if quantize and not os.path.exists(os.path.join(model_dir, ONNX_INT8_FILE)):
+            quantize_onnx(model_dir)
+        with open(os.path.join(model_dir, "encoder.json"), encoding="utf-8") as f:
+            meta = json.load(f)
+        self.dim = int(meta.get("dim", EMBEDDING_DIM))
+        self.quantized = bool(quantize)
+
+        max_seq_length = int(meta.get("max_seq_length", 256))
+        self.max_tokens = max_seq_length - 2
+        # unpadded, untruncated copy for count_tokens
+        self._counter = Tokenizer.from_file(os.path.join(model_dir, "tokenizer.json"))
+        self.tokenizer = Tokenizer.from_file(os.path.join(model_dir, "tokenizer.json"))
+        self.tokenizer.enable_truncation(max_length=max_seq_length)
+        self.tokenizer.enable_padding(pad_id=int(meta.get("pad_token_id", 0)), pad_token=meta.get("pad_token") or "[PAD]")
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if threads > 0:
+            options.intra_op_num_threads = threads
+            options.inter_op_num_threads = 1
+        print("Loading embedding model:", os.path.join(model_dir, model_file))
+        self.session = ort.InferenceSession(os.path.join(model_dir, model_file), options, providers=["CPUExecutionProvider"])
+        self._input_names = [i.name for i in self.session.get_inputs()]
+
+    def encode(self, texts, batch_size=32, convert_to_numpy=True):
+        t0 = time.perf_counter()
+        texts = list(texts)
+        if not texts:
+            return np.zeros((0, self.dim), dtype=np.float32)
+        out = np.empty((len(texts), self.dim), dtype=np.float32)
+        # sort by length so each batch pads to a similar size
+        order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+        for start in range(0, len(order), batch_size):
+            idx = order[start:start + batch_size]
+            encodings = self.tokenizer.encode_batch([texts[i] for i in idx])
+            feeds = {
+                "input_ids": np.array([e.ids for e in encodings], dtype=np.int64),
+                "attention_mask": np.array([e.attention_mask for e in encodings], dtype=np.int64),
+                "token_type_ids": np.array([e.type_ids for e in encodings], dtype=np.int64),
+            }
+            hidden = self.session.run(None, {n: feeds[n] for n in self._input_names})[0]
+            mask = feeds["attention_mask"][:, :, None].astype(np.float32)
+            pooled = (hidden * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+            out[idx] = _normalize_rows(pooled)
+        _record_encode(self.name, len(texts), time.perf_counter() - t0)
+        return out
+
+    def count_tokens(self, words):
+        return [len(e.ids) for e in self._counter.encode_batch(list(words), add_special_tokens=False)]
+
+
+@lru_cache(maxsize=65536)
+def _word_features(word, dim, min_n, max_n):
+    # character n-grams of " word " (crc32 buckets, sign from the top bit)
+    padded = f" {word} "
+    grams = {padded[i:i + n] for n in range(min_n, max_n + 1) for i in range(len(padded) - n + 1)} or {padded}
+    hashes = np.fromiter((zlib.crc32(g.encode("utf-8")) for g in sorted(grams)), dtype=np.uint32)
+    return (hashes % dim).astype(np.intp), np.where(hashes >> 31, -1.0, 1.0)
+
+
+class HashEncoder(Encoder):
+    """Hashed character n-gram encoder (fastText-style, no training).
+
+    Each lowercased word contributes its character n-grams (HASH_NGRAM_RANGE,
+    word padded with spaces) hashed with crc32 into `dim` signed buckets; the
+    sum is L2-normalized. Output is deterministic across processes and
+    platforms, so tests and benchmarks get stable scores.
+    """
+
+    name = "hash"
+
+    def __init__(self, dim=EMBEDDING_DIM, ngram_range=HASH_NGRAM_RANGE):
+        self.dim = dim
+        self.ngram_range = tuple(ngram_range)
+
+    def _vector(self, text):
+        words = re.findall(r"[^\W_]+|[+#]+", (text or "").lower())
+        if not words:
+            return np.zeros(self.dim, dtype=np.float32)
+        features = [_word_features(w, self.dim, *self.ngram_range) for w in words]
+        idx = np.concatenate([f[0] for f in features])
+        signs = np.concatenate([f[1] for f in features])
+        vec = np.bincount(idx, weights=signs, minlength=self.dim).astype(np.float32)
+        norm = float(np.linalg.norm(vec))
+        return vec / norm if norm > 0 else vec
+
+    def encode(self, texts, batch_size=32, convert_to_numpy=True):
+        t0 = time.perf_counter()
+        texts = list(texts)
+        if not texts:
+            return np.zeros((0, self.dim), dtype=np.float32)
+        out = np.vstack([self._vector(t) for t in texts])
+        _record_encode(self.name, len(texts), time.perf_counter() - t0)
+        return out
+
+
+ENCODERS = {
+    "torch": TorchEncoder,
+    "onnx": OnnxEncoder,
+    "hash": HashEncoder,
+}
+
+_encoders = {}
+_encoders_lock = threading.Lock()
+
+
+def register_encoder(name, factory):
+    """Make `factory` (a zero-argument callable returning an Encoder) selectable as `name`."""
+    ENCODERS[name] = factory
+
+
+def get_encoder(name=None):
+    """Process-wide encoder for `name` (default EMBEDDING_BACKEND), created on first use."""
+    name = (name or EMBEDDING_BACKEND).strip().lower()
+    encoder = _encoders.get(name)
+    if encoder is None:
+        if name not in ENCODERS:
+            raise ValueError(f"Unknown EMBEDDING_BACKEND {name!r}; expected one of {sorted(ENCODERS)}")
+        with _encoders_lock:
+            encoder = _encoders.get(name)
+            if encoder is None:
+                encoder = _encoders[name] = ENCODERS[name]()
+    return encoder
@@ -0,0 +1,156 @@
+# Compiled, single-pass extraction of years of experience from resume text.
+#
+# One regex finds every explicit "N years" / "N+ yrs" mention, every
+# word-number mention ("five years") and every date range ("2018 - 2021",
+# "Jan 2019 to present", "03/2017 - 06/2020") in a single scan. Overlapping
+# date ranges are merged so concurrent jobs are not double counted.
+# Results are cached per resume fingerprint, so scoring one resume against
+# many jobs parses it once.
+from collections import OrderedDict
+import datetime
+import hashlib
+import os
+import re
+import threading
+
+EXPERIENCE_CACHE_SIZE = int(os.getenv("EXPERIENCE_CACHE_SIZE", "4096"))
+
+_NUMBER_WORDS = {
+    "one": 1, "two": 2, "three": 3, "four": 4, "five": 5, "six": 6, "seven": 7,
+    "eight": 8, "nine": 9, "ten": 10, "eleven": 11, "twelve": 12, "thirteen": 13,
+    "fourteen": 14, "fifteen": 15, "twenty": 20,
+}
+_MONTHS = {m: i for i, m in enumerate(
+    ["jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"])}
+
+_MONTH = r"(?:jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\.?"
+_YEARS_UNIT = r"\s*\+?\s*(?:years?|yrs?)\b"
+
+_MENTION_RE = re.compile(
+    rf"""
+    # cheap guard: every mention starts a word with a digit or one of these letters
+    (?=[\dadefjmnostw])(?<![a-z])
+    (?:
+    (?P<range>
+        (?:(?P<mon1>{_MONTH})\s+|(?P<mm1>\d{{1,2}})[/.])?
+        (?P<y1>(?:19|20)\d{{2}})
+        \s*(?:-|–|—|to|till|until)\s*
+        (?:(?P<mon2>{_MONTH})\s+|(?P<mm2>\d{{1,2}})[/.])?
+        (?P<y2>(?:19|20)\d{{2}}|present|current|now|date|today)
+    )
+    |(?<![\d.])(?P<num>\d{{1,2}}(?:\.\d)?){_YEARS_UNIT}
+    |\b(?P<word>{"|".join(sorted(_NUMBER_WORDS, key=len, reverse=True))}){_YEARS_UNIT}
+    )
+    """,
+    re.IGNORECASE | re.VERBOSE,
+)
+
+# words near an explicit mention that mark it as (work) experience rather than
+# e.g. "a 2 year warranty" or "graduated 4 years ago"
+_CONTEXT_RE = re.compile(r"experience|exp\b|\bworked|\bworking|professional|industry", re.IGNORECASE)
+_CONTEXT_WINDOW = 40
+
+_cache = OrderedDict()
+_cache_lock = threading.Lock()
+_cache_stats = {"hits": 0, "misses": 0}
+
+
+def _month_index(mon, mm):
+    if mon:
+        return _MONTHS.get(mon[:3].lower(), 0)
+    if mm and 1 <= int(mm) <= 12:
+        return int(mm) - 1
+    return 0
+
+
+def _merged_months(intervals):
+    total = 0
+    cur_start = cur_end = None
+    for start, end in sorted(intervals):
+        if cur_end is None or start > cur_end:
+            if cur_end is not None:
+                total += cur_end - cur_start
+            cur_start, cur_end = start, end
+        else:
+            cur_end = max(cur_end, end)
+    if cur_end is not None:
+        total += cur_end - cur_start
+    return total
+
+
+def extract_experience(text):
+    """Find every experience mention in `text` in one pass.
+
+    Returns a dict:
+        years           best estimate (max of explicit mentions and merged ranges)
+        explicit_years  largest "N years" mention (experience-context mentions
+                        preferred over unrelated ones)
+        range_years     total length of the merged date ranges
+        mentions        matched snippets, in order
+        found           whether anything was found at all
+    """
+    text = text or ""
+    today = datetime.date.today()
+    now_month = today.year * 12 + today.month - 1
+    explicit, in_context, intervals, mentions = [], [], [], []
+
+    for m in _MENTION_RE.finditer(text):
+        if m.group("range"):
+            y1 = int(m.group("y1"))
+            y2_raw = m.group("y2")
+            start = y1 * 12 + _month_index(m.group("mon1"), m.group("mm1"))
+            if y2_raw.isdigit():
+                end = int(y2_raw) * 12 + _month_index(m.group("mon2"), m.group("mm2"))
+            else:
+                end = now_month
+            if start > now_month or end < start or end - start > 50 * 12:
+                continue
+            intervals.append((start, min(end, now_month)))
+        else:
+            years = float(m.group("num")) if m.group("num") else float(_NUMBER_WORDS[m.group("word").lower()])
+            if years <= 0 or years > 50:
+                continue
+            explicit.append(years)
+            window = text[max(0, m.start() - _CONTEXT_WINDOW):m.end() + _CONTEXT_WINDOW]
+            if _CONTEXT_RE.search(window):
+                in_context.append(years)
+        mentions.append(m.group(0))
+
+    explicit_years = max(in_context or explicit or [0.0])
+    range_years = _merged_months(intervals) / 12.0
+    return {
+        "years": max(explicit_years, range_years),
+        "explicit_years": explicit_years,
+        "range_years": round(range_years, 2),
+        "mentions": mentions,
+        "found": bool(mentions),
+    }
+
+
+def experience_for(application):
+    """extract_experience() for an application dict, cached per resume.
+
+    Keyed by the resume fingerprint when present (falls back to a hash of the
+    text), so scoring one resume against many jobs parses it once.
+    """
+    text = application.get("resume_text", "") or ""
+    key = application.get("fingerprint") or hashlib.sha1(text.encode("utf-8", "ignore")).hexdigest()
+    with _cache_lock:
+        info = _cache.get(key)
+        if info is not None:
+            _cache.move_to_end(key)
+            _cache_stats["hits"] += 1
+            return info
+        _cache_stats["misses"] += 1
+    info = extract_experience(text)
+    if EXPERIENCE_CACHE_SIZE > 0:
+        with _cache_lock:
+            _cache[key] = info
+            while len(_cache) > EXPERIENCE_CACHE_SIZE:
+                _cache.popitem(last=False)
+    return info
+
+
+def experience_cache_stats():
+    with _cache_lock:
+        return {"size": len(_cache), "max_size": EXPERIENCE_CACHE_SIZE, **_cache_stats}
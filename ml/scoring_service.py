@@ -1,28 +1,45 @@
 # Simple ML scoring service using sentence-transformers
-from sentence_transformers import SentenceTransformer
-from sklearn.metrics.pairwise import cosine_similarity
 import numpy as np
 import re
 import os
 import json
 
-# Lazy load model (downloads on first use, not on import)
-MODEL_NAME = "all-MiniLM-L6-v2"
+try:
+    from ml.chunking import embed_documents
+    from ml.contexts import JobContext, ResumeContext, unit_vector
+    from ml.encoders import EMBEDDING_DIM, MODEL_NAME, get_encoder
+    from ml.experience import experience_for
+    from ml.skill_matcher import normalize_text_for_matching
+    from ml.timing import stage
+except ImportError:
+    # running this file directly (python ml/scoring_service.py)
+    from chunking import embed_documents
+    from contexts import JobContext, ResumeContext, unit_vector
+    from encoders import EMBEDDING_DIM, MODEL_NAME, get_encoder
+    from experience import experience_for
+    from skill_matcher import normalize_text_for_matching
+    from timing import stage
+
+# Lazy load model (downloads on first use, not on import). The inference
+# backend is chosen by EMBEDDING_BACKEND, see ml/encoders.py.
 model = None
 
 def get_model():
-    """Lazy-load the embedding model on first use."""
+    """Lazy-load the embedding encoder on first use."""
     global model
     if model is None:
-        print("Loading embedding model:", MODEL_NAME)
-        model = SentenceTransformer(MODEL_NAME)
+        model = get_encoder()
     return model
 
+def embed_document(text):
+    """ml.chunking.DocumentEmbedding of `text`: texts longer than the model's
+    window are embedded as overlapping windows and pooled."""
+    return embed_documents([text], get_model())[0]
+
 def embed(text):
     if not text or len(text.strip()) == 0:
-        return np.zeros(384)
-    m = get_model()
-    return m.encode([text], convert_to_numpy=True)[0]
+        return np.zeros(EMBEDDING_DIM)
+    return embed_document(text).vector
 
 def extract_skills_from_text(text):
     # Legacy: not used directly. Keep for compatibility.
@@ -31,43 +48,17 @@ def extract_skills_from_text(text):
     return list({t.lower() for t in tokens[:500]})
 
 def exp_years_match(min_years, application):
-    # Improved heuristic: find numeric years, ranges like 2018-2021, '4+ years',
-    # and basic word-number forms (one, two, three... up to ten).
-    text = (application.get("resume_text", "") or "").lower()
-    # quick numeric match
-    m = re.search(r"(\d{1,2})\s*\+?\s*years?", text)
-    if m:
-        try:
-            years = int(m.group(1))
-            return min(1.0, years / max(1, min_years)) if min_years > 0 else 1.0
-        except:
-            pass
-    # year range like 2018-2021 -> estimate diff
-    m = re.search(r"(20\d{2})\s*[-–]\s*(20\d{2})", text)
-    if m:
-        try:
-            years = int(m.group(2)) - int(m.group(1))
-            years = max(0, years)
-            return min(1.0, years / max(1, min_years)) if min_years > 0 else 1.0
-        except:
-            pass
-    # basic word-number mapping
-    words = {
-        'one':1,'two':2,'three':3,'four':4,'five':5,'six':6,'seven':7,'eight':8,'nine':9,'ten':10
-    }
-    for w, val in words.items():
-        if re.search(rf"\b{w}\s+years?\b", text):
-            years = val
-            return min(1.0, years / max(1, min_years)) if min_years > 0 else 1.0
-    return 0.0
+    """Experience component (0-1): apparent years of experience vs `min_years`.
 
-
-def normalize_text_for_matching(text: str) -> str:
-    # lowercase and replace punctuation with spaces so 'node.js' and 'node js' match
-    s = (text or "").lower()
-    s = re.sub(r"[\W_]+", " ", s)
-    s = re.sub(r"\s+", " ", s).strip()
-    return s
+    Years come from ml.experience (numeric, word-number and merged date-range
+    mentions), parsed once per resume: held on a ResumeContext, or cached per
+    fingerprint for a plain application dict.
+    """
+    info = application.experience if isinstance(application, ResumeContext) else experience_for(application)
+    if not info["found"]:
+        return 0.0
+    years = info["years"]
+    return min(1.0, years / max(1, min_years)) if min_years > 0 else 1.0
 
 
 def _read_threshold_from_settings():
@@ -87,6 +78,63 @@ def _read_threshold_from_settings():
         return 0.62
 
 
+def _as_job_context(job):
+    # callers may pass a prepared JobContext or the plain job dict
+    return job if isinstance(job, JobContext) else JobContext.from_job(job)
+
+
+def _as_resume_context(application):
+    # callers may pass a prepared ResumeContext or the plain application dict
+    return ResumeContext.from_application(application)
+
+
+def _skill_details(jc, rc, resume_vec, threshold, with_offsets=False):
+    """Per-skill match details of a JobContext against one ResumeContext.
+
+    Semantic similarity for all skills is one product of the job's skill
+    matrix with the resume vector (skills without a stored vector are
+    embedded once and kept on the context). Skills below the threshold fall
+    back to the job's SkillMatcher, one Aho-Corasick pass over the resume's
+    normalized text for all of them; `with_offsets` (explain) also reports
+    the match offsets.
+    """
+    details = [{"skill": s, "matched": False, "method": None, "similarity": None, "tokens_matched": []} for s in jc.skills]
+    sims = None
+    if resume_vec is not None and jc.skills:
+        try:
+            jc.ensure_skill_vectors(embed)
+        except Exception:
+            # keep whatever vectors exist; the rest use the lexical fallback
+            pass
+        if jc.skill_vectors is not None:
+            try:
+                sims = jc.skill_vectors @ resume_vec
+            except ValueError:
+                sims = None
+    has_vector = jc.skill_has_vector()
+    lexical = None
+    for i, (skill, detail) in enumerate(zip(jc.skills, details)):
+        if not skill:
+            continue
+        if sims is not None and has_vector[i]:
+            detail["similarity"] = float(sims[i])
+            if sims[i] >= threshold:
+                detail["matched"] = True
+                detail["method"] = "semantic_precomputed" if jc.skill_precomputed[i] else "semantic_on_the_fly"
+                continue
+        # Legacy substring/token fallback (partial token matches are reported too)
+        if lexical is None:
+            lexical = jc.matcher.match(rc.norm_text)
+        lex = lexical[i]
+        detail["tokens_matched"] = lex["tokens_matched"]
+        if with_offsets:
+            detail["offsets"] = lex["offsets"]
+        if lex["matched"]:
+            detail["matched"] = True
+            detail["method"] = lex["method"]
+    return details
+
+
 def match_required_skills(required_skills, resume_text, skill_embeddings=None):
     """Return list of required skills that semantically appear in resume_text.
 
@@ -102,86 +150,63 @@ def match_required_skills(required_skills, resume_text, skill_embeddings=None):
     """
     if not required_skills:
         return []
+    jc = JobContext("", {"required_skills": list(required_skills)}, skill_embeddings=skill_embeddings)
+    rc = ResumeContext(resume_text)
+    details = _skill_details(jc, rc, rc.try_vector(embed_document), _read_threshold_from_settings())
+    return [d["skill"] for d in details if d["matched"]]
 
-    # Normalize quick lookup text for fallback matching
-    norm_text = normalize_text_for_matching(resume_text)
-    matches = []
-
-    # Pre-compute resume embedding once for efficiency when using semantic match
-    resume_vec = None
-    model_available = True
-    try:
-        resume_vec = embed(resume_text)
-        resume_vec = np.asarray(resume_vec).reshape(1, -1)
-    except Exception:
-        # If embedding model fails to load for any reason, we'll fallback
-        resume_vec = None
-        model_available = False
-
-    # similarity threshold for skill <-> resume matching (0-1)
-    SKILL_SIM_THRESHOLD = _read_threshold_from_settings()
-
-    # If skill_embeddings provided, prefer using them to avoid recomputing embeddings
-    use_precomputed = skill_embeddings is not None and isinstance(skill_embeddings, (list, tuple)) and len(skill_embeddings) > 0
-
-    for idx, skill in enumerate(required_skills):
-        if not skill:
-            continue
-        # 1) Semantic matching using precomputed embedding if available
-        matched = False
-        if use_precomputed and idx < len(skill_embeddings):
-            try:
-                se = np.asarray(skill_embeddings[idx]).reshape(1, -1)
-                sim = float(cosine_similarity(se, resume_vec)[0][0]) if model_available and resume_vec is not None else 0.0
-                if sim >= SKILL_SIM_THRESHOLD:
-                    matches.append(skill)
-                    matched = True
-            except Exception:
-                matched = False
-
-        # 2) If not matched and model available, compute on-the-fly embedding for this skill
-        if not matched and model_available and resume_vec is not None:
-            try:
-                skill_vec = embed(skill)
-                skill_vec = np.asarray(skill_vec).reshape(1, -1)
-                sim = float(cosine_similarity(skill_vec, resume_vec)[0][0])
-                if sim >= SKILL_SIM_THRESHOLD:
-                    matches.append(skill)
-                    matched = True
-            except Exception:
-                matched = False
-
-        if matched:
-            continue
 
-        # 3) Legacy fallback: normalized substring or token-level check
-        skill_norm = normalize_text_for_matching(skill)
-        if skill_norm and skill_norm in norm_text:
-            matches.append(skill)
-            continue
-        tokens = [t for t in skill_norm.split() if t]
-        if tokens and all(token in norm_text.split() for token in tokens):
-            matches.append(skill)
+def match_skill_vocabulary(resume_text, resume_vec, skill_matrix, has_vector, matcher, threshold=None):
+    """Boolean mask over a whole skill vocabulary: which skills the resume has.
 
-    return matches
+    `resume_text` may also be a ResumeContext (its normalized text is reused).
 
-def score_job_application(job, application):
-    job_desc = job.get("description", "")
-    resume_text = application.get("resume_text", "")
+    `skill_matrix` holds one L2-normalized row per vocabulary skill and
+    `matcher` is a SkillMatcher over the vocabulary names (same order). The
+    semantic check is a single matrix-vector product thresholded like
+    match_required_skills; skills without a vector, or below the threshold,
+    fall back to one lexical pass over the normalized resume.
+    """
+    n = len(has_vector)
+    mask = np.zeros(n, dtype=bool)
+    if threshold is None:
+        threshold = _read_threshold_from_settings()
+    if resume_vec is not None and n and skill_matrix.shape[1]:
+        v = np.asarray(resume_vec, dtype=np.float32).reshape(-1)
+        norm = float(np.linalg.norm(v))
+        if norm > 0:
+            mask = (skill_matrix @ (v / norm) >= threshold) & has_vector
+    if not mask.all():
+        norm_text = resume_text.norm_text if isinstance(resume_text, ResumeContext) else normalize_text_for_matching(resume_text)
+        lexical = matcher.match(norm_text)
+        mask |= np.fromiter((d["matched"] for d in lexical), dtype=bool, count=n)
+    return mask
+
+
+def score_job_application(job, application, skill_match=None):
+    """Composite 0-1 score and explanation for one job/resume pair.
+
+    `job` is a job dict or a prepared JobContext, `application` an
+    application dict or a prepared ResumeContext (pass the same one for every
+    job a resume is scored against). `skill_match` may carry a precomputed
+    (matched_skills, skill_score) pair, e.g. from a catalog-wide vocabulary
+    match, to skip per-job skill matching.
+    """
+    jc = _as_job_context(job)
+    rc = _as_resume_context(application)
 
-    job_vec = embed(job_desc)
-    resume_vec = embed(resume_text)
-    # cosine_similarity expects 2D array-like inputs; ensure vectors are 2D numpy arrays
-    job_vec_2d = np.asarray(job_vec).reshape(1, -1)
-    resume_vec_2d = np.asarray(resume_vec).reshape(1, -1)
-    emb_sim = float(cosine_similarity(job_vec_2d, resume_vec_2d)[0][0])
+    resume_vec = rc.vector(embed_document)
+    emb_sim = float(jc.description_vector(embed) @ resume_vec)
 
-    req_skills = job.get("requirements", {}).get("required_skills", []) or []
-    skill_embeddings = job.get("skill_embeddings", None)
-    matched = match_required_skills(req_skills, resume_text, skill_embeddings)
-    skill_score = (len(matched) / max(1, len(req_skills))) if req_skills else 0.0
+    req_skills = jc.skills
+    if skill_match is not None:
+        matched, skill_score = skill_match
+    else:
+        details = _skill_details(jc, rc, resume_vec, _read_threshold_from_settings())
+        matched = [d["skill"] for d in details if d["matched"]]
+        skill_score = (len(matched) / max(1, len(req_skills))) if req_skills else 0.0
 
-    experience_score = exp_years_match(job.get("requirements", {}).get("min_experience", 0), application)
+    experience_score = exp_years_match(jc.min_experience, rc)
 
     # composite score: weights chosen for prototype
     # All three scores are 0-1, so weighted sum should be 0-100 max
@@ -199,7 +224,7 @@ def score_job_application(job, application):
         explanation["reasons"].append("Missing several required skills")
     if emb_sim < 0.45:
         explanation["reasons"].append("Low semantic similarity between resume and job description")
-    if experience_score < 0.5 and job.get("requirements", {}).get("min_experience", 0) > 0:
+    if experience_score < 0.5 and jc.min_experience > 0:
         explanation["reasons"].append("Insufficient apparent experience")
     return composite, explanation
 
@@ -211,139 +236,67 @@ def explain_job_application(job, application):
     match method (semantic precomputed / semantic on-the-fly / substring),
     tokens matched, and the contribution of each component to the final score.
     """
-    job_desc = job.get("description", "")
-    resume_text = application.get("resume_text", "")
+    jc = _as_job_context(job)
+    rc = _as_resume_context(application)
 
     # Compute job and resume embeddings (best-effort)
-    try:
-        job_vec = embed(job_desc)
-        job_vec_2d = np.asarray(job_vec).reshape(1, -1)
-    except Exception:
-        job_vec_2d = None
-    try:
-        resume_vec = embed(resume_text)
-        resume_vec_2d = np.asarray(resume_vec).reshape(1, -1)
-    except Exception:
-        resume_vec_2d = None
-
-    emb_sim = 0.0
-    if job_vec_2d is not None and resume_vec_2d is not None:
-        emb_sim = float(cosine_similarity(job_vec_2d, resume_vec_2d)[0][0])
-
-    req_skills = job.get("requirements", {}).get("required_skills", []) or []
-    skill_embeddings = job.get("skill_embeddings", None)
-
-    # Skill-level details
-    per_skill = []
-    # Precompute normalized resume text for substring matches
-    norm_text = normalize_text_for_matching(resume_text)
-    resume_vec_for_sim = None
-    try:
-        resume_vec_for_sim = resume_vec_2d
-    except Exception:
-        resume_vec_for_sim = None
-
-    SKILL_SIM_THRESHOLD = _read_threshold_from_settings()
-    use_precomputed = skill_embeddings is not None and isinstance(skill_embeddings, (list, tuple)) and len(skill_embeddings) > 0
-
-    for idx, skill in enumerate(req_skills):
-        detail = {"skill": skill, "matched": False, "method": None, "similarity": None, "tokens_matched": []}
-        if not skill:
-            per_skill.append(detail)
-            continue
-
-        # Try precomputed semantic
-        sim = None
-        if use_precomputed and idx < len(skill_embeddings) and resume_vec_for_sim is not None:
+    with stage("embed"):
+        resume_vec = rc.try_vector(embed_document)
+        emb_sim = 0.0
+        passages = []
+        if resume_vec is not None:
             try:
-                se = np.asarray(skill_embeddings[idx]).reshape(1, -1)
-                sim = float(cosine_similarity(se, resume_vec_for_sim)[0][0])
-                detail["similarity"] = sim
-                if sim >= SKILL_SIM_THRESHOLD:
-                    detail["matched"] = True
-                    detail["method"] = "semantic_precomputed"
+                job_vec = jc.description_vector(embed)
+                emb_sim = float(job_vec @ resume_vec)
+                # long resumes: the windows closest to the job description
+                if rc.document is not None and len(rc.document) > 1:
+                    passages = rc.document.passages(rc.resume_text, job_vec)
             except Exception:
-                sim = None
+                emb_sim = 0.0
 
-        # On-the-fly semantic
-        if not detail["matched"] and sim is None and resume_vec_for_sim is not None:
-            try:
-                skill_vec = embed(skill)
-                skill_vec = np.asarray(skill_vec).reshape(1, -1)
-                sim = float(cosine_similarity(skill_vec, resume_vec_for_sim)[0][0])
-                detail["similarity"] = sim
-                if sim >= SKILL_SIM_THRESHOLD:
-                    detail["matched"] = True
-                    detail["method"] = "semantic_on_the_fly"
-            except Exception:
-                pass
+    req_skills = jc.skills
+    SKILL_SIM_THRESHOLD = _read_threshold_from_settings()
 
-        # Legacy substring/token fallback
-        if not detail["matched"]:
-            skill_norm = normalize_text_for_matching(skill)
-            if skill_norm and skill_norm in norm_text:
-                detail["matched"] = True
-                detail["method"] = "substring"
-                detail["tokens_matched"] = [skill_norm]
-            else:
-                tokens = [t for t in skill_norm.split() if t]
-                matched_tokens = [t for t in tokens if t in norm_text.split()]
-                if tokens and len(matched_tokens) == len(tokens):
-                    detail["matched"] = True
-                    detail["method"] = "tokens_all"
-                    detail["tokens_matched"] = matched_tokens
-                elif matched_tokens:
-                    # partial token match
-                    detail["tokens_matched"] = matched_tokens
-
-        per_skill.append(detail)
+    # Skill-level details
+    with stage("skill_match"):
+        per_skill = _skill_details(jc, rc, resume_vec, SKILL_SIM_THRESHOLD, with_offsets=True)
 
     # Additionally perform semantic sentence-level matching for higher-fidelity highlights
     # If model available, embed sentences and check similarity between each skill and each sentence
     try:
-        model = get_model()
-        # split into sentences (simple rule)
-        raw_sentences = [s.strip() for s in re.split(r'(?<=[.!?\n])\\s+', resume_text) if s.strip()]
-        if raw_sentences:
-            sent_vecs = model.encode(raw_sentences, convert_to_numpy=True)
-            # Prepare skill vectors
-            if use_precomputed:
-                skill_vecs = [np.asarray(s).reshape(-1) for s in skill_embeddings[:len(req_skills)]]
-                skill_vecs = np.vstack(skill_vecs)
-            else:
-                # encode skills in batch
-                skill_vecs = model.encode(req_skills, convert_to_numpy=True)
-
-            # Compute similarity matrix (n_skills x n_sentences)
-            sims = cosine_similarity(skill_vecs, np.asarray(sent_vecs))
-            for i, detail in enumerate(per_skill):
-                detail_sentences = []
-                for j, sent in enumerate(raw_sentences):
-                    try:
+        raw_sentences = rc.sentences
+        if raw_sentences and req_skills:
+            with stage("sentence_encode"):
+                sent_vecs = rc.sentence_vectors(lambda sents: get_model().encode(sents, convert_to_numpy=True))
+                skill_vecs = jc.ensure_skill_vectors(embed)
+
+            with stage("sentence_match"):
+                # Compute similarity matrix (n_skills x n_sentences)
+                sims = skill_vecs @ sent_vecs.T
+                for i, detail in enumerate(per_skill):
+                    detail_sentences = []
+                    for j, sent in enumerate(raw_sentences):
                         sim_val = float(sims[i][j])
-                    except Exception:
-                        sim_val = None
-                    if sim_val is not None:
                         # attach similarity if not already present
                         if detail.get("similarity") is None:
                             detail["similarity"] = sim_val
                         # if sentence similarity crosses threshold, add to sentences
-                        if sim_val is not None and sim_val >= SKILL_SIM_THRESHOLD:
+                        if sim_val >= SKILL_SIM_THRESHOLD:
                             detail_sentences.append(sent)
                             # mark as matched by semantic sentence if not already matched
                             if not detail["matched"]:
                                 detail["matched"] = True
                                 # indicate method if previously none or fallback
-                                detail["method"] = "semantic_precomputed_sentence" if use_precomputed and i < len(skill_embeddings) else "semantic_sentence"
-                if detail_sentences:
-                    detail["sentences"] = detail_sentences
+                                detail["method"] = "semantic_precomputed_sentence" if jc.skill_precomputed[i] else "semantic_sentence"
+                    if detail_sentences:
+                        detail["sentences"] = detail_sentences
     except Exception:
         # if sentence-level semantic matching fails, continue silently
         pass
 
     matched_skills = [d["skill"] for d in per_skill if d["matched"]]
     skill_score = (len(matched_skills) / max(1, len(req_skills))) if req_skills else 0.0
-    experience_score = exp_years_match(job.get("requirements", {}).get("min_experience", 0), application)
+    experience_score = exp_years_match(jc.min_experience, rc)
 
     # Composite breakdown
     weights = {"embedding": 0.40, "skills": 0.35, "experience": 0.25}
@@ -364,6 +317,8 @@ def explain_job_application(job, application):
         "matched_skills": matched_skills,
         "settings": {"skill_similarity_threshold": SKILL_SIM_THRESHOLD}
     }
+    if passages:
+        report["passages"] = passages
 
     return report
 
@@ -0,0 +1,153 @@
+# Multi-pattern lexical skill matcher (Aho-Corasick) used by the scoring
+# fallback when semantic matching does not fire.
+#
+# The legacy fallback treated a skill as present when either
+#   - its normalized phrase occurs as a substring of the normalized resume, or
+#   - every token of the phrase occurs as a whole token in the resume.
+# SkillMatcher compiles all phrases and all tokens of a job's skills into one
+# automaton and answers both questions with a single linear pass over the
+# normalized resume, returning match offsets as well.
+from collections import deque
+from functools import lru_cache
+import re
+
+
+def normalize_text_for_matching(text: str) -> str:
+    # lowercase and replace punctuation with spaces so 'node.js' and 'node js' match
+    s = (text or "").lower()
+    s = re.sub(r"[\W_]+", " ", s)
+    s = re.sub(r"\s+", " ", s).strip()
+    return s
+
+
+class _Automaton:
+    """Plain Aho-Corasick automaton over characters.
+
+    Patterns are identified by their index in the `patterns` list; `search`
+    yields (pattern_index, start, end) for every occurrence, overlapping ones
+    included.
+    """
+
+    def __init__(self, patterns):
+        self.patterns = list(patterns)
+        goto = [{}]
+        out = [[]]
+        for pid, pat in enumerate(self.patterns):
+            if not pat:
+                continue
+            node = 0
+            for ch in pat:
+                nxt = goto[node].get(ch)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[node][ch] = nxt
+                    goto.append({})
+                    out.append([])
+                node = nxt
+            out[node].append(pid)
+
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, nxt in goto[node].items():
+                queue.append(nxt)
+                f = fail[node]
+                while f and ch not in goto[f]:
+                    f = fail[f]
+                cand = goto[f].get(ch, 0)
+                fail[nxt] = cand if cand != nxt else 0
+                # inherit outputs of the failure state (suffix matches)
+                out[nxt] = out[nxt] + out[fail[nxt]]
+        self._goto = goto
+        self._fail = fail
+        self._out = out
+
+    def search(self, text):
+        goto, fail, out, patterns = self._goto, self._fail, self._out, self.patterns
+        node = 0
+        for i, ch in enumerate(text):
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            if out[node]:
+                for pid in out[node]:
+                    yield pid, i - len(patterns[pid]) + 1, i + 1
+
+
+class SkillMatcher:
+    """Compiled lexical matcher for one job's required skills.
+
+    Build once per job (see `get_skill_matcher`) and call `match()` per resume.
+    """
+
+    def __init__(self, skills):
+        self.skills = list(skills)
+        self.skill_norms = [normalize_text_for_matching(s) if s else "" for s in self.skills]
+        self.skill_tokens = [[t for t in n.split() if t] for n in self.skill_norms]
+
+        # Pattern ids: phrases first, then distinct tokens wrapped in spaces so
+        # they only match whole tokens of " <normalized resume> ".
+        phrases = sorted({n for n in self.skill_norms if n})
+        tokens = sorted({t for toks in self.skill_tokens for t in toks})
+        self._phrase_ids = {p: i for i, p in enumerate(phrases)}
+        self._token_ids = {t: len(phrases) + i for i, t in enumerate(tokens)}
+        self._automaton = _Automaton(phrases + [f" {t} " for t in tokens])
+
+    def scan(self, norm_text):
+        """Return {pattern_id: [(start, end), ...]} for `norm_text` in one pass.
+
+        Offsets index into `norm_text` (token patterns are adjusted for the
+        padding spaces).
+        """
+        hits = {}
+        padded = f" {norm_text} "
+        n_phrases = len(self._phrase_ids)
+        for pid, start, end in self._automaton.search(padded):
+            if pid >= n_phrases:
+                # whole-token pattern " tok ": strip the padding spaces
+                span = (start, end - 2)
+            else:
+                span = (start - 1, end - 1)
+                if span[0] < 0 or span[1] > len(norm_text):
+                    continue
+            hits.setdefault(pid, []).append(span)
+        return hits
+
+    def match(self, norm_text):
+        """Per-skill lexical match details for a normalized resume.
+
+        Returns a list aligned with `skills` of dicts:
+            {"matched": bool, "method": "substring" | "tokens_all" | None,
+             "tokens_matched": [...], "offsets": [[start, end], ...]}
+        """
+        hits = self.scan(norm_text)
+        results = []
+        for norm, tokens in zip(self.skill_norms, self.skill_tokens):
+            detail = {"matched": False, "method": None, "tokens_matched": [], "offsets": []}
+            if not norm:
+                results.append(detail)
+                continue
+            phrase_hits = hits.get(self._phrase_ids[norm])
+            if phrase_hits:
+                detail.update(matched=True, method="substring", tokens_matched=[norm],
+                              offsets=[list(s) for s in phrase_hits])
+            else:
+                matched_tokens = [t for t in tokens if self._token_ids[t] in hits]
+                detail["tokens_matched"] = matched_tokens
+                detail["offsets"] = [list(s) for t in matched_tokens for s in hits[self._token_ids[t]]]
+                if tokens and len(matched_tokens) == len(tokens):
+                    detail["matched"] = True
+                    detail["method"] = "tokens_all"
+            results.append(detail)
+        return results
+
+
+@lru_cache(maxsize=4096)
+def _cached_matcher(skills):
+    return SkillMatcher(skills)
+
+
+def get_skill_matcher(skills):
+    """Return a (process-wide cached) SkillMatcher for this skill list."""
+    return _cached_matcher(tuple(s or "" for s in skills))
@@ -0,0 +1,5 @@
+import os
+
+# Score with the deterministic hashed n-gram encoder (ml/encoders.py) so the
+# suite runs offline; test_encoders.py builds the torch/ONNX encoders itself.
+os.environ.setdefault("EMBEDDING_BACKEND", "hash")
@@ -0,0 +1,30 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from ml.chunking import embed_documents, window_bounds
+from ml.encoders import HashEncoder
+
+
+def test_windows_cover_every_word_with_overlap():
+    counts = [1, 3, 2, 1, 1, 4, 2, 2, 1, 3, 1, 1]
+    bounds = window_bounds(counts, window=6, overlap=2)
+    assert bounds[0][0] == 0 and bounds[-1][1] == len(counts)
+    for (s1, e1, n), (s2, _, _) in zip(bounds, bounds[1:]):
+        assert n == sum(counts[s1:e1]) <= 6
+        assert s1 < s2 <= e1
+
+
+def test_long_documents_are_chunked_and_short_ones_unchanged():
+    encoder = HashEncoder()
+    short = "Python developer with Docker"
+    long = " ".join(f"word{i % 50} python docker" for i in range(200))
+    docs = embed_documents([short, long, ""], encoder, window=64, overlap=8, batch_size=4)
+    assert len(docs[0]) == 1
+    assert np.array_equal(docs[0].vector, encoder.encode([short])[0])
+    assert len(docs[1]) > 1
+    assert abs(float(np.linalg.norm(docs[1].vector)) - 1.0) < 1e-5
+    assert len(docs[2]) == 0 and not docs[2].vector.any()
@@ -0,0 +1,36 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from ml.contexts import JobContext, ResumeContext
+from ml.scoring_service import _skill_details
+
+
+def test_resume_context_splits_sentences():
+    rc = ResumeContext("Built APIs in Go. Led a team!\nShipped Node.js services", fingerprint="fp-ctx")
+    assert rc.sentences == ["Built APIs in Go.", "Led a team!", "Shipped Node.js services"]
+    assert rc.norm_text == "built apis in go led a team shipped node js services"
+    assert rc.get("fingerprint") == "fp-ctx"
+
+
+def test_lexical_fallback_runs_one_skill_matcher_pass():
+    jc = JobContext("", {"required_skills": ["Node.js", "machine learning", "go", "C++", "rust"]})
+    rc = ResumeContext("Learning about machines; node js and go-lang, some c")
+    calls = []
+    matcher = jc.matcher
+
+    class CountingMatcher:
+        def match(self, norm_text):
+            calls.append(norm_text)
+            return matcher.match(norm_text)
+
+    jc.matcher = CountingMatcher()
+    fast = _skill_details(jc, rc, None, 1.0)
+    full = _skill_details(jc, rc, None, 1.0, with_offsets=True)
+    assert calls == [rc.norm_text, rc.norm_text]
+    assert [(d["matched"], d["method"]) for d in fast] == [
+        (True, "substring"), (False, None), (True, "substring"), (True, "substring"), (False, None)]
+    for a, b, lex in zip(fast, full, matcher.match(rc.norm_text)):
+        assert (a["matched"], a["method"], a["tokens_matched"]) == (b["matched"], b["method"], b["tokens_matched"])
+        assert "offsets" not in a and b["offsets"] == lex["offsets"]
@@ -0,0 +1,43 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+pytest.importorskip("onnxruntime")
+pytest.importorskip("onnx")
+pytest.importorskip("sentence_transformers")
+
+from ml.encoders import OnnxEncoder, TorchEncoder, export_onnx
+
+SENTENCES = [
+    "Senior Python developer with FastAPI and PostgreSQL experience.",
+    "football",
+    "soccer player",
+    "Built CI/CD pipelines on Kubernetes and Terraform for five years.",
+    "",
+]
+
+
+@pytest.fixture(scope="module")
+def torch_encoder():
+    try:
+        return TorchEncoder()
+    except Exception as e:  # model not in the local cache and no network
+        pytest.skip(f"sentence-transformers model unavailable: {e}")
+
+
+@pytest.fixture(scope="module")
+def onnx_dir(torch_encoder, tmp_path_factory):
+    return str(export_onnx(str(tmp_path_factory.mktemp("onnx")), quantize=True))
+
+
+@pytest.mark.parametrize("quantize,min_cos", [(False, 0.999), (True, 0.97)])
+def test_onnx_matches_torch(torch_encoder, onnx_dir, quantize, min_cos):
+    expected = torch_encoder.encode(SENTENCES)
+    got = OnnxEncoder(onnx_dir, quantize=quantize).encode(SENTENCES, batch_size=2)
+    assert got.shape == expected.shape
+    cos = np.sum(got * expected, axis=1) / (np.linalg.norm(got, axis=1) * np.linalg.norm(expected, axis=1))
+    assert cos.min() >= min_cos
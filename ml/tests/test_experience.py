@@ -0,0 +1,26 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from ml.experience import experience_for, extract_experience
+
+
+def test_overlapping_ranges_are_merged():
+    info = extract_experience("Acme 2015 - 2018. Contract work 2017-2019. Jan 2020 to Jul 2021")
+    # 2015-2019 merged (4y) + Jan 2020 - Jul 2021 (1.5y)
+    assert info["range_years"] == 5.5
+    assert info["years"] == 5.5
+
+
+def test_experience_mentions_beat_unrelated_ones():
+    info = extract_experience("Offers a 2 year warranty. Over eight years of experience in Python; 3 yrs Go.")
+    assert info["explicit_years"] == 8
+    assert len(info["mentions"]) == 3
+
+
+def test_cached_per_fingerprint():
+    first = experience_for({"resume_text": "5 years experience", "fingerprint": "fp-1"})
+    again = experience_for({"resume_text": "ignored", "fingerprint": "fp-1"})
+    assert again is first and first["years"] == 5
+    assert not experience_for({"resume_text": "no dates here"})["found"]
@@ -11,9 +11,11 @@ def test_score_basic():
     job = {"description": "React developer with Docker and Node.js", "requirements": {"required_skills":["React","Docker","Node.js"], "min_experience":2}}
     application = {"resume_text": "Experienced React developer with 3 years experience using React and Docker and Node.js"}
     score, explanation = score_job_application(job, application)
-    assert score > 50
+    assert 0.0 <= score <= 1.0
     assert 'embedding_similarity' in explanation
     assert isinstance(explanation['matched_skills'], list)
+    assert set(explanation['matched_skills']) == {"React", "Docker", "Node.js"}
+    assert explanation['experience_score'] == 1.0
 
 if __name__ == '__main__':
     test_score_basic()
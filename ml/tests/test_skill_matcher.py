@@ -0,0 +1,34 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from ml.skill_matcher import SkillMatcher, normalize_text_for_matching
+
+
+def _legacy_match(skill, norm_text):
+    skill_norm = normalize_text_for_matching(skill)
+    if skill_norm and skill_norm in norm_text:
+        return True
+    tokens = [t for t in skill_norm.split() if t]
+    return bool(tokens) and all(t in norm_text.split() for t in tokens)
+
+
+def test_matches_legacy_fallback():
+    skills = ["Node.js", "Java", "machine learning", "C++", "CI/CD", "Go", "react native", ""]
+    text = normalize_text_for_matching(
+        "Built JavaScript apps in React, then learning about machine vision; "
+        "native mobile work; CI CD pipelines with Node JS and Go."
+    )
+    results = SkillMatcher(skills).match(text)
+    assert [r["matched"] for r in results] == [_legacy_match(s, text) if s else False for s in skills]
+
+
+def test_offsets_point_into_normalized_text():
+    text = normalize_text_for_matching("Python, Docker and docker-compose; python scripts")
+    results = SkillMatcher(["python", "docker compose", "kubernetes"]).match(text)
+    py, dc, k8s = results
+    assert py["method"] == "substring"
+    assert [text[s:e] for s, e in py["offsets"]] == ["python", "python"]
+    assert dc["matched"] and [text[s:e] for s, e in dc["offsets"]] == ["docker compose"]
+    assert not k8s["matched"] and k8s["offsets"] == []
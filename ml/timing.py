@@ -0,0 +1,28 @@
+# Stage timing hooks for the scoring code.
+#
+# Expensive steps are wrapped in `with stage("sentence_encode"): ...`. With
+# no observer registered that costs two perf_counter() calls; the backend
+# registers one (backend/utils/metrics.py) that feeds the stage latency
+# histograms and the per-request Server-Timing header.
+from contextlib import contextmanager
+import time
+
+_observers = []
+
+
+def add_stage_observer(fn):
+    """Call `fn(name, seconds)` whenever a stage finishes (in the thread that ran it)."""
+    if fn not in _observers:
+        _observers.append(fn)
+
+
+@contextmanager
+def stage(name):
+    """Time the enclosed block as stage `name`."""
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        seconds = time.perf_counter() - t0
+        for fn in _observers:
+            fn(name, seconds)
@@ -2,9 +2,34 @@
 """
 Startup script for SourceMatch backend server
 Handles proper module path setup and then runs the FastAPI app
+
+With --workers N (or BACKEND_WORKERS=N, N > 1) it runs in pre-fork mode:
+the parent process loads the embedding model, skill vocabulary, job/skill
+catalog and JobContext cache once, freezes the GC, binds the listening
+socket and then forks N uvicorn workers. The workers share the parent's
+read-only pages (model weights, matrices) copy-on-write instead of each
+loading its own copy; each worker's torch intra-op threads are pinned
+(--threads-per-worker / WORKER_THREADS) so N workers do not oversubscribe the
+CPUs. Workers skip the startup warm-up (the parent already did it), and only
+worker 0 runs the periodic match history retention. The parent restarts
+workers that die, backing off when a worker keeps dying right after start
+and giving up after WORKER_MAX_FAST_FAILURES such exits in a row; it prints
+per-worker RSS/PSS/USS a few seconds after start (and on SIGUSR1), and
+forwards SIGTERM/SIGINT.
+Pre-fork mode needs os.fork (Linux/macOS); elsewhere it falls back to one
+process.
+
+Usage:
+    python run_backend.py
+    python run_backend.py --workers 4 --threads-per-worker 2
 """
+import argparse
+import gc
+import signal
+import socket
 import sys
 import os
+import time
 from pathlib import Path
 
 # Get the project root (parent of backend/)
@@ -13,34 +38,224 @@ project_root = Path(__file__).parent.resolve()
 # Add project root to Python path so imports work correctly
 sys.path.insert(0, str(project_root))
 
+# Seconds after the workers start before the parent prints the memory report
+MEMORY_REPORT_DELAY = int(os.getenv("MEMORY_REPORT_DELAY", "10"))
+# A worker exiting within WORKER_MIN_UPTIME seconds of its start is a fast
+# failure: it is restarted after an exponential backoff (capped at
+# WORKER_RESTART_BACKOFF_MAX seconds), and after WORKER_MAX_FAST_FAILURES in
+# a row the parent stops instead of fork-looping on a broken worker.
+WORKER_MIN_UPTIME = float(os.getenv("WORKER_MIN_UPTIME", "10"))
+WORKER_RESTART_BACKOFF_MAX = float(os.getenv("WORKER_RESTART_BACKOFF_MAX", "30"))
+WORKER_MAX_FAST_FAILURES = int(os.getenv("WORKER_MAX_FAST_FAILURES", "5"))
+
+
+class RestartPolicy:
+    """Decides how long to wait before restarting a worker, or to give up."""
+
+    def __init__(self, min_uptime=WORKER_MIN_UPTIME, backoff_max=WORKER_RESTART_BACKOFF_MAX,
+                 max_fast_failures=WORKER_MAX_FAST_FAILURES):
+        self.min_uptime = min_uptime
+        self.backoff_max = backoff_max
+        self.max_fast_failures = max_fast_failures
+        self.fast_failures = {}
+
+    def on_exit(self, index, uptime):
+        """Seconds to wait before restarting worker `index`, or None to give up."""
+        if uptime >= self.min_uptime:
+            self.fast_failures[index] = 0
+            return 0.0
+        failures = self.fast_failures.get(index, 0) + 1
+        self.fast_failures[index] = failures
+        if failures >= self.max_fast_failures:
+            return None
+        return min(self.backoff_max, 0.5 * 2 ** (failures - 1))
+
+
+def _pin_threads(threads):
+    """Limit intra-op threads in this process (torch, if loaded, plus BLAS/OpenMP env)."""
+    for var in ("OMP_NUM_THREADS", "MKL_NUM_THREADS", "OPENBLAS_NUM_THREADS"):
+        os.environ[var] = str(threads)
+    torch = sys.modules.get("torch")
+    if torch is not None:
+        torch.set_num_threads(threads)
+
+
+def _prepare_parent():
+    """Load the model and scoring caches once, before any worker is forked."""
+    # No thread pools may exist at fork time: the parent runs torch and ONNX
+    # Runtime single-threaded (workers set their own torch thread count;
+    # ONNX sessions keep the 1 intra-op thread they were created with).
+    os.environ.setdefault("EMBEDDING_THREADS", "1")
+    # The parent warms up below; forked workers inherit the warm caches and
+    # readiness state, and a second warm-up pass in every worker would walk
+    # each JobContext again and dirty the pages shared with the parent.
+    os.environ["WARMUP_ON_STARTUP"] = "0"
+    # Match history retention runs in worker 0 only (see spawn), not once
+    # per worker on the same rows.
+    retention_interval = float(os.getenv("RETENTION_INTERVAL_SECONDS", "0"))
+    os.environ["RETENTION_INTERVAL_SECONDS"] = "0"
+    from ml.encoders import EMBEDDING_BACKEND
+    if EMBEDDING_BACKEND == "torch":
+        import torch
+        torch.set_num_threads(1)
+        torch.set_num_interop_threads(1)
+
+    from backend.main import app
+    from backend.models import init_db, engine
+    from backend.utils.search import ensure_search_indexes
+    from backend.utils.warmup import run_warmup
+
+    init_db()
+    ensure_search_indexes(engine)
+    state = run_warmup()
+    for name, stage in state["stages"].items():
+        status = "ok" if stage["ok"] else f"FAILED ({stage['error']})"
+        print(f"[PREFORK] warm-up {name}: {stage['seconds']:.2f}s {status}")
+    # SQLite connections must not be shared across fork
+    engine.dispose()
+    return app, retention_interval
+
+
+def run_prefork(host, port, workers, threads_per_worker):
+    import uvicorn
+    from backend.utils.procmem import format_memory_report, memory_report
+    from backend.utils.retention import start_retention_worker
+
+    app, retention_interval = _prepare_parent()
+
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(2048)
+    sock.set_inheritable(True)
+
+    # Move everything loaded so far into the permanent generation: the cyclic
+    # GC then never writes to these objects' headers, so their pages stay
+    # shared with the workers instead of being copied on the first collection.
+    gc.collect()
+    gc.freeze()
+
+    children = {}
+    started = {}
+    policy = RestartPolicy()
+    stopping = False
+    failed = False
+
+    def spawn(index):
+        pid = os.fork()
+        if pid == 0:
+            for sig in (signal.SIGTERM, signal.SIGINT, signal.SIGUSR1, signal.SIGALRM):
+                signal.signal(sig, signal.SIG_DFL)
+            _pin_threads(threads_per_worker)
+            if index == 0 and retention_interval > 0:
+                start_retention_worker(retention_interval)
+            try:
+                uvicorn.Server(uvicorn.Config(app, log_level="info", access_log=True)).run(sockets=[sock])
+            except BaseException:
+                import traceback
+                traceback.print_exc()
+                os._exit(1)
+            os._exit(0)
+        children[pid] = index
+        started[index] = time.monotonic()
+        print(f"[PREFORK] worker {index} started (pid {pid}, {threads_per_worker} threads)")
+
+    def report(*_):
+        labels = {os.getpid(): "parent", **{pid: f"worker {i}" for pid, i in children.items()}}
+        print("[PREFORK] memory per process:\n" + format_memory_report(memory_report(list(labels)), labels), flush=True)
+
+    def shutdown(signum, _frame):
+        nonlocal stopping
+        stopping = True
+        for pid in list(children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGTERM, shutdown)
+    signal.signal(signal.SIGINT, shutdown)
+    signal.signal(signal.SIGUSR1, report)
+    signal.signal(signal.SIGALRM, report)
+
+    for i in range(workers):
+        spawn(i)
+    if MEMORY_REPORT_DELAY > 0:
+        signal.alarm(MEMORY_REPORT_DELAY)
+
+    while children:
+        try:
+            pid, status = os.wait()
+        except ChildProcessError:
+            break
+        index = children.pop(pid, None)
+        if index is None or stopping:
+            continue
+        delay = policy.on_exit(index, time.monotonic() - started[index])
+        if delay is None:
+            print(f"[PREFORK] worker {index} (pid {pid}) exited with status {status}, "
+                  f"{policy.max_fast_failures} fast failures in a row; stopping")
+            failed = True
+            shutdown(signal.SIGTERM, None)
+            continue
+        print(f"[PREFORK] worker {index} (pid {pid}) exited with status {status}; restarting"
+              + (f" in {delay:.1f}s" if delay else ""))
+        if delay:
+            time.sleep(delay)
+        if not stopping:
+            spawn(index)
+    sock.close()
+    if failed:
+        sys.exit(1)
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Run the SourceMatch backend.")
+    ap.add_argument("--host", default=os.getenv("BACKEND_HOST", "0.0.0.0"))
+    ap.add_argument("--port", type=int, default=int(os.getenv("BACKEND_PORT", "8000")))
+    ap.add_argument("--workers", type=int, default=int(os.getenv("BACKEND_WORKERS", "1")),
+                    help="pre-fork this many workers sharing one warm model (default 1: single process)")
+    ap.add_argument("--threads-per-worker", type=int, default=int(os.getenv("WORKER_THREADS", "0")),
+                    help="torch/BLAS threads per worker (default: CPUs / workers)")
+    args = ap.parse_args(argv)
+
+    port = args.port
+    print(f"\n{'='*60}")
+    print(f"Starting SourceMatch Backend")
+    print(f"{'='*60}")
+    print(f"Project Root: {project_root}")
+    print(f"API will be available at http://localhost:{port}")
+    print(f"API Docs at http://localhost:{port}/docs")
+    print(f"Press Ctrl+C to stop")
+    print(f"{'='*60}\n")
+
+    if args.workers > 1 and not hasattr(os, "fork"):
+        print("[PREFORK] os.fork is not available on this platform; running a single process")
+        args.workers = 1
+    if args.workers > 1:
+        threads = args.threads_per_worker or max(1, (os.cpu_count() or 1) // args.workers)
+        run_prefork(args.host, port, args.workers, threads)
+        return
+
+    import uvicorn
+    from backend.main import app
+
+    # Run the server with explicit settings
+    uvicorn.run(
+        app,
+        host=args.host,
+        port=port,
+        log_level="info",
+        access_log=True
+    )
+
+
 # Now we can import and run the app
 if __name__ == "__main__":
     try:
-        import uvicorn
-        from backend.main import app
-        
-        # Use port from environment variable or default to 8000
-        port = int(os.getenv("BACKEND_PORT", "8000"))
-        
-        print(f"\n{'='*60}")
-        print(f"Starting SourceMatch Backend")
-        print(f"{'='*60}")
-        print(f"Project Root: {project_root}")
-        print(f"API will be available at http://localhost:{port}")
-        print(f"API Docs at http://localhost:{port}/docs")
-        print(f"Press Ctrl+C to stop")
-        print(f"{'='*60}\n")
-        
-        # Run the server with explicit settings
-        uvicorn.run(
-            app, 
-            host="0.0.0.0", 
-            port=port,
-            log_level="info",
-            access_log=True
-        )
+        main()
     except Exception as e:
         print(f"ERROR: {e}")
         import traceback
         traceback.print_exc()
-        sys.exit(1)
\ No newline at end of file
+        sys.exit(1)
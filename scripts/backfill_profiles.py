@@ -0,0 +1,34 @@
+"""
+Extract structured resume profiles (skills, years of experience, degree,
+graduation year, date of birth) for applications stored before profile
+extraction ran at ingest time, or after PROFILE_VERSION was bumped.
+
+Usage:
+    python scripts/backfill_profiles.py
+    python scripts/backfill_profiles.py --force --batch-size 1000
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from backend.models import init_db
+from backend.utils.profile import backfill_profiles
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Backfill extracted resume profiles.")
+    ap.add_argument("--batch-size", type=int, default=500)
+    ap.add_argument("--force", action="store_true", help="re-extract every application")
+    args = ap.parse_args(argv)
+
+    init_db()
+    t0 = time.perf_counter()
+    n = backfill_profiles(batch_size=args.batch_size, force=args.force)
+    print(f"Extracted {n} profiles in {time.perf_counter() - t0:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Rebuild the full-text search indexes (jobs and resume text) and fill in
+missing job embeddings.
+
+The FTS tables are kept in sync by triggers once they exist; run this after
+restoring a database from backup, after bulk imports made with triggers
+disabled, or to add description embeddings to jobs created before semantic
+re-ranking existed.
+
+With --force every job's description embedding is recomputed, not just
+missing ones. Run it once after upgrading to windowed document embeddings
+(ml/chunking.py): vectors stored before that embed only the first model
+window, so old and new jobs would be compared with resumes in different
+ways. Restart the backend afterwards; workers cache job vectors in memory.
+
+Usage:
+    python scripts/backfill_search_index.py
+    python scripts/backfill_search_index.py --skip-embeddings
+    python scripts/backfill_search_index.py --force
+"""
+import argparse
+import datetime
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from backend.models import SessionLocal, Job, engine, init_db, json_missing
+from backend.utils.search import ensure_search_indexes, rebuild_search_indexes
+
+
+def backfill_job_embeddings(batch_size=200, force=False):
+    """Embed job descriptions without a stored vector (every job with `force`)."""
+    from ml.scoring_service import embed
+
+    filled = 0
+    last_id = 0
+    while True:
+        with SessionLocal() as db:
+            query = db.query(Job.id, Job.description).filter(Job.id > last_id)
+            if not force:
+                query = query.filter(json_missing(Job.embedding))
+            rows = (
+                query
+                .order_by(Job.id)
+                .limit(batch_size)
+                .all()
+            )
+            if not rows:
+                return filled
+            for row in rows:
+                db.query(Job).filter(Job.id == row.id).update(
+                    {Job.embedding: embed(row.description or "").tolist(), Job.updated_at: datetime.datetime.utcnow()},
+                    synchronize_session=False,
+                )
+            db.commit()
+        filled += len(rows)
+        last_id = rows[-1].id
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Rebuild search indexes.")
+    ap.add_argument("--skip-embeddings", action="store_true", help="only rebuild the FTS indexes")
+    ap.add_argument("--force", action="store_true", help="re-embed every job, not only those without a vector")
+    args = ap.parse_args(argv)
+
+    init_db()
+    ensure_search_indexes(engine)
+    t0 = time.perf_counter()
+    rebuild_search_indexes(engine)
+    print(f"Rebuilt full-text indexes in {time.perf_counter() - t0:.1f}s")
+    if not args.skip_embeddings:
+        t0 = time.perf_counter()
+        n = backfill_job_embeddings(force=args.force)
+        print(f"Computed {n} {'' if args.force else 'missing '}job embeddings in {time.perf_counter() - t0:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
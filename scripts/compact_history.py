@@ -0,0 +1,69 @@
+"""
+Compact saved match history: delete old match searches, their results and
+resume files according to the retention policy, then report what was reclaimed.
+
+Defaults come from the RETENTION_* environment variables (see
+backend/utils/retention.py); command line flags override them.
+
+Usage:
+    python scripts/compact_history.py --max-age-days 30 --max-per-candidate 20
+    python scripts/compact_history.py --max-age-days 90 --dry-run
+    python scripts/compact_history.py --max-age-days 30 --vacuum
+"""
+import argparse
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from backend.models import engine, init_db
+from backend.utils.retention import compact_match_history
+
+
+def _sqlite_file_size():
+    path = engine.url.database if engine.dialect.name == "sqlite" else None
+    if path and os.path.exists(path):
+        return os.path.getsize(path)
+    return None
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Apply retention to match_searches / match_results.")
+    ap.add_argument("--max-age-days", type=float, default=None, help="delete searches older than this many days")
+    ap.add_argument("--max-per-candidate", type=int, default=None, help="keep only the newest N searches per candidate")
+    ap.add_argument("--batch-size", type=int, default=None, help="searches deleted per transaction")
+    ap.add_argument("--dry-run", action="store_true", help="report what would be deleted without deleting")
+    ap.add_argument("--vacuum", action="store_true", help="VACUUM the SQLite database afterwards to return space to the OS")
+    ap.add_argument("--json", action="store_true", help="print stats as JSON")
+    args = ap.parse_args(argv)
+
+    init_db()
+    stats = compact_match_history(
+        max_age_days=args.max_age_days,
+        max_searches_per_candidate=args.max_per_candidate,
+        batch_size=args.batch_size,
+        dry_run=args.dry_run,
+    )
+
+    if args.vacuum and not args.dry_run and engine.dialect.name == "sqlite":
+        before = _sqlite_file_size()
+        with engine.connect() as conn:
+            conn.exec_driver_sql("VACUUM")
+        after = _sqlite_file_size()
+        if before is not None and after is not None:
+            stats["db_bytes_reclaimed"] = before - after
+
+    if args.json:
+        print(json.dumps(stats, indent=2))
+    else:
+        label = "Would delete" if args.dry_run else "Deleted"
+        print(f"{label} {stats['searches_deleted']} searches, {stats['results_deleted']} results "
+              f"and {stats['files_deleted']} resume files ({stats['bytes_reclaimed']} bytes) in {stats['batches']} batches")
+        if "db_bytes_reclaimed" in stats:
+            print(f"VACUUM reclaimed {stats['db_bytes_reclaimed']} bytes of database file")
+    return stats
+
+
+if __name__ == "__main__":
+    main()
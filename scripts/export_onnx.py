@@ -0,0 +1,36 @@
+"""
+Export all-MiniLM-L6-v2 from the local sentence-transformers cache to ONNX
+for EMBEDDING_BACKEND=onnx, optionally with a dynamically quantized int8
+copy (used when EMBEDDING_QUANTIZE=1). Needs torch, onnx and onnxruntime.
+
+Usage:
+    python scripts/export_onnx.py
+    python scripts/export_onnx.py --quantize --out-dir /srv/models/minilm-onnx
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from ml.encoders import MODEL_NAME, ONNX_MODEL_DIR, export_onnx
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Export the embedding model to ONNX.")
+    ap.add_argument("--out-dir", default=ONNX_MODEL_DIR, help="target directory (default: ONNX_MODEL_DIR)")
+    ap.add_argument("--model", default=MODEL_NAME)
+    ap.add_argument("--quantize", action="store_true", help="also write the int8 model")
+    args = ap.parse_args(argv)
+
+    t0 = time.perf_counter()
+    export_onnx(args.out_dir, model_name=args.model, quantize=args.quantize)
+    print(f"Exported {args.model} to {args.out_dir} in {time.perf_counter() - t0:.1f}s")
+    for name in sorted(os.listdir(args.out_dir)):
+        if name.endswith(".onnx"):
+            print(f"  {name}: {os.path.getsize(os.path.join(args.out_dir, name)) / 1e6:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
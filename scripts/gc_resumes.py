@@ -0,0 +1,55 @@
+"""
+Garbage-collect resume files in resumes/ that no application or saved match
+search references any more.
+
+Files younger than the grace period are skipped so in-flight uploads are safe.
+Use --quarantine to move orphans aside instead of deleting them.
+
+Usage:
+    python scripts/gc_resumes.py --dry-run
+    python scripts/gc_resumes.py --grace-hours 48
+    python scripts/gc_resumes.py --quarantine resumes_quarantine
+"""
+import argparse
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from backend.models import init_db
+from backend.utils.storage import RESUMES_DIR
+from backend.utils.resume_gc import collect_orphaned_resumes
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Delete or quarantine unreferenced resume files.")
+    ap.add_argument("--resumes-dir", default=RESUMES_DIR)
+    ap.add_argument("--grace-hours", type=float, default=None, help="only collect files older than this (default: RESUME_GC_GRACE_SECONDS)")
+    ap.add_argument("--quarantine", default=None, metavar="DIR", help="move orphans into DIR instead of deleting them")
+    ap.add_argument("--batch-size", type=int, default=None, help="directory entries checked per DB query")
+    ap.add_argument("--dry-run", action="store_true", help="report orphans without touching them")
+    ap.add_argument("--json", action="store_true", help="print stats as JSON")
+    args = ap.parse_args(argv)
+
+    init_db()
+    stats = collect_orphaned_resumes(
+        resumes_dir=args.resumes_dir,
+        grace_seconds=args.grace_hours * 3600 if args.grace_hours is not None else None,
+        quarantine_dir=args.quarantine,
+        batch_size=args.batch_size,
+        dry_run=args.dry_run,
+    )
+    if args.json:
+        print(json.dumps(stats, indent=2))
+    else:
+        action = "would collect" if args.dry_run else ("quarantined" if args.quarantine else "deleted")
+        print(f"Scanned {stats['scanned']} files ({stats['skipped_recent']} within grace period, {stats['referenced']} referenced); "
+              f"{action} {stats['orphaned']} orphans, {stats['bytes_reclaimed']} bytes")
+        if stats["errors"]:
+            print(f"{stats['errors']} files could not be collected; see log for details")
+    return stats
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,297 @@
+"""
+Fill a database with synthetic recruiters, candidates, jobs, applications
+and match-search history for load and scale testing.
+
+Jobs are drawn from role templates (title, skill pool, description
+sentences); applications pick from a pool of distinct generated resumes
+(experience ranges, degrees, skills) whose profile columns are extracted
+once per resume, with weighted statuses, skewed job popularity and
+timestamps spread over the last year. Rows go in through Core bulk
+inserts in batches, ids continue after the existing ones, and everything
+derives from --seed, so the same arguments produce the same data. Every
+synthetic user's password is "password".
+
+With --embeddings, job description vectors and skill vectors are computed
+with the offline hash encoder (ml/encoders.py), so the catalog needs no
+model download; leave it off and the app embeds on demand.
+
+Usage:
+    python scripts/generate_synthetic_data.py --database /tmp/scale.db
+    python scripts/generate_synthetic_data.py --database /tmp/small.db --jobs 1000 --applications 10000 --searches 500 --embeddings
+"""
+import argparse
+import datetime
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+# role family -> (titles, skill pool)
+ROLES = {
+    "backend": (("Backend Engineer", "Python Developer", "API Engineer", "Platform Engineer"),
+                ("Python", "FastAPI", "Django", "SQLAlchemy", "PostgreSQL", "Redis", "Docker", "Kafka", "Go", "Java", "Spring", "REST")),
+    "frontend": (("Frontend Engineer", "React Developer", "UI Engineer"),
+                 ("React", "TypeScript", "JavaScript", "Redux", "CSS", "HTML", "Next.js", "GraphQL", "Webpack", "Jest")),
+    "data": (("Data Engineer", "Analytics Engineer", "ETL Developer"),
+             ("Python", "SQL", "Spark", "Airflow", "dbt", "Kafka", "Snowflake", "pandas", "AWS", "Scala")),
+    "ml": (("Machine Learning Engineer", "Data Scientist", "NLP Engineer"),
+           ("Python", "PyTorch", "TensorFlow", "scikit-learn", "machine learning", "NLP", "pandas", "NumPy", "MLOps", "statistics")),
+    "devops": (("DevOps Engineer", "Site Reliability Engineer", "Cloud Engineer"),
+               ("Kubernetes", "Docker", "Terraform", "AWS", "GCP", "Azure", "Linux", "Prometheus", "CI/CD", "Ansible")),
+    "mobile": (("iOS Developer", "Android Developer", "Mobile Engineer"),
+               ("Swift", "Kotlin", "React Native", "Flutter", "iOS", "Android", "Firebase", "GraphQL")),
+    "systems": (("Systems Engineer", "Embedded Engineer", "C++ Developer"),
+                ("C++", "C", "Rust", "Linux", "embedded", "RTOS", "multithreading", "networking")),
+}
+LEVELS = (("Junior", 0, 2), ("Mid-level", 2, 5), ("Senior", 5, 9), ("Staff", 8, 12))
+COMPANIES = ("Acme", "Globex", "Initech", "Umbrella", "Hooli", "Stark Industries", "Wayne Enterprises", "Wonka", "Cyberdyne", "Soylent")
+LOCATIONS = ("Remote", "Bengaluru", "Hyderabad", "Pune", "London", "Berlin", "New York", "San Francisco", "Toronto", "Singapore")
+DESCRIPTION_SENTENCES = (
+    "We are looking for a {level} {title} to join our {team} team.",
+    "You will design, build and operate services used by millions of customers.",
+    "Strong experience with {s0} and {s1} is required.",
+    "Familiarity with {s2} is a plus.",
+    "You will work closely with product, design and data teams.",
+    "We value ownership, code review and clear written communication.",
+    "Experience mentoring engineers and leading projects end to end is expected for senior roles.",
+    "Our stack includes {skills}.",
+    "Candidates should have at least {years} years of professional experience.",
+)
+RESUME_VERBS = ("Built", "Led", "Designed", "Migrated", "Scaled", "Owned", "Shipped", "Maintained", "Optimized")
+RESUME_OBJECTS = ("payment services", "a data pipeline", "the search platform", "internal tooling", "a mobile app",
+                  "the recommendation engine", "CI/CD pipelines", "a customer-facing dashboard", "the billing system")
+DEGREES = ("B.Sc. in Computer Science", "B.Tech in Information Technology", "Master of Science in Data Science",
+           "MBA", "M.Sc. in Physics", "Bachelor of Engineering in Electronics")
+STATUSES = (("applied", 70), ("shortlisted", 20), ("rejected", 10))
+
+
+def make_job(rng, job_id, recruiter_id):
+    family = rng.choice(list(ROLES))
+    titles, pool = ROLES[family]
+    level, min_years, max_years = rng.choice(LEVELS)
+    title = rng.choice(titles)
+    skills = rng.sample(pool, rng.randint(3, min(6, len(pool))))
+    years = rng.randint(min_years, max_years)
+    fields = {"level": level.lower(), "title": title, "team": family, "years": years,
+              "s0": skills[0], "s1": skills[1], "s2": skills[2], "skills": ", ".join(skills)}
+    sentences = [DESCRIPTION_SENTENCES[0]] + rng.sample(DESCRIPTION_SENTENCES[1:], rng.randint(3, 6))
+    salary_min = rng.randrange(30, 200, 5)
+    return {
+        "id": job_id,
+        "recruiter_id": recruiter_id,
+        "title": f"{level} {title}",
+        "description": " ".join(s.format(**fields) for s in sentences),
+        "requirements": {"required_skills": skills, "min_experience": years},
+        "company": rng.choice(COMPANIES),
+        "location": rng.choice(LOCATIONS),
+        "salary_min": salary_min,
+        "salary_max": salary_min + rng.randrange(10, 80, 5),
+        "experience_level": level,
+        "required_skills": ",".join(skills),
+    }
+
+
+def make_resume(rng):
+    family = rng.choice(list(ROLES))
+    titles, pool = ROLES[family]
+    lines = [f"{rng.choice(titles)} with {rng.randint(1, 15)} years of experience."]
+    year = rng.randint(2004, 2018)
+    for _ in range(rng.randint(1, 5)):
+        end = min(year + rng.randint(1, 4), 2025)
+        used = rng.sample(pool, rng.randint(2, 4))
+        lines.append(f"{rng.choice(titles)}, {rng.choice(COMPANIES)} ({year} - {end}). "
+                     f"{rng.choice(RESUME_VERBS)} {rng.choice(RESUME_OBJECTS)} using {', '.join(used)}. "
+                     f"{rng.choice(RESUME_VERBS)} {rng.choice(RESUME_OBJECTS)}.")
+        year = end
+    lines.append(f"{rng.choice(DEGREES)}, {rng.choice(('graduated in', 'class of', 'year of passing:'))} {rng.randint(1998, 2022)}.")
+    lines.append("Skills: " + ", ".join(rng.sample(pool, rng.randint(3, len(pool)))))
+    return "\n".join(lines)
+
+
+def _max_id(conn, table):
+    from sqlalchemy import func, select
+    return conn.execute(select(func.max(table.c.id))).scalar() or 0
+
+
+def _insert(conn, table, rows):
+    if rows:
+        conn.execute(table.insert(), rows)
+
+
+def generate(args, log=print):
+    from backend.auth import get_password_hash
+    from backend.models import Application, Job, JobSkill, MatchResult, MatchSearch, Skill, User, engine, init_db
+    from backend.utils.parser import fingerprint_text
+    from backend.utils.profile import extract_profile
+    from backend.utils.search import ensure_search_indexes
+    from backend.utils.skills import bump_catalog_version
+    from ml.skill_matcher import normalize_text_for_matching
+
+    rng = random.Random(args.seed)
+    encoder = None
+    if args.embeddings:
+        from ml.encoders import get_encoder
+        encoder = get_encoder("hash")
+
+    def vectors(texts):
+        return [[round(float(x), 6) for x in v] for v in encoder.encode(texts)]
+
+    init_db()
+    now = datetime.datetime.utcnow()
+    stats = {}
+    with engine.begin() as conn:
+        # bulk load: skip fsyncs (a crash mid-load may corrupt the file; regenerate it)
+        conn.exec_driver_sql("PRAGMA synchronous=OFF")
+        password_hash = get_password_hash("password")
+        base_user = _max_id(conn, User.__table__)
+        recruiter_ids = list(range(base_user + 1, base_user + 1 + args.recruiters))
+        candidate_ids = list(range(recruiter_ids[-1] + 1, recruiter_ids[-1] + 1 + args.candidates))
+        users = [{"id": uid, "email": f"recruiter{uid}@synthetic.example", "password_hash": password_hash,
+                  "role": "recruiter", "full_name": f"Recruiter {uid}", "created_at": now} for uid in recruiter_ids]
+        users += [{"id": uid, "email": f"candidate{uid}@synthetic.example", "password_hash": password_hash,
+                   "role": "candidate", "full_name": f"Candidate {uid}", "created_at": now} for uid in candidate_ids]
+        for start in range(0, len(users), args.batch_size):
+            _insert(conn, User.__table__, users[start:start + args.batch_size])
+        stats["users"] = len(users)
+
+        # skill vocabulary: every skill in the role templates, plus any already stored
+        existing = {name: sid for sid, name in conn.execute(Skill.__table__.select().with_only_columns(Skill.id, Skill.name))}
+        new_labels = {}
+        for label in sorted({s for _, pool in ROLES.values() for s in pool}):
+            # first spelling wins, as in get_or_create_skills ("C" and "C++" share a name)
+            name = normalize_text_for_matching(label)
+            if name and name not in existing:
+                new_labels.setdefault(name, label)
+        new_labels = list(new_labels.values())
+        next_skill = _max_id(conn, Skill.__table__) + 1
+        skill_vectors = vectors(new_labels) if encoder and new_labels else [None] * len(new_labels)
+        skill_rows = []
+        for label, vec in zip(new_labels, skill_vectors):
+            existing[normalize_text_for_matching(label)] = next_skill
+            skill_rows.append({"id": next_skill, "name": normalize_text_for_matching(label), "label": label,
+                               "embedding": vec, "created_at": now})
+            next_skill += 1
+        _insert(conn, Skill.__table__, skill_rows)
+        stats["skills_added"] = len(skill_rows)
+
+    # distinct resumes, profiled and fingerprinted once each; profile
+    # extraction reads the skill vocabulary, so this runs between transactions
+    t0 = time.perf_counter()
+    resumes = [make_resume(rng) for _ in range(args.distinct_resumes)]
+    profiles = [extract_profile(text) for text in resumes]
+    fingerprints = [fingerprint_text(text) for text in resumes]
+    log(f"resume pool: {len(resumes)} in {time.perf_counter() - t0:.1f}s")
+
+    with engine.begin() as conn:
+        conn.exec_driver_sql("PRAGMA synchronous=OFF")
+        t0 = time.perf_counter()
+        base_job = _max_id(conn, Job.__table__)
+        job_ids = list(range(base_job + 1, base_job + 1 + args.jobs))
+        for start in range(0, len(job_ids), args.batch_size):
+            jobs, links = [], []
+            for job_id in job_ids[start:start + args.batch_size]:
+                job = make_job(rng, job_id, rng.choice(recruiter_ids))
+                job["created_at"] = now - datetime.timedelta(minutes=rng.randrange(365 * 24 * 60))
+                jobs.append(job)
+                links += [{"job_id": job_id, "position": p, "skill_id": existing[normalize_text_for_matching(s)]}
+                          for p, s in enumerate(job["requirements"]["required_skills"])]
+            if encoder:
+                for job, vec in zip(jobs, vectors([j["description"] for j in jobs])):
+                    job["embedding"] = vec
+            _insert(conn, Job.__table__, jobs)
+            _insert(conn, JobSkill.__table__, links)
+        bump_catalog_version(conn)
+        stats["jobs"] = len(job_ids)
+        log(f"jobs: {len(job_ids)} in {time.perf_counter() - t0:.1f}s")
+
+        t0 = time.perf_counter()
+        statuses, weights = zip(*STATUSES)
+        base_app = _max_id(conn, Application.__table__)
+        for start in range(0, args.applications, args.batch_size):
+            rows = []
+            for i in range(start, min(start + args.batch_size, args.applications)):
+                k = rng.randrange(len(resumes))
+                score = rng.betavariate(2, 3)
+                rows.append({
+                    "id": base_app + 1 + i,
+                    # skewed popularity: low job ids get most applications
+                    "job_id": job_ids[int(len(job_ids) * rng.random() ** 2)],
+                    "candidate_id": rng.choice(candidate_ids),
+                    "resume_path": f"resumes/synthetic_{base_app + 1 + i}.txt",
+                    "resume_text": resumes[k],
+                    "score": score,
+                    "status": rng.choices(statuses, weights)[0],
+                    "explanation": {"components": {"composite": round(score, 4)}, "reasons": []},
+                    "fingerprint": fingerprints[k],
+                    "created_at": now - datetime.timedelta(minutes=rng.randrange(365 * 24 * 60)),
+                    **profiles[k],
+                })
+            _insert(conn, Application.__table__, rows)
+        stats["applications"] = args.applications
+        log(f"applications: {args.applications} in {time.perf_counter() - t0:.1f}s")
+
+        t0 = time.perf_counter()
+        base_search = _max_id(conn, MatchSearch.__table__)
+        titles = {}
+        for start in range(0, args.searches, max(1, args.batch_size // max(1, args.results_per_search))):
+            searches, results = [], []
+            for sid in range(base_search + 1 + start,
+                             base_search + 1 + min(start + max(1, args.batch_size // max(1, args.results_per_search)), args.searches)):
+                k = rng.randrange(len(resumes))
+                created = now - datetime.timedelta(minutes=rng.randrange(365 * 24 * 60))
+                searches.append({"id": sid, "candidate_id": rng.choice(candidate_ids), "resume_path": f"resumes/search_{sid}.txt",
+                                 "fingerprint": fingerprints[k], "created_at": created})
+                for job_id in rng.sample(job_ids, min(args.results_per_search, len(job_ids))):
+                    score = rng.betavariate(2, 3)
+                    results.append({"search_id": sid, "job_id": job_id,
+                                    "job_title": titles.setdefault(job_id, f"Job {job_id}"),
+                                    "score": score, "explanation": {"components": {"composite": round(score, 4)}},
+                                    "matched_skills": [], "created_at": created})
+            _insert(conn, MatchSearch.__table__, searches)
+            _insert(conn, MatchResult.__table__, results)
+        stats["match_searches"] = args.searches
+        log(f"match searches: {args.searches} in {time.perf_counter() - t0:.1f}s")
+
+    if not args.no_search_index:
+        t0 = time.perf_counter()
+        ensure_search_indexes(engine)
+        log(f"search indexes in {time.perf_counter() - t0:.1f}s")
+    return stats
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--database", default=None, help="SQLite file to fill (default: DATABASE_URL / the app database)")
+    ap.add_argument("--jobs", type=int, default=100000)
+    ap.add_argument("--applications", type=int, default=1000000)
+    ap.add_argument("--searches", type=int, default=50000, help="match searches (history)")
+    ap.add_argument("--results-per-search", type=int, default=10)
+    ap.add_argument("--recruiters", type=int, default=500)
+    ap.add_argument("--candidates", type=int, default=50000)
+    ap.add_argument("--distinct-resumes", type=int, default=5000, help="size of the resume text pool")
+    ap.add_argument("--embeddings", action="store_true", help="store hash-encoder job and skill vectors")
+    ap.add_argument("--no-search-index", action="store_true", help="skip creating/backfilling the FTS indexes")
+    ap.add_argument("--batch-size", type=int, default=5000)
+    ap.add_argument("--seed", type=int, default=42)
+    ap.add_argument("--json", action="store_true", help="print stats as JSON")
+    args = ap.parse_args(argv)
+    if args.recruiters < 1 or args.candidates < 1 or args.distinct_resumes < 1:
+        ap.error("--recruiters, --candidates and --distinct-resumes must be at least 1")
+
+    if args.database:
+        os.environ["DATABASE_URL"] = "sqlite:///" + os.path.abspath(args.database)
+    print(f"Filling {os.getenv('DATABASE_URL', 'sqlite:///./sourcematch.db')} (seed {args.seed})")
+    t0 = time.perf_counter()
+    stats = generate(args)
+    stats["seconds"] = round(time.perf_counter() - t0, 1)
+    if args.json:
+        print(json.dumps(stats, indent=2))
+    else:
+        print(f"Done in {stats['seconds']}s")
+
+
+if __name__ == "__main__":
+    main()
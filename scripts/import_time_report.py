@@ -0,0 +1,105 @@
+"""
+Startup import-time report for the backend (or any module).
+
+Imports the module in a fresh interpreter with `python -X importtime`,
+then prints the slowest imports by cumulative and self time, the total per
+top-level package, and which heavy ML packages (torch, sentence-transformers,
+transformers, scikit-learn, scipy, onnxruntime, spaCy, PyPDF2) were pulled in.
+Those should stay out of startup; they load on first use.
+
+Usage:
+    python scripts/import_time_report.py
+    python scripts/import_time_report.py --module backend.utils.scoring --top 15 --json report.json
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+HEAVY_MODULES = ("torch", "sentence_transformers", "transformers", "sklearn", "scipy", "onnxruntime", "spacy", "PyPDF2")
+
+
+def import_profile(module, env=None):
+    """Import `module` in a subprocess. Returns (wall seconds, rows, heavy modules loaded).
+
+    rows are {"module", "self_us", "cumulative_us", "depth"} in import order.
+    """
+    probe = (
+        "import sys; sys.path.insert(0, %r); import %s; "
+        "print(','.join(m for m in %r if m in sys.modules))" % (PROJECT_ROOT, module, HEAVY_MODULES)
+    )
+    t0 = time.perf_counter()
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", probe],
+                          capture_output=True, text=True, env=env, cwd=PROJECT_ROOT)
+    wall = time.perf_counter() - t0
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else "import failed")
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        rows.append({
+            "module": name.strip(),
+            "self_us": int(self_us),
+            "cumulative_us": int(cumulative_us),
+            "depth": (len(name) - len(name.lstrip(" ")) - 1) // 2,
+        })
+    heavy = [m for m in proc.stdout.strip().split(",") if m]
+    return wall, rows, heavy
+
+
+def by_package(rows):
+    totals = {}
+    for r in rows:
+        pkg = r["module"].split(".")[0]
+        totals[pkg] = totals.get(pkg, 0) + r["self_us"]
+    return sorted(totals.items(), key=lambda kv: kv[1], reverse=True)
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Report import/startup time of a module.")
+    ap.add_argument("--module", default="backend.main")
+    ap.add_argument("--top", type=int, default=20)
+    ap.add_argument("--json", dest="json_path", default=None, help="write the report to this file")
+    args = ap.parse_args(argv)
+
+    env = dict(os.environ)
+    # importing backend.models reads DATABASE_URL; never touch the real database
+    env.setdefault("DATABASE_URL", "sqlite:///" + os.path.join(tempfile.gettempdir(), "sourcematch_importtime.db"))
+    wall, rows, heavy = import_profile(args.module, env)
+    total = next((r["cumulative_us"] for r in rows if r["module"] == args.module and r["depth"] == 0), None)
+
+    print(f"import {args.module}: {total / 1e6:.3f}s imports, {wall:.3f}s interpreter wall time" if total else
+          f"import {args.module}: {wall:.3f}s interpreter wall time")
+    print(f"heavy ML modules loaded: {', '.join(heavy) if heavy else 'none'}")
+
+    print(f"\n{'cumulative ms':>14}{'self ms':>10}  module")
+    for r in sorted(rows, key=lambda r: r["cumulative_us"], reverse=True)[:args.top]:
+        print(f"{r['cumulative_us'] / 1000:>14.1f}{r['self_us'] / 1000:>10.1f}  {r['module']}")
+
+    packages = by_package(rows)
+    print(f"\n{'self ms':>10}  package")
+    for pkg, us in packages[:args.top]:
+        print(f"{us / 1000:>10.1f}  {pkg}")
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump({
+                "module": args.module,
+                "import_seconds": total / 1e6 if total else None,
+                "wall_seconds": wall,
+                "heavy_modules": heavy,
+                "packages_self_ms": {pkg: us / 1000 for pkg, us in packages},
+                "imports": rows,
+            }, f, indent=2)
+    return heavy
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Move jobs onto the shared skill vocabulary (skills / job_skills tables).
+
+For every job without job_skills rows, links its required skills to the
+vocabulary. Vectors already stored in the legacy Job.skill_embeddings column
+are reused for skills the vocabulary does not have yet; remaining new skills
+are embedded once (unless --no-embed). With --clear-legacy the per-job
+Job.skill_embeddings copies are dropped afterwards.
+
+Usage:
+    python scripts/migrate_skill_vocabulary.py
+    python scripts/migrate_skill_vocabulary.py --clear-legacy --json
+"""
+import argparse
+import datetime
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from backend.models import SessionLocal, Job, JobSkill, init_db, json_missing
+from backend.utils.skills import job_skill_list, set_job_skills
+from ml.skill_matcher import normalize_text_for_matching
+
+
+def migrate(batch_size=200, embed_fn=None, clear_legacy=False):
+    stats = {"jobs_linked": 0, "legacy_vectors_reused": 0, "legacy_cleared": 0}
+    last_id = 0
+    while True:
+        with SessionLocal() as db:
+            rows = (
+                db.query(Job.id, Job.requirements, Job.required_skills, Job.skill_embeddings)
+                .filter(Job.id > last_id, ~Job.id.in_(db.query(JobSkill.job_id)))
+                .order_by(Job.id)
+                .limit(batch_size)
+                .all()
+            )
+            if not rows:
+                break
+            for row in rows:
+                # legacy vectors were computed from the comma-separated string
+                legacy_skills = [s.strip() for s in (row.required_skills or "").split(",") if s.strip()]
+                known = {}
+                if row.skill_embeddings and len(row.skill_embeddings) == len(legacy_skills):
+                    known = {normalize_text_for_matching(s): v for s, v in zip(legacy_skills, row.skill_embeddings)}
+                    stats["legacy_vectors_reused"] += len(known)
+                set_job_skills(db, row.id, job_skill_list(row.requirements, row.required_skills), embed_fn=embed_fn, known_vectors=known)
+            db.commit()
+        stats["jobs_linked"] += len(rows)
+        last_id = rows[-1].id
+
+    if clear_legacy:
+        with SessionLocal() as db:
+            stats["legacy_cleared"] = (
+                db.query(Job)
+                .filter(~json_missing(Job.skill_embeddings), Job.id.in_(db.query(JobSkill.job_id)))
+                .update({Job.skill_embeddings: None, Job.updated_at: datetime.datetime.utcnow()}, synchronize_session=False)
+            )
+            db.commit()
+    return stats
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Link jobs to the shared skill vocabulary.")
+    ap.add_argument("--batch-size", type=int, default=200)
+    ap.add_argument("--no-embed", action="store_true", help="do not run the model for skills without a stored vector")
+    ap.add_argument("--clear-legacy", action="store_true", help="drop per-job skill_embeddings once linked")
+    ap.add_argument("--json", action="store_true", help="print stats as JSON")
+    args = ap.parse_args(argv)
+
+    init_db()
+    embed_fn = None
+    if not args.no_embed:
+        from ml.scoring_service import embed as embed_fn
+    t0 = time.perf_counter()
+    stats = migrate(args.batch_size, embed_fn=embed_fn, clear_legacy=args.clear_legacy)
+    stats["seconds"] = round(time.perf_counter() - t0, 2)
+    if args.json:
+        print(json.dumps(stats, indent=2))
+    else:
+        for k, v in stats.items():
+            print(f"{k}: {v}")
+
+
+if __name__ == "__main__":
+    main()
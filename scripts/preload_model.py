@@ -1,31 +1,31 @@
 """
-Small helper script to import the ML scoring module and force the sentence-transformers
-model to download into the cache. Run this once after installing ML dependencies to
-avoid long downloads during backend startup.
+Small helper script to load the embedding model once so its weights are
+downloaded into the local cache (and, for EMBEDDING_BACKEND=onnx, exported).
+Run this once after installing ML dependencies to avoid long downloads during
+backend startup.
 
 Usage:
     python scripts/preload_model.py
 """
 
+import os
+import sys
 import time
 
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
 print("Preloading ML model (this may take a few minutes)...")
 try:
     from ml import scoring_service
-    # scoring_service loads the model at import time; if it exposes the model
-    # object we can reference it to ensure it's initialized.
-    try:
-        model = getattr(scoring_service, 'model', None)
-        if model is not None:
-            print("Model object loaded:", type(model))
-        else:
-            print("Model imported; scoring_service did not expose model object explicitly.")
-    except Exception:
-        pass
+
+    t0 = time.perf_counter()
+    model = scoring_service.get_model()
+    load_seconds = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    vec = scoring_service.embed("warm up the embedding model")
+    print(f"Model loaded: {type(model).__name__} ({getattr(model, 'name', '?')} backend) in {load_seconds:.1f}s; "
+          f"first inference {time.perf_counter() - t0:.2f}s, dim {len(vec)}")
     print("Done. The model should be cached for future runs.")
 except Exception as e:
     print("Failed to preload model:", e)
     raise
-
-# small sleep to let any background downloads settle
-time.sleep(0.5)